@@ -1,24 +1,96 @@
-from analysis import HierarchicalSchedulabilityAnalyzer
+from analysis import HierarchicalSchedulabilityAnalyzer, InterfaceCache, WcetSensitivity, SpeedFactorSearch, BudgetOptimizer, ComponentAllocator, \
+    PollingServerOptimizer, configure_logging
+import argparse
 import sys
 import os
 
 
+def parse_args():
+    """Parse the command line arguments of the analysis tool."""
+    parser = argparse.ArgumentParser(description='Hierarchical schedulability analysis')
+    parser.add_argument('test_case_folder', type=str,
+                        help='Folder containing architecture.csv, tasks.csv and budgets.csv')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Number of worker processes used to analyze the components')
+    parser.add_argument('--cache-dir', type=str, default=None,
+                        help='Directory of the persistent interface cache, disabled if not given')
+    parser.add_argument('--cache-size', type=int, default=10000,
+                        help='Maximum number of cached component interfaces')
+    parser.add_argument('--frontier-samples', type=int, default=0,
+                        help='Number of sampled delays per alpha-delta frontier, frontiers are not computed if 0')
+    parser.add_argument('--log-level', type=str, default='WARNING', choices=['DEBUG', 'INFO', 'WARNING'],
+                        help='Lowest level of the log lines printed by the analysis, DEBUG shows the interface search')
+    parser.add_argument('--stats', action='store_true',
+                        help='Also write the run time and work counters of every component to analysis_stats.json')
+    parser.add_argument('--sensitivity', action='store_true',
+                        help='Also bisect how far every task WCET can grow and write sensitivity.csv')
+    parser.add_argument('--min-speed', action='store_true',
+                        help='Also search the smallest schedulable speed factor of every core and write speed_factors.csv')
+    parser.add_argument('--optimize-budgets', type=str, default=None, metavar='OUTPUT_FOLDER',
+                        help='Also choose the budget and period of every component with the least reserved bandwidth '
+                             'and write them with the other input files to OUTPUT_FOLDER')
+    parser.add_argument('--switch-overhead', type=float, default=0.0,
+                        help='CPU time lost every server period, used by --optimize-budgets')
+    parser.add_argument('--min-period', type=int, default=1,
+                        help='Smallest server period considered by --optimize-budgets and --optimize-servers')
+    parser.add_argument('--optimize-servers', type=str, default=None, metavar='OUTPUT_FOLDER',
+                        help='Also choose the polling server budget and period of every component with sporadic '
+                             'tasks that adds the least alpha and write them with the other input files to OUTPUT_FOLDER')
+    parser.add_argument('--allocate', type=str, default=None, metavar='OUTPUT_FOLDER',
+                        help='Also search an allocation of the components to the cores with bin-packing and local '
+                             'search and write it with the other input files to OUTPUT_FOLDER')
+    parser.add_argument('--allocation-objective', type=str, default='headroom', choices=['headroom', 'cores'],
+                        help='Maximise the smallest core headroom or minimise the number of used cores, '
+                             'used by --allocate')
+    parser.add_argument('--move-tasks', action='store_true',
+                        help='Also move periodic tasks between components, used by --allocate')
+    return parser.parse_args()
+
+
 def main():
     """Main function to run the analysis tool."""
-    # Check command line arguments
-    if len(sys.argv) != 2:
-        print("Usage: python analysis.py <test_case_folder>")
-        return 1
-    
-    test_case_folder = sys.argv[1]
+    args = parse_args()
+    configure_logging(args.log_level)
     
     try:
         # Create analyzer
-        analyzer = HierarchicalSchedulabilityAnalyzer(test_case_folder)
+        cache = InterfaceCache(args.cache_dir, args.cache_size) if args.cache_dir else None
+        analyzer = HierarchicalSchedulabilityAnalyzer(args.test_case_folder, workers=args.workers, cache=cache,
+                                                     frontier_samples=args.frontier_samples)
         
         # Run analysis
         analyzer.run_analysis()
         
+        if args.stats:
+            analyzer.stats.export_to_json(os.path.join(args.test_case_folder, "analysis_stats.json"))
+        
+        if args.sensitivity:
+            sensitivity = WcetSensitivity(analyzer)
+            sensitivity.export_to_csv(sensitivity.search(args.workers))
+        
+        if args.min_speed:
+            speed_search = SpeedFactorSearch(analyzer)
+            speed_search.export_to_csv(speed_search.search(args.workers))
+        
+        if args.optimize_budgets:
+            optimizer = BudgetOptimizer(analyzer, args.switch_overhead, args.min_period, workers=args.workers)
+            optimization = optimizer.optimize()
+            optimizer.print_summary(optimization)
+            optimizer.export_budgets(optimization, args.optimize_budgets)
+        
+        if args.optimize_servers:
+            server_optimizer = PollingServerOptimizer(analyzer, args.min_period, workers=args.workers)
+            server_optimization = server_optimizer.optimize()
+            server_optimizer.print_summary(server_optimization)
+            server_optimizer.export_servers(server_optimization, args.optimize_servers)
+        
+        if args.allocate:
+            allocator = ComponentAllocator(analyzer, args.allocation_objective, args.move_tasks,
+                                           workers=args.workers)
+            allocation = allocator.allocate()
+            allocator.print_summary(allocation)
+            allocator.export_allocation(allocation, args.allocate)
+        
         return 0
     except Exception as e:
         print(f"Error running analysis: {e}")
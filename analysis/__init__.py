@@ -1,5 +1,16 @@
 from .analysis import HierarchicalSchedulabilityAnalyzer
 from .bdr_model import BDRModel
+from .demand import DemandTable
+from .cache import InterfaceCache
+from .stats import AnalysisStats, configure_logging
+from .frontier import InterfaceFrontier, compose_frontiers, export_frontiers, load_frontiers
+from .admission import AdmissionController
+from .sensitivity import WcetSensitivity
+from .speed import SpeedFactorSearch
+from .optimizer import BudgetOptimizer
+from .polling_server import PollingServerOptimizer
+from .allocation import ComponentAllocator
+from .batch import BatchRunner, find_case_folders
 from .core import (
     Task,
     Component,
@@ -0,0 +1,285 @@
+import io
+import copy
+import contextlib
+from typing import List, Dict, Optional, Any
+from .analysis import HierarchicalSchedulabilityAnalyzer
+from .bdr_model import BDRModel
+from .core import Core, Component, Task
+from .demand import DemandTable, task_set_fingerprint
+
+
+class AdmissionController:
+    """
+    In-memory admission control on top of an analyzed system.
+
+    The component results, the demand table of every component and the alpha sum of every
+    core stay resident. A query only analyzes the component it changes and checks Theorem 1
+    of its core against the alphas of the other components, which are not analyzed again.
+    A periodic task that is added to a component extends the component's demand table, the
+    demand computed so far is reused. Queries starting with check_ leave the system
+    unchanged, the others apply the change if it is admitted.
+    """
+
+    def __init__(self, analyzer: HierarchicalSchedulabilityAnalyzer):
+        """
+        Initialize the controller and analyze every component of the system once.
+
+        Args:
+            analyzer: Analyzer holding the loaded system, it is updated by admitted changes
+        """
+        self.analyzer = analyzer
+        self.core_bdr = BDRModel(1.0, 0.0)
+        self.cores: Dict[str, Core] = {core.core_id: core for core in analyzer.cores}
+        self.component_results: Dict[str, Dict] = {}
+        self.demand_tables: Dict[str, DemandTable] = {}
+        self.core_alpha: Dict[str, float] = {}
+        for core in analyzer.cores:
+            for component in core.components:
+                self.demand_tables[component.component_id] = self._demand(component)
+                self.component_results[component.component_id] = self._analyze(
+                    component, self.demand_tables[component.component_id])
+            self.core_alpha[core.core_id] = sum(self.component_results[component.component_id]["alpha"]
+                                                for component in core.components)
+
+    def check_add_task(self, task: Task) -> Dict[str, Any]:
+        """
+        Check whether a task can be added to the component named by its component_id.
+
+        Args:
+            task: The new task with its nominal WCET
+
+        Returns:
+            Decision dictionary, see decide
+        """
+        component = self._with_added_task(task)
+        return self.decide(component, self._demand(component, task.task_name))
+
+    def add_task(self, task: Task) -> Dict[str, Any]:
+        """Add a task if it is admitted, see check_add_task."""
+        component = self._with_added_task(task)
+        return self._apply(component, self._demand(component, task.task_name))
+
+    def check_remove_task(self, task_name: str) -> Dict[str, Any]:
+        """
+        Check the system without the given task.
+
+        Args:
+            task_name: Name of the task to remove
+
+        Returns:
+            Decision dictionary, see decide
+        """
+        return self.decide(self._with_removed_task(task_name))
+
+    def remove_task(self, task_name: str) -> Dict[str, Any]:
+        """Remove a task if the system stays schedulable, see check_remove_task."""
+        return self._apply(self._with_removed_task(task_name))
+
+    def check_modify_task(self, task_name: str, wcet: Optional[float] = None, period: Optional[float] = None,
+                          priority: Optional[float] = None, deadline: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Check the system with changed task parameters, parameters that are None are kept.
+
+        Args:
+            task_name: Name of the task to modify
+            wcet: New nominal WCET
+            period: New period or minimal inter-arrival time
+            priority: New RM priority
+            deadline: New deadline
+
+        Returns:
+            Decision dictionary, see decide
+        """
+        return self.decide(self._with_modified_task(task_name, wcet, period, priority, deadline))
+
+    def modify_task(self, task_name: str, wcet: Optional[float] = None, period: Optional[float] = None,
+                    priority: Optional[float] = None, deadline: Optional[float] = None) -> Dict[str, Any]:
+        """Modify a task if it is admitted, see check_modify_task."""
+        return self._apply(self._with_modified_task(task_name, wcet, period, priority, deadline))
+
+    def check_add_component(self, component: Component, tasks: List[Task]) -> Dict[str, Any]:
+        """
+        Check whether a new component with its tasks can be added to the core named by its core_id.
+
+        Args:
+            component: The new component
+            tasks: Tasks of the new component
+
+        Returns:
+            Decision dictionary, see decide
+        """
+        return self.decide(self._with_added_component(component, tasks))
+
+    def add_component(self, component: Component, tasks: List[Task]) -> Dict[str, Any]:
+        """Add a component if it is admitted, see check_add_component."""
+        return self._apply(self._with_added_component(component, tasks))
+
+    def remove_component(self, component_id: str) -> Dict[str, Any]:
+        """
+        Remove a component and release its alpha on the core, removing never makes a core unschedulable.
+
+        Args:
+            component_id: Id of the component to remove
+
+        Returns:
+            Decision dictionary of the core without the component
+        """
+        component = self._component(component_id)
+        core = self.cores[component.core_id]
+        core.components = [other for other in core.components if other is not component]
+        self.analyzer.components = [other for other in self.analyzer.components if other is not component]
+        self.analyzer.tasks = [task for task in self.analyzer.tasks if task.component_id != component_id]
+        self.core_alpha[core.core_id] -= self.component_results.pop(component_id)["alpha"]
+        del self.demand_tables[component_id]
+        return {"admitted": True, "applied": True, "reason": None, "component": None, "core_id": core.core_id,
+                "core_alpha": self.core_alpha[core.core_id], "core_schedulable": self.core_schedulable(core.core_id)}
+
+    def decide(self, component: Component, demand: Optional[DemandTable] = None) -> Dict[str, Any]:
+        """
+        Analyze a changed or new component and check Theorem 1 of its core.
+        The change is admitted if the component and its core stay schedulable.
+
+        Args:
+            component: The changed component, it is not part of the system yet
+            demand: Demand table of the changed component, built if not given
+
+        Returns:
+            Dictionary with the verdict, the reason of a rejection, the component result
+            and the alpha sum of the core after the change
+        """
+        component_result = self._analyze(component, demand)
+        core_id = component.core_id
+        other_results = [self.component_results[other.component_id] for other in self.cores[core_id].components
+                         if other.component_id != component.component_id]
+        core_alpha = sum(result["alpha"] for result in other_results) + component_result["alpha"]
+        children = [BDRModel(result["alpha"], result["delta"]) for result in other_results + [component_result]]
+
+        reason = None
+        if not component_result["is_schedulable"]:
+            reason = f"Component {component.component_id} is not schedulable"
+        elif not BDRModel.check_theorem1_schedulability(self.core_bdr, children):
+            reason = f"Theorem 1 fails on core {core_id} with alpha sum {core_alpha:.4f}"
+        elif not all(result["is_schedulable"] for result in other_results):
+            reason = f"Core {core_id} has unschedulable components"
+        return {"admitted": reason is None, "applied": False, "reason": reason, "component": component_result,
+                "core_id": core_id, "core_alpha": core_alpha, "core_schedulable": reason is None}
+
+    def core_schedulable(self, core_id: str) -> bool:
+        """Check Theorem 1 and every component of a core from the resident results."""
+        results = [self.component_results[component.component_id] for component in self.cores[core_id].components]
+        return all(result["is_schedulable"] for result in results) and BDRModel.check_theorem1_schedulability(
+            self.core_bdr, [BDRModel(result["alpha"], result["delta"]) for result in results])
+
+    def _apply(self, component: Component, demand: Optional[DemandTable] = None) -> Dict[str, Any]:
+        """Decide on a changed component and replace the old one and its demand table if the change is admitted."""
+        if demand is None:
+            demand = self._demand(component)
+        decision = self.decide(component, demand)
+        if not decision["admitted"]:
+            return decision
+        core = self.cores[component.core_id]
+        old = next((other for other in core.components if other.component_id == component.component_id), None)
+        if old is None:
+            core.components.append(component)
+            self.analyzer.components.append(component)
+        else:
+            core.components[core.components.index(old)] = component
+            self.analyzer.components[self.analyzer.components.index(old)] = component
+        self.analyzer.tasks = [task for task in self.analyzer.tasks
+                               if task.component_id != component.component_id] + component.tasks
+        self.component_results[component.component_id] = decision["component"]
+        self.demand_tables[component.component_id] = demand
+        self.core_alpha[core.core_id] = decision["core_alpha"]
+        decision["applied"] = True
+        return decision
+
+    def _with_added_task(self, task: Task) -> Component:
+        component = self._component(task.component_id)
+        self._check_new_task_names([task])
+        return self._with_tasks(component, component.tasks + [task])
+
+    def _with_removed_task(self, task_name: str) -> Component:
+        component = self._component_of(task_name)
+        return self._with_tasks(component, [task for task in component.tasks if task.task_name != task_name])
+
+    def _with_modified_task(self, task_name: str, wcet: Optional[float], period: Optional[float],
+                            priority: Optional[float], deadline: Optional[float]) -> Component:
+        component = self._component_of(task_name)
+        task = next(task for task in component.tasks if task.task_name == task_name)
+        modified = Task(task_name=task.task_name,
+                        wcet=task.original_wcet if wcet is None else wcet,
+                        period=task.period if period is None else period,
+                        component_id=task.component_id,
+                        priority=task.priority if priority is None else priority,
+                        task_type=task.task_type,
+                        deadline=task.deadline if deadline is None else deadline)
+        return self._with_tasks(component, [modified if other is task else other for other in component.tasks])
+
+    def _with_added_component(self, component: Component, tasks: List[Task]) -> Component:
+        if component.core_id not in self.cores:
+            raise ValueError(f"Unknown core: {component.core_id}")
+        if component.component_id in self.component_results:
+            raise ValueError(f"Component {component.component_id} already exists")
+        self._check_new_task_names(tasks)
+        return self._with_tasks(component, tasks)
+
+    def _check_new_task_names(self, tasks: List[Task]) -> None:
+        """Task names identify tasks in the whole system, see _component_of."""
+        names = [task.task_name for task in tasks]
+        for core in self.cores.values():
+            for component in core.components:
+                for task in component.tasks:
+                    if task.task_name in names:
+                        raise ValueError(f"Task {task.task_name} already exists in component {component.component_id}")
+        if len(set(names)) != len(names):
+            raise ValueError("The new tasks have duplicate names")
+
+    def _with_tasks(self, component: Component, tasks: List[Task]) -> Component:
+        """Copy a component with another task list, the polling server follows the new tasks."""
+        changed = copy.copy(component)
+        changed.tasks = list(tasks)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.analyzer.attach_polling_server(changed)
+        return changed
+
+    def _analyze(self, component: Component, demand: Optional[DemandTable] = None) -> Dict:
+        speed_factor = float(self.cores[component.core_id].speed_factor)
+        # the search reports its progress on stdout, queries are answered quietly
+        with contextlib.redirect_stdout(io.StringIO()):
+            return self.analyzer.analyze_component(component, self.core_bdr, speed_factor, demand)
+
+    def _demand(self, component: Component, added_task: Optional[str] = None) -> DemandTable:
+        """
+        Get the demand table of the effective load of a component. If the component only differs
+        from the resident one by the added task, the resident table is extended by it.
+
+        Args:
+            component: The changed or new component
+            added_task: Name of the task added to the resident component, if any
+
+        Returns:
+            Demand table of the component
+        """
+        _, _, effective_tasks, _ = self.analyzer.effective_tasks(
+            component, float(self.cores[component.core_id].speed_factor))
+        resident = self.demand_tables.get(component.component_id)
+        added = next((task for task in effective_tasks if task.task_name == added_task), None)
+        # a sporadic task is not part of the load and can change the polling server
+        if resident is not None and added is not None and \
+                task_set_fingerprint(resident.tasks + [added]) == task_set_fingerprint(effective_tasks):
+            return resident.with_task(added)
+        return DemandTable(effective_tasks)
+
+    def _component(self, component_id: str) -> Component:
+        for core in self.cores.values():
+            for component in core.components:
+                if component.component_id == component_id:
+                    return component
+        raise ValueError(f"Unknown component: {component_id}")
+
+    def _component_of(self, task_name: str) -> Component:
+        for core in self.cores.values():
+            for component in core.components:
+                if any(task.task_name == task_name for task in component.tasks):
+                    return component
+        raise ValueError(f"Unknown task: {task_name}")
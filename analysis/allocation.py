@@ -0,0 +1,482 @@
+import io
+import os
+import csv
+import copy
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Optional, Tuple
+from .analysis import HierarchicalSchedulabilityAnalyzer
+from .bdr_model import BDRModel
+from .core import Component
+from .optimizer import BudgetOptimizer
+from .workers import run_jobs, worker_pool
+
+OBJECTIVES = ("headroom", "cores")
+HEURISTICS = ("first", "best", "worst")
+
+# a component's task set and core speed, the key of its interface
+InterfaceJob = Tuple[str, Tuple[str, ...], float]
+
+
+class ComponentAllocator:
+    """
+    Assigns components to cores, and optionally tasks to components, with the analysis as oracle.
+
+    The interface of every component is computed once per distinct core speed factor. It is the
+    half-half interface of the budget and integer period with the least bandwidth, see
+    BudgetOptimizer.optimize_component, so the allocation is scored with the interfaces it is
+    exported with. A core is feasible if all of its components are schedulable at its speed and
+    their alphas sum up to at most 1 (Theorem 1, the delays of the interfaces are always positive). The
+    components are placed by decreasing utilization with first, best and worst fit over the cores
+    ordered by decreasing speed factor, the best placement is refined by a local search that moves
+    single components and swaps pairs of components between cores. A candidate changes two cores,
+    it is scored from the alpha sums of the other cores without analyzing anything. With
+    move_tasks, periodic tasks of the critical core are also moved to components with the same
+    scheduler once no component move improves the allocation, the new interfaces of their
+    components are analyzed in parallel.
+
+    The objective headroom maximises the smallest headroom 1 - alpha sum of the used cores,
+    cores minimises the number of used cores. Unschedulable components and alpha above 1 count
+    as violations, which are always reduced first.
+    """
+
+    def __init__(self, analyzer: HierarchicalSchedulabilityAnalyzer, objective: str = "headroom",
+                 move_tasks: bool = False, max_rounds: int = 200, workers: int = 1):
+        """
+        Initialize the allocator.
+
+        Args:
+            analyzer: Analyzer holding the loaded system, it is not changed
+            objective: headroom or cores, see the class description
+            move_tasks: Also move periodic tasks between components
+            max_rounds: Largest number of local search moves
+            workers: Number of worker processes
+        """
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Unknown allocation objective: {objective}")
+        self.analyzer = analyzer
+        self.objective = objective
+        self.move_tasks = move_tasks
+        self.max_rounds = max_rounds
+        self.workers = workers
+        self.core_bdr = BDRModel(1.0, 0.0)
+        self.speed_factors = {core.core_id: float(core.speed_factor) for core in analyzer.cores}
+        # cores are tried fastest first, a fast core fits the most load
+        self.core_order = sorted(self.speed_factors, key=lambda core_id: -self.speed_factors[core_id])
+        self.components = {component.component_id: component for component in analyzer.components}
+        self.task_index = {task.task_name: index for index, task in enumerate(analyzer.tasks)}
+        self.tasks_by_name = {task.task_name: task for task in analyzer.tasks}
+        self.interfaces: Dict[InterfaceJob, Dict] = {}
+        self.budget_optimizer = BudgetOptimizer(analyzer)
+
+    def allocate(self) -> Dict:
+        """
+        Place all components with every heuristic and refine the best placement.
+
+        Returns:
+            Dictionary with the chosen heuristic, the number of local search moves, the core
+            and the task names of every component and the summaries of the original and the
+            new allocation, see summarize
+        """
+        original = {component_id: component.core_id for component_id, component in self.components.items()}
+        tasks = {component_id: self._task_names(component.tasks)
+                 for component_id, component in self.components.items()}
+        with worker_pool(self, self.workers) or contextlib.nullcontext() as executor:
+            self._evaluate([(component_id, tasks[component_id], speed_factor)
+                            for component_id in self.components
+                            for speed_factor in sorted(set(self.speed_factors.values()))], executor)
+            placements = {heuristic: self.place(heuristic, tasks) for heuristic in HEURISTICS}
+            heuristic = HEURISTICS[0]
+            for candidate in HEURISTICS[1:]:
+                if self._better(self.score(self._loads(placements[candidate], tasks)),
+                                self.score(self._loads(placements[heuristic], tasks))):
+                    heuristic = candidate
+            assignment, tasks, moves = self.refine(dict(placements[heuristic]), tasks, executor)
+
+        original_tasks = {component_id: self._task_names(component.tasks)
+                          for component_id, component in self.components.items()}
+        return {
+            "heuristic": heuristic,
+            "moves": moves,
+            "assignment": assignment,
+            "tasks": tasks,
+            "original": self.summarize(original, original_tasks),
+            "allocation": self.summarize(assignment, tasks),
+        }
+
+    def place(self, heuristic: str, tasks: Dict[str, Tuple[str, ...]]) -> Dict[str, str]:
+        """
+        Place the components by decreasing utilization with a bin-packing heuristic.
+
+        Args:
+            heuristic: first (first core that fits), best (least headroom left) or worst (most headroom left)
+            tasks: Task names of every component
+
+        Returns:
+            Core id of every component
+        """
+        if heuristic not in HEURISTICS:
+            raise ValueError(f"Unknown allocation heuristic: {heuristic}")
+        loads = {core_id: 0.0 for core_id in self.core_order}
+        assignment = {}
+        for component_id in sorted(self.components, key=lambda component_id: -self._utilization(tasks[component_id])):
+            fits = []
+            for core_id in self.core_order:
+                interface = self.interface(component_id, tasks[component_id], self.speed_factors[core_id])
+                if interface["is_schedulable"] and loads[core_id] + interface["alpha"] <= 1.0:
+                    fits.append((core_id, 1.0 - loads[core_id] - interface["alpha"]))
+            if not fits:
+                # nothing fits, the local search has to repair the core with the most room
+                core_id = max(self.core_order, key=lambda core_id: -loads[core_id])
+            elif heuristic == "first":
+                core_id = fits[0][0]
+            elif heuristic == "best":
+                core_id = min(fits, key=lambda fit: fit[1])[0]
+            else:
+                core_id = max(fits, key=lambda fit: fit[1])[0]
+            assignment[component_id] = core_id
+            loads[core_id] += self.interface(component_id, tasks[component_id], self.speed_factors[core_id])["alpha"]
+        return assignment
+
+    def refine(self, assignment: Dict[str, str], tasks: Dict[str, Tuple[str, ...]],
+               executor: Optional[ProcessPoolExecutor] = None) -> Tuple[Dict[str, str], Dict[str, Tuple[str, ...]], int]:
+        """
+        Improve an allocation with the best component move, swap or task move until none improves it.
+
+        Args:
+            assignment: Core id of every component
+            tasks: Task names of every component
+            executor: Worker pool that analyzes the interfaces of task moves, None analyzes them here
+
+        Returns:
+            Tuple of the refined assignment, the refined task names and the number of applied moves
+        """
+        tasks = dict(tasks)
+        loads = self._loads(assignment, tasks)
+        current = self.score(loads)
+        moves = 0
+        while moves < self.max_rounds:
+            best: Optional[Tuple[Tuple, Dict[str, str], Dict[str, Tuple[str, ...]]]] = None
+            for changes in self._component_moves(assignment):
+                candidate = self._score_change(loads, assignment, tasks, changes, {})
+                if best is None or self._better(candidate, best[0]):
+                    best = (candidate, changes, {})
+            if self.move_tasks and (best is None or not self._better(best[0], current)):
+                task_moves = self._task_moves(assignment, tasks, loads)
+                self._evaluate([(component_id, names, self.speed_factors[assignment[component_id]])
+                                for changed in task_moves for component_id, names in changed.items()], executor)
+                for changed in task_moves:
+                    candidate = self._score_change(loads, assignment, tasks, {}, changed)
+                    if best is None or self._better(candidate, best[0]):
+                        best = (candidate, {}, changed)
+            if best is None or not self._better(best[0], current):
+                break
+            assignment.update(best[1])
+            tasks.update(best[2])
+            loads = self._loads(assignment, tasks)
+            current = self.score(loads)
+            moves += 1
+        return assignment, tasks, moves
+
+    def interface(self, component_id: str, task_names: Tuple[str, ...], speed_factor: float) -> Dict:
+        """
+        Get the interface of a component with the given tasks at a core speed, it is analyzed once.
+
+        Args:
+            component_id: Id of the component
+            task_names: Names of its tasks
+            speed_factor: Speed factor of the core
+
+        Returns:
+            Dictionary with the alpha, delta, budget, period and the verdict, see _analyze
+        """
+        job = (component_id, task_names, speed_factor)
+        if job not in self.interfaces:
+            self.interfaces[job] = self._analyze(job)
+        return self.interfaces[job]
+
+    def score(self, loads: Dict[str, Tuple[float, int, int]]) -> Tuple:
+        """
+        Score an allocation from the alpha sum, the unschedulable components and the component
+        count of every core, a larger score is better.
+        """
+        violation, used, min_headroom, squares = 0.0, 0, 1.0, 0.0
+        for alpha, unschedulable, count in loads.values():
+            violation += unschedulable + max(0.0, alpha - 1.0)
+            if count > 0:
+                used += 1
+                min_headroom = min(min_headroom, 1.0 - alpha)
+                squares += alpha * alpha
+        if self.objective == "cores":
+            # concentrated load empties cores, the sum of squares rewards it
+            return -violation, -used, squares, min_headroom
+        total_alpha = sum(alpha for alpha, _, count in loads.values() if count > 0)
+        return -violation, min_headroom, used - total_alpha
+
+    def summarize(self, assignment: Dict[str, str], tasks: Dict[str, Tuple[str, ...]]) -> Dict:
+        """
+        Describe an allocation.
+
+        Args:
+            assignment: Core id of every component
+            tasks: Task names of every component
+
+        Returns:
+            Dictionary with the verdict, the number of used cores, the smallest headroom, the alpha
+            sum and the components of every core and the interface of every component
+        """
+        components = {}
+        cores = {core_id: {"alpha": 0.0, "components": [], "is_schedulable": True} for core_id in self.core_order}
+        for component_id, core_id in assignment.items():
+            interface = self.interface(component_id, tasks[component_id], self.speed_factors[core_id])
+            components[component_id] = dict(interface, core_id=core_id, tasks=list(tasks[component_id]))
+            cores[core_id]["components"].append(component_id)
+            cores[core_id]["alpha"] += interface["alpha"]
+            cores[core_id]["is_schedulable"] &= interface["is_schedulable"]
+        for core_id, core_result in cores.items():
+            children = [BDRModel(components[component_id]["alpha"], components[component_id]["delta"])
+                        for component_id in core_result["components"]]
+            if children and not BDRModel.check_theorem1_schedulability(self.core_bdr, children):
+                core_result["is_schedulable"] = False
+        used = [core_result for core_result in cores.values() if core_result["components"]]
+        return {
+            "is_schedulable": all(core_result["is_schedulable"] for core_result in cores.values()),
+            "cores_used": len(used),
+            "min_headroom": min((1.0 - core_result["alpha"] for core_result in used), default=1.0),
+            "cores": cores,
+            "components": components,
+        }
+
+    def export_allocation(self, allocation: Dict, output_folder: str) -> None:
+        """
+        Write a test case with the new allocation: budgets.csv with the new core of every component,
+        tasks.csv with the new component of every task and architecture.csv without the unused cores.
+        Every component of a core whose components or tasks changed gets the budget and integer
+        period of its interface, the other components keep their budgets. Nothing is written if the
+        half-half interfaces of the exported budgets fail Theorem 1 on a core.
+
+        Args:
+            allocation: Result of allocate
+            output_folder: Folder of the new test case, created if it does not exist
+
+        Raises:
+            ValueError: If a core is not schedulable with the exported budgets
+        """
+        components = allocation["allocation"]["components"]
+        budgets = self.exported_budgets(allocation)
+        failed = []
+        for core_id in self.core_order:
+            children = [BDRModel.from_periodic_resource(*budgets[component_id])
+                        for component_id, result in components.items() if result["core_id"] == core_id]
+            if children and not BDRModel.check_theorem1_schedulability(self.core_bdr, children):
+                failed.append(f"{core_id} (α = {sum(child.alpha for child in children):.4f})")
+        if failed:
+            raise ValueError(f"The exported budgets fail Theorem 1 on {', '.join(failed)}, "
+                             f"the allocation is not exported")
+
+        os.makedirs(output_folder, exist_ok=True)
+        used = {result["core_id"] for result in components.values()}
+        fieldnames, rows = self._read_rows(self.analyzer.architecture_path)
+        self._write_rows(os.path.join(output_folder, "architecture.csv"), fieldnames,
+                         [row for row in rows if row["core_id"] in used])
+
+        fieldnames, rows = self._read_rows(self.analyzer.budgets_path)
+        for row in rows:
+            result = components.get(row["component_id"])
+            if row["component_id"] not in self.components or result is None:
+                continue
+            row["core_id"] = result["core_id"]
+            row["budget"] = f"{budgets[row['component_id']][0]:g}"
+            row["period"] = f"{budgets[row['component_id']][1]:g}"
+        self._write_rows(os.path.join(output_folder, "budgets.csv"), fieldnames, rows)
+
+        component_of = {task_name: component_id for component_id, result in components.items()
+                        for task_name in result["tasks"]}
+        fieldnames, rows = self._read_rows(self.analyzer.tasks_path)
+        for row in rows:
+            row["component_id"] = component_of.get(row["task_name"], row["component_id"])
+        self._write_rows(os.path.join(output_folder, "tasks.csv"), fieldnames, rows)
+        print(f"Allocation exported to {output_folder}")
+
+    def exported_budgets(self, allocation: Dict) -> Dict[str, Tuple[float, float]]:
+        """
+        Get the budget and period every component is exported with. A core changed if it lost or
+        gained a component or one of its components changed tasks, all components of a changed
+        core get the budget and period of their interface. The others keep the budgets of budgets.csv.
+
+        Args:
+            allocation: Result of allocate
+
+        Returns:
+            Dictionary mapping component ids to (budget, period)
+        """
+        components = allocation["allocation"]["components"]
+        original = {component_id: (component.core_id, self._task_names(component.tasks))
+                    for component_id, component in self.components.items()}
+        changed_cores = set()
+        for component_id, result in components.items():
+            if (result["core_id"], tuple(result["tasks"])) != original[component_id]:
+                changed_cores.update({result["core_id"], original[component_id][0]})
+
+        budgets = {}
+        for component_id, result in components.items():
+            component = self.components[component_id]
+            budgets[component_id] = (float(component.budget), float(component.period))
+            if result["core_id"] in changed_cores and result["budget"] is not None:
+                budgets[component_id] = (result["budget"], result["period"])
+        return budgets
+
+    def print_summary(self, allocation: Dict) -> None:
+        """Print the used cores, the smallest headroom and the alpha sum of every core before and after."""
+        original, new = allocation["original"], allocation["allocation"]
+        print("\n===== Allocation =====\n")
+        print(f"Heuristic: {allocation['heuristic']}-fit  Local search moves: {allocation['moves']}")
+        print(f"Cores used: {original['cores_used']} -> {new['cores_used']}  "
+              f"Minimal headroom: {original['min_headroom']:.4f} -> {new['min_headroom']:.4f}  "
+              f"Schedulable: {'YES' if original['is_schedulable'] else 'NO'} -> "
+              f"{'YES' if new['is_schedulable'] else 'NO'}")
+        for core_id in self.core_order:
+            core_result = new["cores"][core_id]
+            print(f"Core: {core_id}  α: {original['cores'][core_id]['alpha']:.4f} -> {core_result['alpha']:.4f}  "
+                  f"Components: {', '.join(core_result['components']) or '-'}")
+
+    def _component_moves(self, assignment: Dict[str, str]) -> List[Dict[str, str]]:
+        """Every move of a single component to another core and every swap of two components."""
+        changes = [{component_id: core_id} for component_id in assignment
+                   for core_id in self.core_order if core_id != assignment[component_id]]
+        component_ids = list(assignment)
+        for index, first in enumerate(component_ids):
+            for second in component_ids[index + 1:]:
+                if assignment[first] != assignment[second]:
+                    changes.append({first: assignment[second], second: assignment[first]})
+        return changes
+
+    def _task_moves(self, assignment: Dict[str, str], tasks: Dict[str, Tuple[str, ...]],
+                    loads: Dict[str, Tuple[float, int, int]]) -> List[Dict[str, Tuple[str, ...]]]:
+        """
+        Every move of a periodic task of the critical core to another component with the same
+        scheduler. The critical core is the one with the least headroom, for the cores objective
+        the used one with the least load. A component keeps at least one task.
+        """
+        used = [core_id for core_id in self.core_order if loads[core_id][2] > 0]
+        if not used:
+            return []
+        if self.objective == "cores":
+            critical = min(used, key=lambda core_id: (-loads[core_id][1], loads[core_id][0]))
+        else:
+            critical = max(used, key=lambda core_id: (loads[core_id][1], loads[core_id][0]))
+        changes = []
+        for source in [component_id for component_id in assignment if assignment[component_id] == critical]:
+            if len(tasks[source]) < 2:
+                continue
+            for task_name in tasks[source]:
+                if self.tasks_by_name[task_name].task_type != "periodic":
+                    continue
+                remaining = tuple(name for name in tasks[source] if name != task_name)
+                for target in assignment:
+                    if target != source and self.components[target].scheduler == self.components[source].scheduler:
+                        changes.append({source: remaining, target: self._task_names(
+                            [self.tasks_by_name[name] for name in tasks[target] + (task_name,)])})
+        return changes
+
+    def _score_change(self, loads: Dict[str, Tuple[float, int, int]], assignment: Dict[str, str],
+                      tasks: Dict[str, Tuple[str, ...]], moved: Dict[str, str],
+                      changed: Dict[str, Tuple[str, ...]]) -> Tuple:
+        """Score an allocation after moving components and changing task sets, only the changed components are summed."""
+        new_loads = dict(loads)
+        for component_id in set(moved) | set(changed):
+            old_core, new_core = assignment[component_id], moved.get(component_id, assignment[component_id])
+            alpha, unschedulable = self._contribution(component_id, tasks[component_id], old_core)
+            load = new_loads[old_core]
+            new_loads[old_core] = (load[0] - alpha, load[1] - unschedulable, load[2] - 1)
+            alpha, unschedulable = self._contribution(component_id, changed.get(component_id, tasks[component_id]),
+                                                      new_core)
+            load = new_loads[new_core]
+            new_loads[new_core] = (load[0] + alpha, load[1] + unschedulable, load[2] + 1)
+        return self.score(new_loads)
+
+    def _loads(self, assignment: Dict[str, str], tasks: Dict[str, Tuple[str, ...]]) -> Dict[str, Tuple[float, int, int]]:
+        return {core_id: self._core_load(core_id, [component_id for component_id in assignment
+                                                   if assignment[component_id] == core_id], tasks)
+                for core_id in self.core_order}
+
+    def _core_load(self, core_id: str, component_ids: List[str],
+                   tasks: Dict[str, Tuple[str, ...]]) -> Tuple[float, int, int]:
+        """Alpha sum of the schedulable components, number of unschedulable components and component count of a core."""
+        alpha, unschedulable = 0.0, 0
+        for component_id in component_ids:
+            component_alpha, component_unschedulable = self._contribution(component_id, tasks[component_id], core_id)
+            alpha += component_alpha
+            unschedulable += component_unschedulable
+        return alpha, unschedulable, len(component_ids)
+
+    def _contribution(self, component_id: str, task_names: Tuple[str, ...], core_id: str) -> Tuple[float, int]:
+        """Alpha a component adds to a core and 1 if it is unschedulable there, unschedulable ones add no alpha."""
+        interface = self.interface(component_id, task_names, self.speed_factors[core_id])
+        return (interface["alpha"], 0) if interface["is_schedulable"] else (0.0, 1)
+
+    def _evaluate(self, jobs: List[InterfaceJob], executor: Optional[ProcessPoolExecutor]) -> None:
+        """Analyze the interfaces of the jobs that are not known yet, in the worker pool if there is one."""
+        pending = list(dict.fromkeys(job for job in jobs if job not in self.interfaces))
+        self.interfaces.update(zip(pending, run_jobs(self, "_analyze", pending, executor=executor)))
+
+    def _analyze(self, job: InterfaceJob) -> Dict:
+        """
+        Analyze a component with a task set at a core speed and choose its budget and period, the
+        original task sets use the analyzer's cache. A schedulable component gets the interface of
+        its budget and period, the minimal interface of the analysis is kept otherwise.
+        """
+        component_id, task_names, speed_factor = job
+        component = self._component_with(component_id, task_names)
+        with contextlib.redirect_stdout(io.StringIO()):
+            if component is self.components[component_id]:
+                result = self.analyzer.analyze_component(component, self.core_bdr, speed_factor)
+            else:
+                result = self.analyzer.analyze_component_uncached(component, self.core_bdr, speed_factor)
+            interface = {"alpha": result["alpha"], "delta": result["delta"], "budget": None, "period": None,
+                         "is_schedulable": result["is_schedulable"]}
+            if result["is_schedulable"]:
+                budget = self.budget_optimizer.optimize_component(component, speed_factor, 0.0)
+                interface["is_schedulable"] = budget["optimized"]
+                if budget["optimized"]:
+                    interface.update({key: budget[key] for key in ("alpha", "delta", "budget", "period")})
+        return interface
+
+    def _component_with(self, component_id: str, task_names: Tuple[str, ...]) -> Component:
+        """The component with another task set, a copy whose polling server follows the new tasks."""
+        component = self.components[component_id]
+        if task_names == self._task_names(component.tasks):
+            return component
+        changed = copy.copy(component)
+        changed.tasks = [self.tasks_by_name[name] for name in task_names]
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.analyzer.attach_polling_server(changed)
+        return changed
+
+    def _utilization(self, task_names: Tuple[str, ...]) -> float:
+        return sum(self.tasks_by_name[name].original_wcet / self.tasks_by_name[name].period for name in task_names)
+
+    def _task_names(self, tasks: List) -> Tuple[str, ...]:
+        """Task names in the order of tasks.csv, equal task sets always get the same key."""
+        return tuple(sorted((task.task_name for task in tasks), key=lambda name: self.task_index[name]))
+
+    @staticmethod
+    def _better(first: Tuple, second: Tuple, tolerance: float = 1e-9) -> bool:
+        """Compare scores, differences within the tolerance do not count so that the search cannot cycle."""
+        for first_value, second_value in zip(first, second):
+            if abs(first_value - second_value) > tolerance:
+                return first_value > second_value
+        return False
+
+    @staticmethod
+    def _read_rows(path: str) -> Tuple[List[str], List[Dict[str, str]]]:
+        with open(path, newline='') as csvfile:
+            reader = csv.DictReader(csvfile)
+            return reader.fieldnames, list(reader)
+
+    @staticmethod
+    def _write_rows(path: str, fieldnames: List[str], rows: List[Dict[str, str]]) -> None:
+        with open(path, 'w', newline='') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(rows)
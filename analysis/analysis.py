@@ -1,25 +1,44 @@
 import os
+import io
 import sys
 import csv
 import math
+import time
+import logging
+import contextlib
 from typing import List, Dict, Tuple, Optional, Union, Any
 from .bdr_model import BDRModel
+from .demand import DemandTable, task_set_fingerprint
+from .cache import InterfaceCache
+from .frontier import InterfaceFrontier, compose_frontiers, export_frontiers
 from .core import Core, Component, Task, Solution
+from .stats import AnalysisStats
 from .utils import load_csv_data
+from .workers import run_jobs
+
+logger = logging.getLogger(__name__)
 
 class HierarchicalSchedulabilityAnalyzer:
     """
     Main class for analyzing hierarchical schedulability using the BDR model.
     """
     
-    def __init__(self, folder_path: str):
+    def __init__(self, folder_path: str, workers: int = 1, cache: Optional[InterfaceCache] = None,
+                 frontier_samples: int = 0):
         """
         Initialize the analyzer with paths to input files.
         
         Args:
             folder_path: Path to the folder containing input files
+            workers: Number of worker processes used to analyze the components
+            cache: Persistent cache of component results, nothing is cached if not given
+            frontier_samples: Number of sampled delays of each component's alpha-delta frontier,
+                no frontiers are computed if 0
         """
         self.folder_path = folder_path
+        self.workers = workers
+        self.cache = cache
+        self.frontier_samples = frontier_samples
         self.architecture_path = os.path.join(folder_path, "architecture.csv")
         self.tasks_path = os.path.join(folder_path, "tasks.csv")
         self.budgets_path = os.path.join(folder_path, "budgets.csv")
@@ -39,6 +58,8 @@ class HierarchicalSchedulabilityAnalyzer:
         
         # Results
         self.analysis_results = {}
+        # Timers and counters of the component analyses since the last analyze_system
+        self.stats = AnalysisStats()
     
     def _build_relationships(self):
         """Build relationships between cores, components, and tasks."""
@@ -49,41 +70,65 @@ class HierarchicalSchedulabilityAnalyzer:
         for component in self.components:
             component.tasks = [task for task in self.tasks if task.component_id == component.component_id]
             
-            # If component has server parameters and sporadic tasks, create the Polling Server Task
-            if component.server_budget is not None and component.server_period is not None:
-                # Check if there are any sporadic tasks actually assigned to this component
-                if any(t.task_type == 'sporadic' for t in component.tasks):
-                    # Assign a priority to the server if the component is RM
-                    # This is a simple heuristic, could be based on T_ps or other rules
-                    server_priority = 0 # Example: highest priority for the server
-                    if component.scheduler == "RM":
-                        # A common approach is to assign server priority based on its period
-                        # For simplicity, or if it's the only server, it might get a high priority.
-                        # Let's find highest existing priority among periodic tasks and make server higher.
-                        periodic_priorities = [p.priority for p in component.tasks if p.task_type == 'periodic' and p.priority is not None]
-                        if periodic_priorities:
-                             server_priority = min(periodic_priorities) -1 if min(periodic_priorities) > 0 else 0
-                        # else if no periodic tasks or no priorities, 0 is fine.
-                        # Ensure priority is not negative if min_priorities was 0
-                        server_priority = max(0, server_priority)
-
-
-                    component.polling_server_task = Task(
-                        task_name=f"{component.component_id}_PS",
-                        wcet=component.server_budget,
-                        period=component.server_period, # Period of the server
-                        component_id=component.component_id, # Belongs to this component
-                        priority=server_priority if component.scheduler == "RM" else None,
-                        task_type="periodic", # The server itself is seen as a periodic load
-                        deadline=component.server_period # Server deadline is its period
-                    )
-                    print(f"INFO: Created Polling Server {component.polling_server_task} for component {component.component_id}")
-
+            self.attach_polling_server(component)
 
         # Associate components with cores
         for core in self.cores:
             core.components = [comp for comp in self.components if comp.core_id == core.core_id]
 
+    def attach_polling_server(self, component: Component) -> None:
+        """
+        Create the polling server task of a component that has server parameters and sporadic tasks.
+        
+        Args:
+            component: Component with its tasks assigned
+        """
+        component.polling_server_task = None
+        # If component has server parameters and sporadic tasks, create the Polling Server Task
+        if component.server_budget is not None and component.server_period is not None:
+            # Check if there are any sporadic tasks actually assigned to this component
+            if any(t.task_type == 'sporadic' for t in component.tasks):
+                component.polling_server_task = self.polling_server_task(component, component.server_budget,
+                                                                         component.server_period)
+                logger.info("Created Polling Server %s for component %s", component.polling_server_task,
+                            component.component_id)
+
+    def polling_server_task(self, component: Component, server_budget: float, server_period: float) -> Task:
+        """
+        Get the periodic task that represents a polling server of a component.
+        
+        Args:
+            component: Component with its tasks assigned
+            server_budget: Nominal budget of the server (Cps)
+            server_period: Period of the server (Tps)
+            
+        Returns:
+            The server task, its deadline is its period
+        """
+        # Assign a priority to the server if the component is RM
+        # This is a simple heuristic, could be based on T_ps or other rules
+        server_priority = 0 # Example: highest priority for the server
+        if component.scheduler == "RM":
+            # A common approach is to assign server priority based on its period
+            # For simplicity, or if it's the only server, it might get a high priority.
+            # Let's find highest existing priority among periodic tasks and make server higher.
+            periodic_priorities = [p.priority for p in component.tasks if p.task_type == 'periodic' and p.priority is not None]
+            if periodic_priorities:
+                 server_priority = min(periodic_priorities) -1 if min(periodic_priorities) > 0 else 0
+            # else if no periodic tasks or no priorities, 0 is fine.
+            # Ensure priority is not negative if min_priorities was 0
+            server_priority = max(0, server_priority)
+
+        return Task(
+            task_name=f"{component.component_id}_PS",
+            wcet=server_budget,
+            period=server_period, # Period of the server
+            component_id=component.component_id, # Belongs to this component
+            priority=server_priority if component.scheduler == "RM" else None,
+            task_type="periodic", # The server itself is seen as a periodic load
+            deadline=server_period # Server deadline is its period
+        )
+
     def analyze_system(self) -> Dict:
         """
         Analyze the entire system, including all cores and components.
@@ -95,24 +140,35 @@ class HierarchicalSchedulabilityAnalyzer:
             "is_schedulable": True,
             "cores": []
         }
+        self.stats = AnalysisStats()
+        start = time.perf_counter()
+        memo_info = BDRModel.memo.info()
+        
+        # The component searches are independent until Theorem 1, run them in parallel
+        component_results = self.analyze_components_parallel() if self.workers > 1 else None
         
         # Analyze each core
         for core in self.cores:
-            core_result = self.analyze_core(core)
+            core_result = self.analyze_core(core, component_results)
             system_results["cores"].append(core_result)
             
             # System is schedulable only if all cores are schedulable
             if not core_result["is_schedulable"]:
                 system_results["is_schedulable"] = False
         
+        self.stats.seconds = time.perf_counter() - start
+        self.stats.verdict_memo = {name: BDRModel.memo.info()[name] - memo_info[name] for name in ("hits", "misses")}
+        if self.cache is not None:
+            self.stats.interface_cache = {"hits": self.cache.hits, "misses": self.cache.misses}
         return system_results
     
-    def analyze_core(self, core: Core) -> Dict:
+    def analyze_core(self, core: Core, component_results: Optional[Dict[str, Dict]] = None) -> Dict:
         """
         Analyze a single core and its components.
         
         Args:
             core: Core to analyze
+            component_results: Results of already analyzed components by component id
             
         Returns:
             Dictionary with analysis results for the core
@@ -134,8 +190,11 @@ class HierarchicalSchedulabilityAnalyzer:
         # Analyze each component on this core
         component_bdrs = []
         for component in core.components:
-            # Pass the speed factor to analyze_component
-            component_result = self.analyze_component(component, core_bdr, speed_factor)
+            if component_results is not None and component.component_id in component_results:
+                component_result = component_results[component.component_id]
+            else:
+                # Pass the speed factor to analyze_component
+                component_result = self.analyze_component(component, core_bdr, speed_factor)
             core_result["components"].append(component_result)
             
             # Get component's BDR model for Theorem 1 check
@@ -153,22 +212,111 @@ class HierarchicalSchedulabilityAnalyzer:
                 core_result["is_schedulable"] = False
                 core_result["theorem1_failed"] = True
         
+        # Pick the interfaces of all components from their frontiers at once
+        if self.frontier_samples > 0 and core_result["components"]:
+            core_result["composition"] = self.compose_core(core_bdr, core_result["components"])
+        
         return core_result
+    
+    def compose_core(self, core_bdr: BDRModel, component_results: List[Dict]) -> Optional[Dict[str, Dict]]:
+        """
+        Choose one interface per component from the frontiers such that Theorem 1 holds for the core.
+        The alpha left over by the minimal interfaces is spent on larger delays, which gives
+        the components longer periods. No schedulability test is run, the frontiers hold the answers.
+        
+        Args:
+            core_bdr: BDR model of the core
+            component_results: Results of the components on the core
+            
+        Returns:
+            Dictionary mapping component ids to alpha, delta, budget and period,
+            None if a component has no frontier or no choice satisfies Theorem 1
+        """
+        if any(component_result.get("frontier") is None for component_result in component_results):
+            return None
+        frontiers = [InterfaceFrontier.from_dict(component_result["frontier"]) for component_result in component_results]
+        composition = compose_frontiers(frontiers, core_bdr.alpha, core_bdr.delta)
+        if composition is not None:
+            for interface in composition.values():
+                budget, period = BDRModel(interface["alpha"], interface["delta"]).to_periodic_resource()
+                interface["budget"] = budget
+                interface["period"] = period
+        return composition
 
 
 
     
-    def analyze_component(self, component: Component, parent_bdr: BDRModel, speed_factor: float) -> Dict:
-        # Initialize component result dictionary
-        component_result = {
+    def analyze_component(self, component: Component, parent_bdr: BDRModel, speed_factor: float,
+                          demand: Optional[DemandTable] = None) -> Dict:
+        """
+        Analyze a component, its result is taken from the cache if the cache holds its inputs.
+        
+        Args:
+            component: Component to analyze
+            parent_bdr: BDR model of the parent
+            speed_factor: Speed factor of the core
+            demand: Demand table of the effective load of the component, built if not given
+            
+        Returns:
+            Dictionary with analysis results for the component
+        """
+        key = None
+        start = time.perf_counter()
+        if self.cache is not None:
+            key = self.component_cache_key(component, parent_bdr, speed_factor)
+            cached_result = self.cache.get(key)
+            if cached_result is not None:
+                logger.info("Using cached interface for component %s", component.component_id)
+                self.stats.add_component(component.component_id, time.perf_counter() - start, cache_hit=True)
+                return cached_result
+        counters = BDRModel.counters.snapshot()
+        component_result = self.analyze_component_uncached(component, parent_bdr, speed_factor, demand)
+        self.stats.add_component(component.component_id, time.perf_counter() - start,
+                                 BDRModel.counters.since(counters))
+        if key is not None:
+            self.cache.put(key, component_result)
+        return component_result
+    
+    def component_cache_key(self, component: Component, parent_bdr: BDRModel, speed_factor: float) -> str:
+        """
+        Get the cache key of a component from everything its analysis depends on:
+        the scheduler, the speed adjusted tasks, the server and the parent BDR model.
+        
+        Args:
+            component: Component to analyze
+            parent_bdr: BDR model of the parent
+            speed_factor: Speed factor of the core
+            
+        Returns:
+            Cache key
+        """
+        def task_content(task: Task) -> List:
+            return [task.task_name, task.original_wcet, task.original_wcet / speed_factor, task.period,
+                    task.priority, task.task_type, task.deadline]
+        
+        server = component.polling_server_task
+        return InterfaceCache.make_key({
             "component_id": component.component_id,
             "scheduler": component.scheduler,
-            "is_schedulable": False,
-            "tasks_schedulable": [], # Will store dicts for each task's analysis
-            "sporadic_tasks_analysis": {}, # Store server specific info
-            "alpha": 0.0, "delta": 0.0, "budget": 0.0, "period": 0.0 # BDR params
-        }
-
+            "budget": [component.budget, component.period],
+            "tasks": [task_content(task) for task in component.tasks],
+            "server": task_content(server) if server else None,
+            "parent": [parent_bdr.alpha, parent_bdr.delta],
+            "frontier_samples": self.frontier_samples,
+        })
+    
+    def effective_tasks(self, component: Component, speed_factor: float) -> Tuple[List[Task], List[Task], List[Task], Optional[Task]]:
+        """
+        Get the speed adjusted tasks of a component and the load its BDR interface has to serve.
+        
+        Args:
+            component: Component to analyze
+            speed_factor: Speed factor of the core
+            
+        Returns:
+            Tuple of the periodic tasks, the sporadic tasks, the effective load (periodic tasks
+            and polling server) and the polling server task, which is None without a server
+        """
         # Adjust WCETs for core speed and separate task types
         native_periodic_tasks_adjusted: List[Task] = []
         sporadic_tasks_for_server_adjusted: List[Task] = []
@@ -191,10 +339,8 @@ class HierarchicalSchedulabilityAnalyzer:
         # This includes native periodic tasks and the Polling Server task (if any)
         effective_tasks_for_bdr: List[Task] = list(native_periodic_tasks_adjusted)
         ps_task_for_analysis: Optional[Task] = None
-        has_server = False
 
         if component.polling_server_task:
-            has_server = True
             # Server's budget (Cps) is CPU time, so adjust for core speed when part of component's BDR demand
             adjusted_server_wcet = component.polling_server_task.original_wcet / speed_factor
             ps_task_for_analysis = Task(
@@ -210,8 +356,33 @@ class HierarchicalSchedulabilityAnalyzer:
             ps_task_for_analysis.original_wcet = component.polling_server_task.original_wcet
             effective_tasks_for_bdr.append(ps_task_for_analysis)
 
+        return native_periodic_tasks_adjusted, sporadic_tasks_for_server_adjusted, effective_tasks_for_bdr, ps_task_for_analysis
+    
+    def analyze_component_uncached(self, component: Component, parent_bdr: BDRModel, speed_factor: float,
+                                   demand: Optional[DemandTable] = None) -> Dict:
+        # Initialize component result dictionary
+        component_result = {
+            "component_id": component.component_id,
+            "scheduler": component.scheduler,
+            "is_schedulable": False,
+            "tasks_schedulable": [], # Will store dicts for each task's analysis
+            "sporadic_tasks_analysis": {}, # Store server specific info
+            "alpha": 0.0, "delta": 0.0, "budget": 0.0, "period": 0.0, # BDR params
+            "witness_points": {} # Time points that decide the verdicts
+        }
+
+        native_periodic_tasks_adjusted, sporadic_tasks_for_server_adjusted, effective_tasks_for_bdr, ps_task_for_analysis = \
+            self.effective_tasks(component, speed_factor)
+        has_server = ps_task_for_analysis is not None
+
+        # The demand of the effective load does not depend on the interface, build it once
+        # unless the caller holds it already, a table of another task set is not used
+        effective_demand = demand
+        if demand is None or demand.fingerprint != task_set_fingerprint(effective_tasks_for_bdr):
+            effective_demand = DemandTable(effective_tasks_for_bdr)
+
         # 1. Find minimal BDR interface for the component's effective load (periodic + server)
-        found_bdr_params = self.find_minimal_bdr_interface(component, effective_tasks_for_bdr, parent_bdr.delta)
+        found_bdr_params = self.find_minimal_bdr_interface(component, effective_tasks_for_bdr, parent_bdr.delta, effective_demand)
         component_bdr_for_analysis: Optional[BDRModel] = None
         component_internally_schedulable = False # Schedulability of (periodic tasks + server task)
 
@@ -220,9 +391,9 @@ class HierarchicalSchedulabilityAnalyzer:
             component_bdr_for_analysis = BDRModel(derived_alpha, derived_delta)
             # Check if effective tasks are schedulable under this derived BDR
             if component.scheduler == "EDF":
-                component_internally_schedulable = component_bdr_for_analysis.is_schedulable_edf_workload(effective_tasks_for_bdr)
+                component_internally_schedulable = component_bdr_for_analysis.is_schedulable_edf_workload(effective_tasks_for_bdr, effective_demand)
             else: # RM
-                component_internally_schedulable = component_bdr_for_analysis.is_schedulable_rm_workload(effective_tasks_for_bdr)
+                component_internally_schedulable = component_bdr_for_analysis.is_schedulable_rm_workload(effective_tasks_for_bdr, effective_demand)
         else:
             # Fallback to using original budget/period from CSV if find_minimal_bdr_interface fails
             original_budget = float(component.budget)
@@ -236,28 +407,43 @@ class HierarchicalSchedulabilityAnalyzer:
 
         component_result["alpha"] = derived_alpha
         component_result["delta"] = derived_delta
+        if self.frontier_samples > 0:
+            # The frontier starts at the minimal interface and follows alpha over larger delays
+            frontier = InterfaceFrontier.from_demand(component.component_id, component.scheduler, effective_demand,
+                                                     derived_delta, self.frontier_samples) if found_bdr_params else None
+            component_result["frontier"] = frontier.to_dict() if frontier else None
         if component_bdr_for_analysis: # Should always be true due to fallback
              q_comp_bdr, p_comp_bdr = component_bdr_for_analysis.to_periodic_resource()
              component_result["budget"] = q_comp_bdr
              component_result["period"] = p_comp_bdr
+             component_result["witness_points"] = component_bdr_for_analysis.witness_points(
+                 effective_tasks_for_bdr, component.scheduler, effective_demand)
+
+        # Response times of the periodic tasks and the server under the derived component BDR
+        response_times = {}
+        if component_bdr_for_analysis and effective_tasks_for_bdr:
+            response_times = self.response_times(component, component_bdr_for_analysis, effective_demand)
 
         # 2. Analyze schedulability of NATIVE PERIODIC tasks under the derived component BDR
         if native_periodic_tasks_adjusted and component_bdr_for_analysis:
             sched_details_periodic = {}
             if component.scheduler == "EDF":
                 # If the combined load (periodic+server) is EDF schedulable, native periodics are too.
-                all_effective_sched = component_bdr_for_analysis.is_schedulable_edf_workload(effective_tasks_for_bdr)
+                all_effective_sched = component_bdr_for_analysis.is_schedulable_edf_workload(effective_tasks_for_bdr, effective_demand)
                 for task in native_periodic_tasks_adjusted:
                     sched_details_periodic[task.task_name] = all_effective_sched
             else: # RM
-                sched_details_periodic = component_bdr_for_analysis.get_schedulable_tasks_rm(native_periodic_tasks_adjusted)
+                # Without a server the native tasks are the effective load and share its scheduling points
+                native_demand = effective_demand if not has_server else DemandTable(native_periodic_tasks_adjusted)
+                sched_details_periodic = component_bdr_for_analysis.get_schedulable_tasks_rm(native_periodic_tasks_adjusted,
+                                                                                            native_demand)
 
             for task in native_periodic_tasks_adjusted:
                 is_task_sched = sched_details_periodic.get(task.task_name, False)
                 component_result["tasks_schedulable"].append({
                     "task_name": task.task_name, "wcet": task.original_wcet, "period": task.period,
                     "task_type": "periodic", "deadline": task.deadline, "is_schedulable": is_task_sched,
-                    "wcrt": -1.0 # WCRT for periodic tasks not calculated in this step
+                    "wcrt": response_times[task.task_name]
                 })
                 if not is_task_sched: component_internally_schedulable = False # Re-evaluate based on individual results
 
@@ -267,9 +453,9 @@ class HierarchicalSchedulabilityAnalyzer:
             if component.scheduler == "EDF":
                 # If the set of effective_tasks_for_bdr (which includes ps_task_for_analysis)
                 # is schedulable by EDF, then ps_task_for_analysis is schedulable.
-                server_is_schedulable_by_bdr = component_bdr_for_analysis.is_schedulable_edf_workload(effective_tasks_for_bdr)
+                server_is_schedulable_by_bdr = component_bdr_for_analysis.is_schedulable_edf_workload(effective_tasks_for_bdr, effective_demand)
             else: # RM
-                server_is_schedulable_by_bdr = component_bdr_for_analysis.is_schedulable_rm_task(ps_task_for_analysis, effective_tasks_for_bdr)
+                server_is_schedulable_by_bdr = component_bdr_for_analysis.is_schedulable_rm_task(ps_task_for_analysis, effective_tasks_for_bdr, effective_demand)
             
             component_result["tasks_schedulable"].append({
                 "task_name": ps_task_for_analysis.task_name,
@@ -277,7 +463,7 @@ class HierarchicalSchedulabilityAnalyzer:
                 "period": ps_task_for_analysis.period, # Tps
                 "task_type": "server", "deadline": ps_task_for_analysis.deadline,
                 "is_schedulable": server_is_schedulable_by_bdr,
-                "wcrt": -1.0 # WCRT for server itself not calculated here beyond schedulability
+                "wcrt": response_times[ps_task_for_analysis.task_name]
             })
             if not server_is_schedulable_by_bdr: component_internally_schedulable = False
 
@@ -343,6 +529,111 @@ class HierarchicalSchedulabilityAnalyzer:
         return component_result
 
         
+    def response_times(self, component: Component, component_bdr: BDRModel, demand: DemandTable) -> Dict[str, float]:
+        """
+        Get the worst-case response times of the periodic tasks and the polling server of a
+        component under its interface, exact for RM and bounded by the busy period for EDF.
+        
+        Args:
+            component: Component to analyze
+            component_bdr: Interface of the component
+            demand: Demand table of the periodic tasks and the polling server
+            
+        Returns:
+            Dictionary mapping task names to response times, inf if a task misses its deadline (RM)
+            or the busy period does not end (EDF)
+        """
+        if component.scheduler == "EDF":
+            return component_bdr.response_times_edf(demand, component_bdr.is_schedulable_edf_workload(demand.tasks, demand))
+        return component_bdr.response_times_rm(demand)
+    
+    def estimate_component_cost(self, component: Component) -> int:
+        """
+        Estimate the cost of analyzing a component by the number of time points its
+        schedulability tests check, the WCETs do not change the points.
+        
+        Args:
+            component: Component to estimate
+            
+        Returns:
+            Number of check points
+        """
+        tasks = list(component.tasks)
+        if component.polling_server_task:
+            tasks.append(component.polling_server_task)
+        tasks = [task for task in tasks if task.task_type != "sporadic"]
+        if not tasks:
+            return 0
+        demand = DemandTable(tasks)
+        if component.scheduler == "EDF":
+            return demand.edf_point_count()
+        return sum(int(task.period // hp_task.period) + 1
+                   for task in tasks for hp_task in demand.higher_priority_tasks(task))
+    
+    def analyze_components_parallel(self) -> Dict[str, Dict]:
+        """
+        Analyze all components in a process pool, the most expensive ones first.
+        The output printed by each component analysis is replayed in the original order.
+        
+        Returns:
+            Dictionary mapping component ids to their results
+        """
+        jobs = []
+        for core in self.cores:
+            for component in core.components:
+                jobs.append((core.core_id, component.component_id))
+        
+        # cached components are not sent to the workers
+        outputs, keys = {}, {}
+        if self.cache is not None:
+            for job in jobs:
+                component = self._find_component(job[1])
+                speed_factor = float(next(core for core in self.cores if core.core_id == job[0]).speed_factor)
+                keys[job] = self.component_cache_key(component, BDRModel(1.0, 0.0), speed_factor)
+                cached_result = self.cache.get(keys[job])
+                if cached_result is not None:
+                    outputs[job] = (None, cached_result)
+                    self.stats.add_component(job[1], 0.0, cache_hit=True)
+        
+        missing = [job for job in jobs if job not in outputs]
+        costs = {job: self.estimate_component_cost(self._find_component(job[1])) for job in missing}
+        ordered = sorted(missing, key=lambda job: costs[job], reverse=True)
+        for job, (output, component_result, seconds, counters) in zip(
+                ordered, run_jobs(self, "_analyze_job", ordered, self.workers)):
+            outputs[job] = (output, component_result)
+            self.stats.add_component(job[1], seconds, counters)
+            if self.cache is not None:
+                self.cache.put(keys[job], component_result)
+        
+        component_results = {}
+        for job in jobs:
+            output, component_result = outputs[job]
+            if output is None:
+                logger.info("Using cached interface for component %s", job[1])
+            else:
+                print(output, end="")
+            component_results[job[1]] = component_result
+        return component_results
+    
+    def _find_component(self, component_id: str) -> Component:
+        return next(component for component in self.components if component.component_id == component_id)
+
+    def _analyze_job(self, job: Tuple[str, str]) -> Tuple[str, Dict, float, Dict[str, int]]:
+        """
+        Analyze a single component of analyze_components_parallel and return its printed output,
+        its result, its run time and the work counters of its schedulability tests.
+        """
+        core = next(core for core in self.cores if core.core_id == job[0])
+        component = self._find_component(job[1])
+        output = io.StringIO()
+        start = time.perf_counter()
+        counters = BDRModel.counters.snapshot()
+        with contextlib.redirect_stdout(output):
+            # same top level BDR as analyze_core, the parent process handles the cache
+            component_result = self.analyze_component_uncached(component, BDRModel(1.0, 0.0),
+                                                               float(core.speed_factor))
+        return output.getvalue(), component_result, time.perf_counter() - start, BDRModel.counters.since(counters)
+    
     def export_results_to_csv(self, results: Dict, output_path: str = None) -> None:
         """
         Export analysis results to a CSV file.
@@ -368,7 +659,8 @@ class HierarchicalSchedulabilityAnalyzer:
                         "component_id": component_id,
                         "task_schedulable": 1 if task_result["is_schedulable"] else 0,
                         "avg_response_time": 0.0,  # Not calculated in analysis
-                        "max_response_time": 0.0,  # Not calculated in analysis
+                        # a response time without bound is written as -1
+                        "max_response_time": round(task_result["wcrt"], 4) if math.isfinite(task_result["wcrt"]) else -1.0,
                         "component_schedulable": component_schedulable
                     })
         
@@ -386,6 +678,23 @@ class HierarchicalSchedulabilityAnalyzer:
 
         print(f"Final result: {results['is_schedulable']}")
     
+    def export_frontiers_to_json(self, results: Dict, output_path: str = None) -> None:
+        """
+        Export the alpha-delta frontiers of all components to a JSON file.
+        
+        Args:
+            results: Analysis results dictionary
+            output_path: Path to output JSON file (default: frontiers.json in the same folder)
+        """
+        if output_path is None:
+            output_path = os.path.join(self.folder_path, "frontiers.json")
+        
+        frontiers = [InterfaceFrontier.from_dict(component_result["frontier"])
+                     for core_result in results["cores"] for component_result in core_result["components"]
+                     if component_result.get("frontier") is not None]
+        export_frontiers(frontiers, output_path)
+        print(f"Frontiers exported to {output_path}")
+    
     def print_analysis_results(self, results: Dict) -> None:
         """
         Print analysis results in a human-readable format.
@@ -405,6 +714,12 @@ class HierarchicalSchedulabilityAnalyzer:
             if core_result.get("theorem1_failed"):
                 print("  NOTE: Failed Theorem 1 check for components")
             
+            if core_result.get("composition"):
+                print("  Composed interfaces:")
+                for component_id, interface in core_result["composition"].items():
+                    print(f"    {component_id}: α={interface['alpha']:.4f}, Δ={interface['delta']:.4f}, "
+                          f"Budget={interface['budget']:.4f}, Period={interface['period']:.4f}")
+            
             for component_result in core_result["components"]:
                 print(f"\n  Component: {component_result['component_id']}")
                 print(f"    Scheduler: {component_result['scheduler']}")
@@ -425,6 +740,7 @@ class HierarchicalSchedulabilityAnalyzer:
                     print(f"      Task: {task_result['task_name']}")
                     print(f"        WCET: {task_result['wcet']:.4f}")
                     print(f"        Period: {task_result['period']:.4f}")
+                    print(f"        WCRT: {task_result['wcrt']:.4f}")
                     print(f"        Schedulable: {'YES' if task_result['is_schedulable'] else 'NO'}")
         
         print("\n" + "="*50)
@@ -444,15 +760,22 @@ class HierarchicalSchedulabilityAnalyzer:
         
         # Export results
         self.export_results_to_csv(results)
+        if self.frontier_samples > 0:
+            self.export_frontiers_to_json(results)
+        
+        if self.cache is not None:
+            logger.info("Interface cache hits: %d, misses: %d", self.cache.hits, self.cache.misses)
         
         return results
     
 
 
-    def find_minimal_bdr_interface(self, component: Component, adjusted_tasks: List[Task], parent_bdr_delta: float) -> Optional[Tuple[float, float]]:
+    def find_minimal_bdr_interface(self, component: Component, adjusted_tasks: List[Task], parent_bdr_delta: float,
+                                   demand: Optional[DemandTable] = None) -> Optional[Tuple[float, float]]:
         """
-        Iteratively finds a minimal BDR interface (alpha, delta) for the component's tasks,
+        Finds the minimal BDR interface (alpha, delta) for the component's tasks,
         considering the parent's delta to ensure hierarchical compatibility.
+        Every candidate interface reads the demand from one table of adjusted_tasks.
         """
         if not adjusted_tasks:
             # For an empty component, can be considered schedulable with minimal resource.
@@ -473,79 +796,51 @@ class HierarchicalSchedulabilityAnalyzer:
 
         min_theoretical_alpha = sum(task.wcet / task.period for task in adjusted_tasks)
         if min_theoretical_alpha > 1.0:
-            print(f"    DEBUG: Component {component.component_id} task utilization {min_theoretical_alpha:.4f} > 1.0. Fundamentally unschedulable.")
+            logger.debug("Component %s task utilization %.4f > 1.0. Fundamentally unschedulable.",
+                         component.component_id, min_theoretical_alpha)
             return None
 
-        # Define Search Parameters (tune these)
-        # delta_max heuristic based on hyperperiod of tasks, capped for performance
-        periods = [int(task.period) for task in adjusted_tasks if task.period > 0]
-        if not periods: # handles cases where no tasks or tasks have zero period
-            delta_max = 100.0
-        else:
-            delta_max = float(math.lcm(*periods))
-
-        if delta_max > 5000.0: # Cap delta_max for computational efficiency
-            delta_max = 5000.0
-        if delta_max == 0 : delta_max = 100.0 # Ensure delta_max is positive if LCM was 0
+        # For a fixed delta the minimal alpha follows in closed form from the demand at the
+        # checked time points. It never decreases with delta, so the first admissible delta
+        # also gives the smallest alpha and no walk over delta or alpha is needed.
+        delta = 0.0
+        if abs(parent_bdr_delta) < 1e-9:  # If parent's delta is effectively zero
+            delta = 1.0  # Child's delta must be > 0
 
-        delta_step = 1.0  # Or a smaller configurable value (e.g., self.delta_search_step)
-        alpha_step = 0.01
+        logger.debug("Searching BDR for %s. Min theoretical alpha: %.4f. Delta: %.4f",
+                     component.component_id, min_theoretical_alpha, delta)
 
-        # Determine starting delta for the search
-        start_iter_delta = 0.0
-        if abs(parent_bdr_delta) < 1e-9:  # If parent's delta is effectively zero
-            start_iter_delta = delta_step    # Child's delta must be > 0
-
-        # If parent_bdr_delta > 0, child could potentially have delta = 0 if that's its true minimum.
-        # The Theorem 1 check (child_delta > parent_delta) will handle compatibility.
-        # So, `start_iter_delta` can generally be 0.0, and let Theorem 1 filter.
-        # The key change was making Theorem 1 strict.
-        # However, to directly solve "1-tiny-test-case" where parent_delta=0, child_delta must become > 0.
-        # So, `start_iter_delta` must be forced if parent_delta=0.
-
-        print(f"    DEBUG: Searching BDR for {component.component_id}. Min theoretical alpha: {min_theoretical_alpha:.4f}. Max delta: {delta_max}. Starting delta search from: {start_iter_delta:.4f}")
-
-        current_delta = start_iter_delta
-        while current_delta <= delta_max:
-            min_alpha_for_loop = max(0.01, min_theoretical_alpha)
-            if min_theoretical_alpha > 0 and min_theoretical_alpha < 0.01:
-                min_alpha_for_loop = min_theoretical_alpha
-
-            current_alpha = min_alpha_for_loop
-            while current_alpha <= 1.001: # Loop slightly past 1.0
-                alpha_to_test = min(current_alpha, 1.0)
-                if alpha_to_test < 0.001 and min_theoretical_alpha == 0 and len(adjusted_tasks) > 0 :
-                    alpha_to_test = 0.001 
-                elif not adjusted_tasks: # Should be caught earlier, but for safety
-                    alpha_to_test = 0.0 # Minimal alpha for empty component
-                    # If alpha=0, delta can also be 0 for an empty component that needs no resources
-                    # and has no delay in providing nothing.
-                    # Or, use a convention like (0.0, a_small_positive_delta) if parent_delta=0.
-                    # This case is tricky; let's assume (0.0, 0.0) if truly empty, handled by earlier check.
-
-
-                test_bdr = BDRModel(alpha_to_test, current_delta)
-                is_component_schedulable = False
+        if demand is None:
+            demand = DemandTable(adjusted_tasks)
+        # At or beyond the first checked time point no supply arrives in time for any alpha
+        if delta >= demand.delay_bound(component.scheduler):
+            logger.debug("No suitable BDR found for component %s. Delta %.4f exceeds the first check point.",
+                         component.component_id, delta)
+            return None
+        if component.scheduler == "EDF":
+            alpha = BDRModel.minimal_alpha_edf(demand, delta)
+        else:  # RM
+            alpha = BDRModel.minimal_alpha_rm(demand, delta)
+
+        if alpha is not None and alpha <= 1.0:
+            alpha = max(alpha, 0.01)  # BDRModel caps alpha at 0.01
+            # demand / (t - delta) * (t - delta) can round below the demand, step up to the next float
+            for _ in range(8):
+                test_bdr = BDRModel(alpha, delta)
+                BDRModel.counters.candidates += 1
                 if component.scheduler == "EDF":
-                    is_component_schedulable = test_bdr.is_schedulable_edf_workload(adjusted_tasks)
+                    is_component_schedulable = test_bdr.is_schedulable_edf_workload(adjusted_tasks, demand)
                 else:  # RM
-                    is_component_schedulable = test_bdr.is_schedulable_rm_workload(adjusted_tasks)
-
+                    is_component_schedulable = test_bdr.is_schedulable_rm_workload(adjusted_tasks, demand)
                 if is_component_schedulable:
-                    print(f"    DEBUG: Found schedulable BDR for {component.component_id}: (alpha={alpha_to_test:.4f}, delta={current_delta:.4f})")
-                    return (alpha_to_test, current_delta)
-
-                current_alpha += alpha_step
-
-            # If current_delta was 0 and we didn't find a solution (e.g. only alpha=1 was needed but tasks util < 1),
-            # and start_iter_delta was also 0 (because parent_delta > 0), we must ensure next delta is > 0.
-            if abs(current_delta) < 1e-9 and abs(start_iter_delta) < 1e-9: # If we just checked delta=0
-                current_delta = delta_step # Ensure next check is for positive delta
-            else:
-                current_delta += delta_step
-
-
-        print(f"    DEBUG: No suitable BDR found for component {component.component_id} within search range.")
+                    logger.debug("Found schedulable BDR for %s: (alpha=%.4f, delta=%.4f)",
+                                 component.component_id, alpha, delta)
+                    return (alpha, delta)
+                if alpha >= 1.0:
+                    break
+                alpha = min(math.nextafter(alpha, 2.0), 1.0)
+
+        logger.debug("No suitable BDR found for component %s.", component.component_id)
         return None
     
 
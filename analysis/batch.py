@@ -0,0 +1,224 @@
+import io
+import os
+import csv
+import glob
+import time
+import hashlib
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Dict, Optional, Iterable, Tuple
+from .analysis import HierarchicalSchedulabilityAnalyzer
+from .cache import InterfaceCache
+
+INPUT_FILES = ("architecture.csv", "tasks.csv", "budgets.csv")
+
+SUMMARY_FIELDS = ["folder", "input_hash", "status", "is_schedulable", "cores", "components",
+                  "schedulable_components", "tasks", "schedulable_tasks", "estimated_cost", "seconds", "error"]
+
+
+def find_case_folders(paths: Iterable[str]) -> List[str]:
+    """
+    Get the test case folders of the given paths. A path can be a test case folder, a glob
+    pattern or a directory, directories that are no test case are searched for test cases.
+
+    Args:
+        paths: Folders and glob patterns
+
+    Returns:
+        Sorted list of the folders that contain all input files
+    """
+    folders = set()
+    for path in paths:
+        matches = glob.glob(path, recursive=True) if any(char in path for char in "*?[") else [path]
+        for match in matches:
+            if not os.path.isdir(match):
+                continue
+            for root, _, files in os.walk(match):
+                if all(name in files for name in INPUT_FILES):
+                    folders.add(os.path.normpath(root))
+    return sorted(folders)
+
+
+def input_hash(folder: str) -> str:
+    """
+    Hash the input files of a test case. The hash includes the cache version, so results
+    stored before a change to the analysis do not match.
+
+    Args:
+        folder: Test case folder
+
+    Returns:
+        Hex digest of the input files
+    """
+    digests = {}
+    for name in INPUT_FILES:
+        with open(os.path.join(folder, name), 'rb') as inputfile:
+            digests[name] = hashlib.sha256(inputfile.read()).hexdigest()
+    return InterfaceCache.make_key({"inputs": digests})
+
+
+def estimate_case_cost(folder: str) -> int:
+    """
+    Estimate the cost of analyzing a test case by the number of time points its schedulability
+    tests check, which grows with the number of tasks and their hyperperiods.
+
+    Args:
+        folder: Test case folder
+
+    Returns:
+        Number of check points of all components, 0 if the test case cannot be loaded
+    """
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            analyzer = HierarchicalSchedulabilityAnalyzer(folder)
+    except Exception:
+        # the analysis reports the error
+        return 0
+    return len(analyzer.tasks) + sum(analyzer.estimate_component_cost(component)
+                                     for component in analyzer.components)
+
+
+def analyze_case(folder: str, folder_hash: str, estimated_cost: int) -> Dict:
+    """
+    Analyze a test case like analysis.py and write its solutions.csv, the printed output is dropped.
+
+    Args:
+        folder: Test case folder
+        folder_hash: Hash of its input files
+        estimated_cost: Estimated cost of the analysis
+
+    Returns:
+        Summary row of the test case
+    """
+    row = {field: "" for field in SUMMARY_FIELDS}
+    row.update({"folder": folder, "input_hash": folder_hash, "estimated_cost": estimated_cost})
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            analyzer = HierarchicalSchedulabilityAnalyzer(folder)
+            if not analyzer.cores:
+                # the loader reports unreadable rows and goes on, an empty system would pass
+                raise ValueError(f"No cores loaded from {analyzer.architecture_path}")
+            results = analyzer.run_analysis()
+    except Exception as e:
+        row.update({"status": "failed", "seconds": round(time.perf_counter() - start, 4), "error": str(e)})
+        return row
+    components = [component for core in results["cores"] for component in core["components"]]
+    tasks = [task for component in components for task in component["tasks_schedulable"]
+             if task["task_type"] != "server"]
+    row.update({
+        "status": "analyzed",
+        "is_schedulable": int(results["is_schedulable"]),
+        "cores": len(results["cores"]),
+        "components": len(components),
+        "schedulable_components": sum(component["is_schedulable"] for component in components),
+        "tasks": len(tasks),
+        "schedulable_tasks": sum(task["is_schedulable"] for task in tasks),
+        "seconds": round(time.perf_counter() - start, 4),
+    })
+    return row
+
+
+class BatchRunner:
+    """
+    Analyzes many test cases, each one like analysis.py with its own solutions.csv, and writes
+    one summary row per test case. The summary also stores the hash of the input files of
+    every test case, a test case whose inputs still match its row and whose solutions.csv
+    exists is not analyzed again. The remaining test cases are dispatched to a process pool
+    largest estimated cost first, so the longest analyses do not start last.
+    """
+
+    def __init__(self, folders: List[str], workers: int = 1, summary_path: Optional[str] = None,
+                 force: bool = False):
+        """
+        Initialize the runner.
+
+        Args:
+            folders: Test case folders, see find_case_folders
+            workers: Number of worker processes, every test case is analyzed by one of them
+            summary_path: Path of the summary CSV file (default: batch_summary.csv in the
+                common parent folder of the test cases)
+            force: Analyze every test case, also the unchanged ones
+        """
+        self.folders = [os.path.normpath(folder) for folder in folders]
+        self.workers = workers
+        self.force = force
+        if summary_path is None:
+            parent = os.path.commonpath(self.folders) if self.folders else "."
+            if parent in self.folders:
+                parent = os.path.dirname(parent) or "."
+            summary_path = os.path.join(parent, "batch_summary.csv")
+        self.summary_path = summary_path
+
+    def run(self) -> List[Dict]:
+        """
+        Analyze the changed test cases and write the summary, also if the run is interrupted.
+        Rows of test cases that are not part of this run stay in the summary.
+
+        Returns:
+            Summary rows of the test cases of this run, sorted by folder
+        """
+        stored = self.load_summary()
+        rows: Dict[str, Dict] = {}
+        pending = []
+        for folder in self.folders:
+            folder_hash = input_hash(folder)
+            row = stored.get(folder)
+            if (not self.force and row is not None and row["input_hash"] == folder_hash
+                    and row["status"] != "failed" and os.path.exists(os.path.join(folder, "solutions.csv"))):
+                rows[folder] = dict(row, status="unchanged")
+            else:
+                pending.append((folder, folder_hash, estimate_case_cost(folder)))
+        if rows:
+            print(f"Skipped {len(rows)} unchanged test cases")
+
+        pending.sort(key=lambda job: job[2], reverse=True)
+        try:
+            for index, row in enumerate(self._analyze(pending), start=1):
+                rows[row["folder"]] = row
+                verdict = row["error"] if row["status"] == "failed" else \
+                    ("schedulable" if row["is_schedulable"] else "not schedulable")
+                print(f"[{index}/{len(pending)}] {row['folder']}: {verdict} ({row['seconds']:.2f}s)")
+        finally:
+            stored.update(rows)
+            self.export_summary([stored[folder] for folder in sorted(stored)])
+        rows = [rows[folder] for folder in sorted(rows)]
+        schedulable = sum(str(row["is_schedulable"]) == "1" for row in rows)
+        failed = sum(row["status"] == "failed" for row in rows)
+        print(f"{schedulable} of {len(rows)} test cases schedulable, {failed} failed")
+        return rows
+
+    def load_summary(self) -> Dict[str, Dict]:
+        """Read the rows of an existing summary by folder, empty if there is none."""
+        if not os.path.exists(self.summary_path):
+            return {}
+        with open(self.summary_path, newline='') as csvfile:
+            return {os.path.normpath(row["folder"]): row for row in csv.DictReader(csvfile)}
+
+    def export_summary(self, rows: List[Dict]) -> None:
+        """
+        Write the summary rows to the summary CSV file.
+
+        Args:
+            rows: Summary rows, see analyze_case
+        """
+        with open(self.summary_path, 'w', newline='') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=SUMMARY_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"Batch summary exported to {self.summary_path}")
+
+    def _analyze(self, jobs: List[Tuple[str, str, int]]) -> Iterable[Dict]:
+        """Analyze the jobs in the given order and yield their rows as they finish."""
+        if self.workers <= 1 or len(jobs) <= 1:
+            for job in jobs:
+                yield analyze_case(*job)
+            return
+        executor = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            # the pool takes the submitted jobs in order, the most expensive ones start first
+            futures = [executor.submit(analyze_case, *job) for job in jobs]
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            executor.shutdown(cancel_futures=True)
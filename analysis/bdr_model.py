@@ -1,6 +1,85 @@
 import math
+import threading
+import numpy as np
+from collections import OrderedDict
 from typing import List, Dict, Tuple, Optional, Union, Any
 from .core import Core, Component, Task, Solution
+from .demand import DemandTable, task_set_fingerprint
+
+# EDF workloads with more check points in their test interval use the QPA test
+QPA_POINT_THRESHOLD = 10000
+
+class VerdictMemo:
+    """
+    Bounded LRU memo of schedulability verdicts, keyed by the test, the BDR
+    parameters and the fingerprint of the task set. It may be shared by threads.
+    """
+    
+    def __init__(self, maxsize: int = 4096):
+        """
+        Initialize an empty memo.
+        
+        Args:
+            maxsize: Maximum number of verdicts kept
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._verdicts: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Tuple) -> Optional[bool]:
+        """Get a verdict and mark it as recently used, None if it is not memoised."""
+        with self._lock:
+            verdict = self._verdicts.get(key)
+            if verdict is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._verdicts.move_to_end(key)
+            return verdict
+    
+    def put(self, key: Tuple, verdict: bool) -> None:
+        """Store a verdict and drop the least recently used ones above maxsize."""
+        with self._lock:
+            self._verdicts[key] = verdict
+            self._verdicts.move_to_end(key)
+            while len(self._verdicts) > self.maxsize:
+                self._verdicts.popitem(last=False)
+    
+    def info(self) -> Dict[str, int]:
+        """Hit and miss counters and the current size."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._verdicts), "maxsize": self.maxsize}
+    
+    def clear(self) -> None:
+        """Drop all verdicts and reset the counters."""
+        with self._lock:
+            self._verdicts.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+class SearchCounters(threading.local):
+    """
+    Work counters of the schedulability tests: interface candidates tested, supply bound
+    evaluations, demand points visited and verdict memo hits and misses. Every thread counts on its own, so the
+    difference of two snapshots belongs to the work of one thread in between.
+    """
+    
+    FIELDS = ("candidates", "sbf_evaluations", "demand_points", "memo_hits", "memo_misses")
+    
+    def __init__(self):
+        for field in self.FIELDS:
+            setattr(self, field, 0)
+    
+    def snapshot(self) -> Dict[str, int]:
+        """Current values of all counters."""
+        return {field: getattr(self, field) for field in self.FIELDS}
+    
+    def since(self, snapshot: Dict[str, int]) -> Dict[str, int]:
+        """Work counted since the given snapshot."""
+        return {field: getattr(self, field) - snapshot[field] for field in self.FIELDS}
+
 
 # Define the Bounded Delay Resource (BDR) model
 # This model is used for hierarchical scheduling analysis.
@@ -10,6 +89,11 @@ class BDRModel:
     Based on Section 3.3 of the "Hierarchical Scheduling" chapter.
     """
     
+    # verdicts of is_schedulable_edf_workload and is_schedulable_rm_task shared by all models
+    memo = VerdictMemo()
+    # work of the schedulability tests, counted per thread
+    counters = SearchCounters()
+    
     def __init__(self, alpha: float, delta: float):
         """
         Initialize a BDR model with availability factor alpha and partition delay delta.
@@ -91,22 +175,150 @@ class BDRModel:
         
         return budget, period
     
-    def supply_bound_function(self, t: float) -> float:
+    def supply_bound_function(self, t: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
         """
         Calculate the supply bound function (SBF) for this BDR model.
         Based on Equation 6 from Section 3.3.2.
         
         Args:
-            t: Time interval
+            t: Time interval, or an array of time intervals
             
         Returns:
             Minimum resource supply in the interval [0, t]
         """
+        if np.ndim(t) > 0:
+            return self.supply_bound_array(np.asarray(t, dtype=np.float64), self.alpha, self.delta)
+        BDRModel.counters.sbf_evaluations += 1
         if t >= self.delta:
             return self.alpha * (t - self.delta)
         else:
             return 0.0
     
+    @staticmethod
+    def supply_bound_array(points: np.ndarray, alphas: Union[float, np.ndarray],
+                           deltas: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Evaluate the supply bound function of many BDR candidates at many points in one broadcast.
+        
+        Args:
+            points: Time points, shape (P,)
+            alphas: Availability factors, a scalar or shape (N,)
+            deltas: Partition delays, a scalar or shape (N,)
+            
+        Returns:
+            The supply of each candidate at each point, shape (P,) or (N, P)
+        """
+        alphas = np.asarray(alphas, dtype=np.float64)[..., None]
+        deltas = np.asarray(deltas, dtype=np.float64)[..., None]
+        BDRModel.counters.sbf_evaluations += points.size * max(alphas.size, deltas.size)
+        return np.where(points >= deltas, alphas * (points - deltas), 0.0)
+    
+    @staticmethod
+    def edf_candidates_schedulable(demand: DemandTable, alphas: Union[float, np.ndarray],
+                                   deltas: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Check an EDF workload against many BDR candidates in one broadcast.
+        Each candidate is only checked up to its test interval bound min(L, hyperperiod).
+        The candidates are used as given, they are not capped like in the constructor.
+        
+        Args:
+            demand: Demand table of the workload
+            alphas: Availability factors, a scalar or shape (N,)
+            deltas: Partition delays, a scalar or shape (N,)
+            
+        Returns:
+            Boolean array with the schedulability of every candidate
+        """
+        alphas, deltas = np.broadcast_arrays(np.atleast_1d(np.asarray(alphas, dtype=np.float64)),
+                                             np.atleast_1d(np.asarray(deltas, dtype=np.float64)))
+        schedulable = demand.utilization <= alphas
+        if not schedulable.any():
+            return schedulable
+        bounds = demand.test_interval_bound(alphas, deltas)
+        horizon = float(np.max(bounds[schedulable]))
+        if demand.edf_point_count(horizon) > QPA_POINT_THRESHOLD:
+            # too many points to build, check every candidate with QPA instead
+            return np.array([BDRModel.edf_qpa_schedulable(demand, alpha, delta)
+                             for alpha, delta in zip(alphas, deltas)], dtype=bool)
+        points, dbf = demand.edf_demand(horizon)
+        BDRModel.counters.demand_points += len(points)
+        limits = np.where(bounds < demand.hyperperiod, bounds, np.inf)
+        if len(points) == 0:
+            return schedulable
+        # limit the size of the candidate x point supply matrix
+        chunk = max(1, (1 << 22) // len(points))
+        for start in range(0, len(alphas), chunk):
+            rows = slice(start, start + chunk)
+            if not schedulable[rows].any():
+                continue
+            supply = BDRModel.supply_bound_array(points, alphas[rows], deltas[rows])
+            # deadlines at or after L cannot be missed, the hyperperiod itself is checked
+            covered = (dbf <= supply) | (points >= limits[rows, None])
+            schedulable[rows] &= np.all(covered, axis=-1)
+        return schedulable
+    
+    @staticmethod
+    def edf_qpa_schedulable(demand: DemandTable, alpha: float, delta: float) -> bool:
+        """
+        Quick Processor-demand Analysis (Zhang and Burns) adapted to the BDR supply bound.
+        The demand must satisfy dbf(t) <= alpha * (t - delta) at every absolute deadline up
+        to the hyperperiod, i.e. h(t) = dbf(t) / alpha + delta <= t. Starting from the last
+        deadline before the test interval bound (see DemandTable.test_interval_bound),
+        h(t) < t shows that every deadline in [h(t), t] is met as h never decreases, so the
+        test jumps to the last deadline at or before h(t). It only steps to the previous
+        deadline when h(t) equals t and stops at the first deadline.
+        
+        Args:
+            demand: Demand table of the workload
+            alpha: Availability factor, used as given
+            delta: Partition delay
+            
+        Returns:
+            True if schedulable, False otherwise
+        """
+        if not demand.tasks:
+            return True
+        if demand.utilization > alpha:
+            return False  # Not schedulable due to utilization bound
+        first_deadline = float(np.min(demand.deadlines))
+        bound = demand.test_interval_bound(alpha, delta)
+        t = demand.last_deadline(bound, strict=bound < demand.hyperperiod)
+        while t is not None:
+            BDRModel.counters.demand_points += 1
+            dbf = demand.dbf_at(t)
+            if dbf > BDRModel.supply_bound_array(np.array([t]), alpha, delta)[0]:
+                return False  # Not schedulable at this time point
+            if t <= first_deadline:
+                break
+            h = dbf / alpha + delta if alpha > 0 else math.inf
+            t = demand.last_deadline(h) if h < t else demand.last_deadline(t, strict=True)
+        return True
+    
+    @staticmethod
+    def rm_candidates_schedulable(demand: DemandTable, task: Task, alphas: Union[float, np.ndarray],
+                                  deltas: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Check a RM task against many BDR candidates in one broadcast over its
+        scheduling points (see DemandTable.rm_scheduling_points).
+        The candidates are used as given, they are not capped like in the constructor.
+        
+        Args:
+            demand: Demand table of all tasks in the component
+            task: The task to check
+            alphas: Availability factors, a scalar or shape (N,)
+            deltas: Partition delays, a scalar or shape (N,)
+            
+        Returns:
+            Boolean array with the schedulability of the task under every candidate
+        """
+        alphas, deltas = np.broadcast_arrays(np.atleast_1d(np.asarray(alphas, dtype=np.float64)),
+                                             np.atleast_1d(np.asarray(deltas, dtype=np.float64)))
+        points, rbf = demand.rm_scheduling_points(task)
+        BDRModel.counters.demand_points += len(points)
+        supply = BDRModel.supply_bound_array(points, alphas, deltas)
+        # Schedulable if demand <= supply at one of the scheduling points
+        return np.any(rbf <= supply, axis=-1)
+    
     def is_schedulable_with_dbf(self, dbf_values: Dict[float, float]) -> bool:
         """
         Check if a workload is schedulable under this BDR model
@@ -125,126 +337,77 @@ class BDRModel:
         
         return True
     
-    def is_schedulable_edf_workload(self, tasks: List[Task]) -> bool:
+    def is_schedulable_edf_workload(self, tasks: List[Task], demand: Optional[DemandTable] = None) -> bool:
         """
         Check if a workload scheduled by EDF is schedulable under this BDR model.
         Based on Section 3.3.3.
         
         Args:
             tasks: List of Task objects
+            demand: Precomputed demand table of the tasks, built if not given
             
         Returns:
             True if schedulable, False otherwise
         """
         if not tasks:
             return True  # Empty task set is trivially schedulable
-        
-        # Check utilization first
-        total_utilization = sum(float(task.wcet) / float(task.period) for task in tasks)
-        if total_utilization > self.alpha:
-            return False  # Not schedulable due to utilization bound
-        
-        # Calculate hyperperiod
-        periods = [int(task.period) for task in tasks]
-        hyperperiod = math.lcm(*periods)
-        
-        # Check schedulability at all relevant time points
-        time_points = set()
-        for task in tasks:
-            period = int(task.period)
-            for i in range(1, hyperperiod // period + 1):
-                time_points.add(i * period)
-        
-        for t in sorted(time_points):
-            # Calculate EDF demand bound function (Equation 2)
-            demand = sum(float(task.wcet) * math.floor(t / float(task.period)) for task in tasks)
-            supply = self.supply_bound_function(t)
-            
-            if demand > supply:
-                return False  # Not schedulable at this time point
-        
-        return True  # Schedulable at all time points
+        key = ("EDF", self.alpha, self.delta, demand.fingerprint if demand else task_set_fingerprint(tasks))
+        verdict = self.memo.get(key)
+        if verdict is not None:
+            BDRModel.counters.memo_hits += 1
+            return verdict
+        BDRModel.counters.memo_misses += 1
+        if demand is None:
+            demand = DemandTable(tasks)
+        
+        # Utilization bound and demand <= supply at every time point
+        verdict = bool(self.edf_candidates_schedulable(demand, self.alpha, self.delta)[0])
+        self.memo.put(key, verdict)
+        return verdict
     
-    def is_schedulable_rm_task(self, task: Task, all_tasks: List[Task]) -> bool:
+    def is_schedulable_rm_task(self, task: Task, all_tasks: List[Task], demand: Optional[DemandTable] = None) -> bool:
         """
         Check if a specific task scheduled by RM is schedulable under this BDR model.
-        Based on Theorem 5 from Section 3.3.3.
+        Based on Theorem 5 from Section 3.3.3, exact over the scheduling points of the task.
         
         Args:
             task: The task to check
             all_tasks: All tasks in the component
+            demand: Precomputed demand table of all_tasks, built if not given
             
         Returns:
             True if the task is schedulable, False otherwise
         """
-        wcet = float(task.wcet)
-        period = float(task.period)
-        
-        # Get higher priority tasks
-        higher_priority_tasks = []
-        for other_task in all_tasks:
-            if other_task.task_name != task.task_name:
-                # In RM, lower number priority means higher priority
-                # If no priority is specified, use period (shorter period = higher priority)
-                if task.priority is not None and other_task.priority is not None:
-                    if other_task.priority < task.priority:
-                        higher_priority_tasks.append(other_task)
-                elif float(other_task.period) < float(task.period):
-                    higher_priority_tasks.append(other_task)
-        
-        # Define time points to check
-        time_points = set([int(period)])  # Always check at the period
-        
-        # Add key intermediate points, especially around delta
-        step = max(1, int(period) // 50)  # Check at least 50 points within period
-        for t in range(max(1, int(self.delta) - 10), int(period) + 1, step):
-            time_points.add(t)
-        
-        # Add task release points (multiples of higher priority task periods)
-        for hp_task in higher_priority_tasks:
-            hp_period = float(hp_task.period)
-            for i in range(1, int(period / hp_period) + 2):
-                time_points.add(int(i * hp_period))
-        
-        # Add points just after delta
-        if self.delta > 0:
-            time_points.add(int(self.delta) + 1)
-            time_points.add(int(self.delta) + 2)
-        
-        # Check all time points
-        for t in sorted(time_points):
-            if t > period:  # Don't check beyond period
-                break
-                
-            # Calculate RM demand bound function for this task (Equation 4)
-            demand = wcet  # The task's own demand
-            
-            # Add interference from higher priority tasks
-            for hp_task in higher_priority_tasks:
-                hp_wcet = float(hp_task.wcet)
-                hp_period = float(hp_task.period)
-                demand += math.ceil(t / hp_period) * hp_wcet
-            
-            # Check against supply
-            supply = self.supply_bound_function(t)
-            
-            if demand <= supply:
-                return True  # Found a time point where demand <= supply
-        
-        return False  # No time point found where demand <= supply
+        key = ("RM", task.task_name, self.alpha, self.delta,
+               demand.fingerprint if demand else task_set_fingerprint(all_tasks))
+        verdict = self.memo.get(key)
+        if verdict is not None:
+            BDRModel.counters.memo_hits += 1
+            return verdict
+        BDRModel.counters.memo_misses += 1
+        if demand is None:
+            demand = DemandTable(all_tasks)
+        
+        # Demand <= supply at one of the scheduling points
+        verdict = bool(self.rm_candidates_schedulable(demand, task, self.alpha, self.delta)[0])
+        self.memo.put(key, verdict)
+        return verdict
     
-    def is_schedulable_rm_workload(self, tasks: List[Task]) -> bool:
+    def is_schedulable_rm_workload(self, tasks: List[Task], demand: Optional[DemandTable] = None) -> bool:
         """
         Check if all tasks in a workload scheduled by RM are schedulable under this BDR model.
         
         Args:
             tasks: List of Task objects
+            demand: Precomputed demand table of the tasks, built if not given
             
         Returns:
             True if all tasks are schedulable, False otherwise
         """
         if not tasks:
             return True  # Empty task set is trivially schedulable
+        if demand is None:
+            demand = DemandTable(tasks)
         
         # Sort tasks by priority if available, otherwise by period (RM default)
         if all(task.priority is not None for task in tasks):
@@ -257,41 +420,260 @@ class BDRModel:
         # Check each task
         schedulable_tasks = []
         for task in sorted_tasks:
-            if self.is_schedulable_rm_task(task, tasks):
+            if self.is_schedulable_rm_task(task, tasks, demand):
                 schedulable_tasks.append(task.task_name)
         
         return len(schedulable_tasks) == len(tasks)
     
-    def get_schedulable_tasks_rm(self, tasks: List[Task]) -> Dict[str, bool]:
+    def get_schedulable_tasks_rm(self, tasks: List[Task], demand: Optional[DemandTable] = None) -> Dict[str, bool]:
         """
         Get the schedulability status of each task in a RM workload.
         
         Args:
             tasks: List of Task objects
+            demand: Precomputed demand table of the tasks, built if not given
             
         Returns:
             Dictionary mapping task names to schedulability status
         """
+        if demand is None:
+            demand = DemandTable(tasks)
         result = {}
         for task in tasks:
-            result[task.task_name] = self.is_schedulable_rm_task(task, tasks)
+            result[task.task_name] = self.is_schedulable_rm_task(task, tasks, demand)
         return result
     
-    def get_schedulable_tasks_edf(self, tasks: List[Task]) -> Dict[str, bool]:
+    def witness_points(self, tasks: List[Task], scheduler: str,
+                       demand: Optional[DemandTable] = None) -> Dict[str, Optional[float]]:
+        """
+        Get the time points that decide the schedulability of a workload under this model.
+        For EDF the check point with the least supply surplus in the test interval, under
+        the key "*". For RM the first scheduling point at which each task's demand is met.
+        
+        Args:
+            tasks: List of Task objects
+            scheduler: The scheduler of the workload (EDF or RM)
+            demand: Precomputed demand table of the tasks, built if not given
+            
+        Returns:
+            Dictionary mapping "*" or task names to the witness point, None if there is none
+        """
+        if not tasks:
+            return {}
+        if demand is None:
+            demand = DemandTable(tasks)
+        if scheduler == "EDF":
+            bound = demand.test_interval_bound(self.alpha, self.delta)
+            if demand.edf_point_count(bound) > QPA_POINT_THRESHOLD:
+                return {"*": None}  # Too many points to search
+            points, dbf = demand.edf_demand(bound)
+            if len(points) == 0:
+                return {"*": None}
+            surplus = self.supply_bound_function(points) - dbf
+            return {"*": float(points[int(np.argmin(surplus))])}
+        witnesses = {}
+        for task in tasks:
+            points, rbf = demand.rm_scheduling_points(task)
+            met = np.nonzero(rbf <= self.supply_bound_function(points))[0]
+            witnesses[task.task_name] = float(points[met[0]]) if len(met) else None
+        return witnesses
+    
+    def get_schedulable_tasks_edf(self, tasks: List[Task], demand: Optional[DemandTable] = None) -> Dict[str, bool]:
         """
         Get the schedulability status of each task in an EDF workload.
         In EDF, either all tasks are schedulable or none are.
         
         Args:
             tasks: List of Task objects
+            demand: Precomputed demand table of the tasks, built if not given
             
         Returns:
             Dictionary mapping task names to schedulability status
         """
-        is_schedulable = self.is_schedulable_edf_workload(tasks)
+        is_schedulable = self.is_schedulable_edf_workload(tasks, demand)
         return {task.task_name: is_schedulable for task in tasks}
 
+    @staticmethod
+    def minimal_alpha_edf(demand: DemandTable, delta: float) -> Optional[float]:
+        """
+        Smallest availability factor that makes an EDF workload schedulable for a fixed delta.
+        The supply alpha * (t - delta) must cover the demand at every time point checked by
+        is_schedulable_edf_workload, so alpha = max(U, max_t dbf(t) / (t - delta)).
+        Points at or after the test interval bound of a candidate alpha cannot raise it,
+        so the points are extended from a short horizon until they reach that bound.
+        
+        Args:
+            demand: Demand table of the workload
+            delta: Partition delay
+            
+        Returns:
+            The minimal alpha, or None if no alpha can cover a demand at or before delta
+        """
+        if not demand.tasks:
+            return demand.utilization
+        horizon = min(demand.hyperperiod, 2 * float(np.max(demand.periods)) + max(delta, 0.0))
+        while True:
+            if demand.edf_point_count(horizon) > QPA_POINT_THRESHOLD:
+                return BDRModel._minimal_alpha_edf_qpa(demand, delta)
+            points, dbf = demand.edf_demand(horizon)
+            BDRModel.counters.demand_points += len(points)
+            positive = dbf > 0
+            if np.any(points[positive] <= delta):
+                return None  # No supply before delta
+            alpha = demand.utilization
+            if positive.any():
+                alpha = max(alpha, float(np.max(dbf[positive] / (points[positive] - delta))))
+            bound = demand.test_interval_bound(alpha, delta)
+            if bound <= horizon:
+                return alpha
+            horizon = bound
+    
+    @staticmethod
+    def _minimal_alpha_edf_qpa(demand: DemandTable, delta: float, tolerance: float = 1e-6) -> Optional[float]:
+        """
+        Bisection on alpha with the QPA test for workloads with too many check points.
+        The test interval grows like 1 / (alpha - U), so the bisection stops at the given
+        tolerance and returns the schedulable upper end.
+        """
+        if demand.dbf_at(delta) > 0:
+            return None  # No supply before delta
+        low, high = demand.utilization, max(demand.utilization, 1.0)
+        if BDRModel.edf_qpa_schedulable(demand, low, delta):
+            return low
+        while not BDRModel.edf_qpa_schedulable(demand, high, delta):
+            low, high = high, 2 * high
+        while high - low > tolerance:
+            middle = (low + high) / 2
+            if BDRModel.edf_qpa_schedulable(demand, middle, delta):
+                high = middle
+            else:
+                low = middle
+        return high
+    
+    @staticmethod
+    def minimal_alpha_rm(demand: DemandTable, delta: float) -> Optional[float]:
+        """
+        Smallest availability factor that makes a RM workload schedulable for a fixed delta.
+        A task is schedulable if its demand is covered at one of its scheduling points, so
+        its minimal alpha is the minimum of rbf(t) / (t - delta) over these points and the
+        workload needs the maximum over all tasks.
+        
+        Args:
+            demand: Demand table of the workload
+            delta: Partition delay
+            
+        Returns:
+            The minimal alpha, or None if a task has no scheduling point after delta
+        """
+        alpha = 0.0
+        for task in demand.tasks:
+            points, rbf = demand.rm_scheduling_points(task)
+            BDRModel.counters.demand_points += len(points)
+            after_delay = points > delta
+            if not after_delay.any():
+                return None
+            alpha = max(alpha, float(np.min(rbf[after_delay] / (points[after_delay] - delta))))
+        return alpha
 
+    def response_time_rm(self, task: Task, demand: DemandTable, start: float = 0.0) -> float:
+        """
+        Worst-case response time of a RM task under this model, the least fixed point of
+        t = rbf(t) / alpha + delta. The right side is the inverse of the supply bound function
+        applied to the request bound function, both never decrease, so the iteration climbs
+        to the fixed point from any start at or below it.
+        
+        Args:
+            task: The task to analyze
+            demand: Demand table of all tasks in the component
+            start: Lower bound of the response time, e.g. the one of a higher priority task
+            
+        Returns:
+            The response time, inf if it exceeds the deadline of the task
+        """
+        wcet = float(task.wcet)
+        # a few scalar steps, plain floats are faster than numpy here
+        interference = [(float(hp_task.wcet), float(hp_task.period)) for hp_task in demand.higher_priority_tasks(task)]
+        t = max(start, wcet / self.alpha + self.delta)
+        # the scheduling point test compares at the deadline itself, allow for rounding
+        limit = float(task.deadline) * (1 + 1e-9)
+        while t <= limit:
+            BDRModel.counters.demand_points += 1
+            # a release that t only passes by rounding is not part of the interval yet
+            rbf = wcet + sum(math.ceil(t / period - 1e-9) * hp_wcet for hp_wcet, period in interference)
+            next_t = rbf / self.alpha + self.delta
+            if next_t <= t:
+                return t
+            t = next_t
+        return math.inf
+    
+    def response_times_rm(self, demand: DemandTable) -> Dict[str, float]:
+        """
+        Worst-case response times of all tasks of a RM workload under this model.
+        Tasks are handled in priority order. The demand of the lowest of the higher priority
+        tasks of a task, its WCET and its own interference, is part of the task's interference,
+        so its response time is a valid start of the iteration. Without a total priority order every iteration starts cold.
+        
+        Args:
+            demand: Demand table of the workload
+            
+        Returns:
+            Dictionary mapping task names to response times, see response_time_rm
+        """
+        order = demand.priority_order()
+        response_times = {}
+        for task in order if order is not None else demand.tasks:
+            start = 0.0
+            if order is not None:
+                higher = demand.higher_priority_tasks(task)
+                if higher and math.isfinite(response_times[higher[-1].task_name]):
+                    start = response_times[higher[-1].task_name]
+            response_times[task.task_name] = self.response_time_rm(task, demand, start)
+        return response_times
+    
+    def busy_period_edf(self, demand: DemandTable) -> float:
+        """
+        Length of the longest busy period of a workload under this model, the least fixed point
+        of t = W(t) / alpha + delta with W(t) = sum_j ceil(t / T_j) * C_j. Every job completes
+        within it, whatever the scheduler.
+        
+        Args:
+            demand: Demand table of the workload
+            
+        Returns:
+            The busy period, inf if the utilization reaches alpha
+        """
+        if not demand.tasks:
+            return 0.0
+        if demand.utilization >= self.alpha:
+            return math.inf
+        load = [(float(task.wcet), float(task.period)) for task in demand.tasks]
+        t = sum(wcet for wcet, _ in load) / self.alpha + self.delta
+        while True:
+            BDRModel.counters.demand_points += 1
+            next_t = sum(math.ceil(t / period - 1e-9) * wcet for wcet, period in load) / self.alpha + self.delta
+            if next_t <= t:
+                return t
+            t = next_t
+    
+    def response_times_edf(self, demand: DemandTable, schedulable: bool) -> Dict[str, float]:
+        """
+        Bounds of the worst-case response times of the tasks of an EDF workload under this model.
+        An exact EDF bound needs a separate analysis per deadline, the busy period bounds every
+        response time and, if the workload is schedulable, so does the deadline of the task.
+        Like the schedulability tests (see DemandTable) this assumes implicit deadlines, as the
+        periodic tasks and the polling server have them.
+        
+        Args:
+            demand: Demand table of the workload
+            schedulable: Verdict of is_schedulable_edf_workload for the workload
+            
+        Returns:
+            Dictionary mapping task names to response time bounds
+        """
+        busy_period = self.busy_period_edf(demand)
+        return {task.task_name: min(busy_period, float(task.deadline)) if schedulable else busy_period
+                for task in demand.tasks}
+    
     @staticmethod
     def check_theorem1_schedulability(parent_bdr: 'BDRModel', children_bdr: List['BDRModel']) -> bool:
         # Check sum of availability factors
@@ -0,0 +1,106 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+from typing import Dict, Optional, Any
+
+# Part of every key, bump it whenever a change to the analysis changes its results
+CACHE_VERSION = 3
+
+
+class InterfaceCache:
+    """
+    Persistent content-addressed cache of component analysis results.
+    The results are stored as JSON in a sqlite database under the cache directory,
+    keyed by a hash of everything the analysis of a component depends on. The least
+    recently used entries are evicted once the cache holds more than max_entries.
+    """
+
+    def __init__(self, cache_dir: str, max_entries: int = 10000):
+        """
+        Initialize the cache, the database is created on first use.
+
+        Args:
+            cache_dir: Directory of the sqlite database
+            max_entries: Maximum number of cached components
+        """
+        self.cache_dir = cache_dir
+        self.path = os.path.join(cache_dir, "interfaces.sqlite")
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # connections cannot be pickled, worker processes open their own
+        state = self.__dict__.copy()
+        state["_connection"] = None
+        return state
+
+    @staticmethod
+    def make_key(content: Dict[str, Any]) -> str:
+        """
+        Hash the canonical JSON form of the inputs of a component analysis.
+
+        Args:
+            content: Everything the analysis result depends on
+
+        Returns:
+            Hex digest used as the cache key
+        """
+        canonical = json.dumps({"version": CACHE_VERSION, "content": content},
+                               sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Look up a cached component result and mark it as recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The cached result, or None if the key is not cached
+        """
+        connection = self._connect()
+        row = connection.execute("SELECT value FROM interfaces WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        with connection:
+            connection.execute("UPDATE interfaces SET last_used = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0])
+
+    def put(self, key: str, value: Dict) -> None:
+        """
+        Store a component result and evict the least recently used entries above the size bound.
+
+        Args:
+            key: Cache key
+            value: Component result, must be JSON serialisable
+        """
+        connection = self._connect()
+        with connection:
+            connection.execute("INSERT OR REPLACE INTO interfaces (key, value, last_used) VALUES (?, ?, ?)",
+                               (key, json.dumps(value), time.time()))
+            connection.execute("DELETE FROM interfaces WHERE key IN (SELECT key FROM interfaces "
+                               "ORDER BY last_used DESC LIMIT -1 OFFSET ?)", (self.max_entries,))
+
+    def close(self) -> None:
+        """Close the database connection."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # worker processes may write at the same time, wait for their locks. Threads
+            # of the analysis service take turns on a cache, so the connection can move between them
+            self._connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            with self._connection:
+                self._connection.execute("CREATE TABLE IF NOT EXISTS interfaces "
+                                         "(key TEXT PRIMARY KEY, value TEXT NOT NULL, last_used REAL NOT NULL)")
+        return self._connection
@@ -0,0 +1,367 @@
+import bisect
+import math
+import numpy as np
+from typing import List, Dict, Tuple, Optional, Union
+from .core import Task
+
+# number of time points evaluated at once
+_BLOCK = 1 << 16
+
+
+def higher_priority_tasks(task: Task, all_tasks: List[Task]) -> List[Task]:
+    """
+    Get the tasks that have a higher RM priority than the given task.
+
+    Args:
+        task: The task to check
+        all_tasks: All tasks in the component
+
+    Returns:
+        List of higher priority tasks
+    """
+    result = []
+    for other_task in all_tasks:
+        if other_task.task_name != task.task_name:
+            # In RM, lower number priority means higher priority
+            # If no priority is specified, use period (shorter period = higher priority)
+            if task.priority is not None and other_task.priority is not None:
+                if other_task.priority < task.priority:
+                    result.append(other_task)
+            elif float(other_task.period) < float(task.period):
+                result.append(other_task)
+    return result
+
+
+def edf_check_points(periods: np.ndarray, deadlines: np.ndarray, horizon: int, start: int = 0) -> np.ndarray:
+    """
+    Get every absolute deadline k * T_i + D_i after the start up to the horizon.
+
+    Args:
+        periods: Task periods
+        deadlines: Relative task deadlines
+        horizon: Last time point to include
+        start: Time point after which the deadlines are included
+
+    Returns:
+        Sorted array of unique time points
+    """
+    firsts = [(p, d if d > start else d + ((start - d) // p + 1) * p)
+              for p, d in zip(periods.astype(np.int64), deadlines.astype(np.int64))]
+    points = [np.arange(first, horizon + 1, p, dtype=np.float64) for p, first in firsts if first <= horizon]
+    if not points:
+        return np.empty(0, dtype=np.float64)
+    return np.unique(np.concatenate(points))
+
+
+def demand_bound_function(points: np.ndarray, wcets: np.ndarray, periods: np.ndarray,
+                          deadlines: np.ndarray) -> np.ndarray:
+    """
+    Evaluate the EDF demand bound function (Equation 2) at all points at once,
+    dbf(t) = sum_i max(0, floor((t - D_i) / T_i) + 1) * C_i.
+
+    Args:
+        points: Time points
+        wcets: Task WCETs
+        periods: Task periods
+        deadlines: Relative task deadlines
+
+    Returns:
+        Array of the demand at each point
+    """
+    demand = np.empty(len(points), dtype=np.float64)
+    # evaluate in blocks so the job count matrix stays small for long hyperperiods
+    for start in range(0, len(points), _BLOCK):
+        block = points[start:start + _BLOCK]
+        jobs = np.maximum(np.floor((block[:, None] - deadlines) / periods) + 1, 0)
+        demand[start:start + _BLOCK] = jobs @ wcets
+    return demand
+
+
+def request_bound_function(points: np.ndarray, wcet: float, hp_wcets: np.ndarray,
+                           hp_periods: np.ndarray) -> np.ndarray:
+    """
+    Evaluate the RM request bound function (Equation 4) of a task at all points at once,
+    rbf(t) = C_i + sum_j ceil(t / T_j) * C_j over the higher priority tasks j.
+
+    Args:
+        points: Time points
+        wcet: WCET of the task
+        hp_wcets: WCETs of the higher priority tasks
+        hp_periods: Periods of the higher priority tasks
+
+    Returns:
+        Array of the demand at each point
+    """
+    return wcet + np.ceil(points[:, None] / hp_periods) @ hp_wcets
+
+
+def task_set_fingerprint(tasks: List[Task]) -> Tuple:
+    """
+    Get a hashable fingerprint of everything the schedulability tests read from a task set.
+
+    Args:
+        tasks: List of Task objects
+
+    Returns:
+        Tuple of the task parameters, independent of the task order
+    """
+    return tuple(sorted((task.task_name, float(task.wcet), float(task.period), task.priority,
+                         float(task.deadline) if task.deadline is not None else None) for task in tasks))
+
+
+class DemandTable:
+    """
+    Demand of a task set at the time points checked by the BDR schedulability tests.
+    The demand does not depend on the supplying BDR model, so one table is built per
+    component and read by every candidate interface. The EDF points, the RM priority
+    order and the RM scheduling points are computed the first time they are needed.
+    """
+
+    def __init__(self, tasks: List[Task]):
+        """
+        Initialize the demand table of a task set.
+
+        Args:
+            tasks: List of speed adjusted Task objects
+        """
+        self.tasks = list(tasks)
+        self.wcets = np.array([float(task.wcet) for task in self.tasks], dtype=np.float64)
+        self.periods = np.array([float(task.period) for task in self.tasks], dtype=np.float64)
+        # the tests assume implicit deadlines (D_i = T_i)
+        self.deadlines = self.periods
+        self.utilization = sum(float(task.wcet) / float(task.period) for task in self.tasks)
+        self.hyperperiod = math.lcm(*[int(task.period) for task in self.tasks]) if self.tasks else 0
+        # sum_i U_i * (T_i - D_i), the demand that can exceed U * t
+        self.slack = float(np.sum(self.wcets / self.periods * (self.periods - self.deadlines)))
+        self._edf_horizon = 0
+        self._edf_points: np.ndarray = None
+        self._edf_demand: np.ndarray = None
+        self._higher_priority: Dict[str, Tuple[List[Task], np.ndarray, np.ndarray]] = {}
+        self._priority_order: Optional[Tuple[List[float], List[Task]]] = None
+        self._by_priority = False
+        self._rm_points: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._fingerprint: Optional[Tuple] = None
+
+    @property
+    def fingerprint(self) -> Tuple:
+        """Fingerprint of the task set, see task_set_fingerprint."""
+        if self._fingerprint is None:
+            self._fingerprint = task_set_fingerprint(self.tasks)
+        return self._fingerprint
+
+    def with_task(self, task: Task) -> "DemandTable":
+        """
+        Get the demand table of this task set plus one task, reusing the demand computed so far.
+        The EDF points built by this table only get the deadlines and the demand of the new
+        task added, and tasks whose higher priority tasks do not include the new one keep
+        their RM scheduling points.
+
+        Args:
+            task: Speed adjusted task to add
+
+        Returns:
+            New demand table, this one is not changed
+        """
+        table = DemandTable(self.tasks + [task])
+        wcets, periods = table.wcets[-1:], table.periods[-1:]
+        if self._edf_points is not None:
+            horizon = min(self._edf_horizon, table.hyperperiod)
+            count = int(np.searchsorted(self._edf_points, horizon, side="right"))
+            points, demand = self._edf_points[:count], self._edf_demand[:count]
+            added = np.setdiff1d(edf_check_points(periods, periods, int(horizon)), points)
+            points = np.concatenate([points, added])
+            demand = np.concatenate([demand, demand_bound_function(added, self.wcets, self.periods, self.deadlines)])
+            order = np.argsort(points, kind="stable")
+            table._edf_horizon = horizon
+            table._edf_points = points[order]
+            table._edf_demand = (demand + demand_bound_function(points, wcets, periods, periods))[order]
+        tasks_by_name = {existing.task_name: existing for existing in self.tasks}
+        for name, entry in self._rm_points.items():
+            if all(other is not task for other in table.higher_priority_tasks(tasks_by_name[name])):
+                table._rm_points[name] = entry
+        return table
+
+    def edf_demand(self, horizon: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the EDF demand bound function at every absolute deadline up to the horizon.
+
+        Args:
+            horizon: Last time point to include, the hyperperiod if not given or larger
+
+        Returns:
+            Tuple of the sorted time points and the demand at each of them
+        """
+        horizon = self.hyperperiod if horizon is None else min(horizon, self.hyperperiod)
+        if self._edf_points is None:
+            self._edf_horizon = horizon
+            self._edf_points = edf_check_points(self.periods, self.deadlines, int(horizon))
+            self._edf_demand = demand_bound_function(self._edf_points, self.wcets, self.periods, self.deadlines)
+        elif horizon > self._edf_horizon:
+            # only the deadlines after the old horizon are added, the points are integers
+            added = edf_check_points(self.periods, self.deadlines, int(horizon), int(self._edf_horizon))
+            self._edf_horizon = horizon
+            self._edf_points = np.concatenate([self._edf_points, added])
+            self._edf_demand = np.concatenate([self._edf_demand, demand_bound_function(
+                added, self.wcets, self.periods, self.deadlines)])
+        count = int(np.searchsorted(self._edf_points, horizon, side="right"))
+        return self._edf_points[:count], self._edf_demand[:count]
+
+    def edf_point_count(self, horizon: Optional[float] = None) -> int:
+        """
+        Number of absolute deadlines up to the horizon, counted without building them.
+
+        Args:
+            horizon: Last time point to include, the hyperperiod if not given or larger
+        """
+        horizon = self.hyperperiod if horizon is None else min(horizon, self.hyperperiod)
+        jobs = np.floor((horizon - self.deadlines) / self.periods) + 1
+        return int(np.sum(jobs[jobs > 0]))
+
+    def test_interval_bound(self, alphas: Union[float, np.ndarray],
+                            deltas: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        """
+        Get the end of the EDF test interval under a linear supply alpha * (t - delta).
+        As dbf(t) <= U * t + sum_i U_i * (T_i - D_i), no deadline at or after
+        L = (alpha * delta + sum_i U_i * (T_i - D_i)) / (alpha - U) can be missed when
+        alpha > U. Otherwise, and whenever L is larger, the hyperperiod is returned.
+
+        Args:
+            alphas: Availability factors, a scalar or an array
+            deltas: Partition delays, a scalar or an array
+
+        Returns:
+            min(L, hyperperiod) for every candidate
+        """
+        alphas = np.asarray(alphas, dtype=np.float64)
+        deltas = np.asarray(deltas, dtype=np.float64)
+        excess = alphas - self.utilization
+        with np.errstate(divide="ignore", invalid="ignore"):
+            bound = np.where(excess > 0, (alphas * deltas + self.slack) / excess, np.inf)
+        bound = np.minimum(bound, float(self.hyperperiod))
+        return float(bound) if bound.ndim == 0 else bound
+
+    def delay_bound(self, scheduler: str) -> float:
+        """
+        Get the partition delay from which on the workload cannot be schedulable,
+        every checked time point at or before delta receives no supply.
+
+        Args:
+            scheduler: The scheduler of the component (EDF or RM)
+
+        Returns:
+            The first EDF deadline, or the shortest period for RM
+        """
+        if not self.tasks:
+            return math.inf
+        if scheduler == "EDF":
+            return float(np.min(self.deadlines))
+        # the last RM time point of a task is its period
+        return float(min(int(task.period) for task in self.tasks))
+
+    def dbf_at(self, t: float) -> float:
+        """Get the EDF demand bound function at a single time point."""
+        return float(demand_bound_function(np.array([t], dtype=np.float64),
+                                           self.wcets, self.periods, self.deadlines)[0])
+
+    def last_deadline(self, t: float, strict: bool = False) -> Optional[float]:
+        """
+        Get the latest absolute deadline at or before t.
+
+        Args:
+            t: Time point
+            strict: Only consider deadlines strictly before t
+
+        Returns:
+            The deadline, or None if no deadline lies at or before t
+        """
+        if strict:
+            jobs = np.ceil((t - self.deadlines) / self.periods) - 1
+        else:
+            jobs = np.floor((t - self.deadlines) / self.periods)
+        valid = jobs >= 0
+        if not valid.any():
+            return None
+        return float(np.max(jobs[valid] * self.periods[valid] + self.deadlines[valid]))
+
+    def higher_priority_tasks(self, task: Task) -> List[Task]:
+        """Get the higher priority tasks of a task in this task set."""
+        return self._higher_priority_entry(task)[0]
+
+    def priority_order(self) -> Optional[List[Task]]:
+        """Get the tasks sorted by RM priority, None if mixed priorities leave them without a total order."""
+        if self._priority_order is None:
+            self._priority_order = self._sorted_by_priority()
+        return self._priority_order[1] if self._priority_order else None
+
+    def rm_demand(self, task: Task, points: np.ndarray) -> np.ndarray:
+        """
+        Get the RM demand of a task at the given points.
+
+        Args:
+            task: The task to check
+            points: Time points
+
+        Returns:
+            The task's own demand plus the interference of the higher priority tasks
+        """
+        _, hp_wcets, hp_periods = self._higher_priority_entry(task)
+        return request_bound_function(points, float(task.wcet), hp_wcets, hp_periods)
+
+    def rm_scheduling_points(self, task: Task) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the scheduling points of a RM task and its demand at each of them.
+        The request bound function only increases right after a release of a higher
+        priority task, while the supply never decreases. If the demand is covered at
+        some t <= T_i it is therefore also covered at the next release k * T_j or at
+        T_i, so these points make the test exact.
+
+        Args:
+            task: The task to check
+
+        Returns:
+            Tuple of the sorted scheduling points and the demand at each of them
+        """
+        if task.task_name not in self._rm_points:
+            period = float(task.period)
+            _, hp_wcets, hp_periods = self._higher_priority_entry(task)
+            points = [np.array([period])]
+            points += [np.arange(1, int(period // hp_period) + 1) * hp_period for hp_period in hp_periods]
+            points = np.unique(np.concatenate(points))
+            self._rm_points[task.task_name] = (points, self.rm_demand(task, points))
+        return self._rm_points[task.task_name]
+
+    def _higher_priority_entry(self, task: Task) -> Tuple[List[Task], np.ndarray, np.ndarray]:
+        if task.task_name not in self._higher_priority:
+            if self._priority_order is None:
+                self._priority_order = self._sorted_by_priority()
+            if self._priority_order:
+                # the higher priority tasks are the prefix of the sorted list with a smaller key
+                keys, order = self._priority_order
+                count = bisect.bisect_left(keys, self._priority_key(task))
+                hp_tasks = order[:count]
+            else:
+                hp_tasks = higher_priority_tasks(task, self.tasks)
+            self._higher_priority[task.task_name] = (
+                hp_tasks,
+                np.array([float(t.wcet) for t in hp_tasks], dtype=np.float64),
+                np.array([float(t.period) for t in hp_tasks], dtype=np.float64))
+        return self._higher_priority[task.task_name]
+
+    def _priority_key(self, task: Task) -> float:
+        return float(task.priority) if self._by_priority else float(task.period)
+
+    def _sorted_by_priority(self) -> Optional[Tuple[List[float], List[Task]]]:
+        """
+        Sort the tasks once by RM priority, by explicit priority if every task has one and
+        by period if none has. With mixed priorities the relation of higher_priority_tasks
+        is not a total order, an empty result makes every task use it directly.
+        """
+        with_priority = [task.priority is not None for task in self.tasks]
+        if all(with_priority):
+            self._by_priority = True
+        elif not any(with_priority):
+            self._by_priority = False
+        else:
+            return ()
+        order = sorted(self.tasks, key=self._priority_key)
+        return [self._priority_key(task) for task in order], order
@@ -0,0 +1,212 @@
+import json
+import math
+import numpy as np
+from typing import List, Dict, Optional, Any
+from .bdr_model import BDRModel
+from .demand import DemandTable
+
+
+class InterfaceFrontier:
+    """
+    Trade-off between the minimal availability factor and the partition delay of a component.
+
+    The minimal alpha never decreases with delta. For EDF it is the maximum of the convex
+    functions dbf(t) / (t - delta) and therefore convex, so the linear interpolation between
+    two samples never lies below it. For RM it is a maximum of minima and not convex, between
+    two samples the alpha of the next sample is used. In both cases an interface read from
+    the frontier is schedulable.
+    """
+
+    def __init__(self, component_id: str, scheduler: str, deltas: List[float], alphas: List[float]):
+        """
+        Initialize a frontier from its samples.
+
+        Args:
+            component_id: Component the frontier belongs to
+            scheduler: The scheduler of the component (EDF or RM)
+            deltas: Increasing partition delays
+            alphas: Minimal alpha at each delay
+        """
+        self.component_id = component_id
+        self.scheduler = scheduler
+        self.deltas = np.asarray(deltas, dtype=np.float64)
+        self.alphas = np.asarray(alphas, dtype=np.float64)
+        self.linear = scheduler == "EDF"
+
+    @classmethod
+    def from_demand(cls, component_id: str, scheduler: str, demand: DemandTable,
+                    min_delta: float, samples: int = 32) -> Optional['InterfaceFrontier']:
+        """
+        Sample the frontier between the smallest allowed delay and the first check point.
+
+        Args:
+            component_id: Component the frontier belongs to
+            scheduler: The scheduler of the component (EDF or RM)
+            demand: Demand table of the component's effective load
+            min_delta: Smallest partition delay of the frontier
+            samples: Number of sampled delays
+
+        Returns:
+            The frontier, or None if the component is not schedulable at min_delta
+        """
+        bound = demand.delay_bound(scheduler)
+        if not np.isfinite(bound) or min_delta >= bound:
+            return None
+        deltas, alphas = [], []
+        for delta in min_delta + (bound - min_delta) * np.arange(samples) / samples:
+            alpha = _schedulable_alpha(demand, scheduler, float(delta))
+            if alpha is None:
+                break
+            deltas.append(float(delta))
+            alphas.append(alpha)
+        if not deltas:
+            return None
+        return cls(component_id, scheduler, deltas, alphas)
+
+    def alpha_at(self, delta: float) -> Optional[float]:
+        """
+        Get a schedulable alpha for the given delay.
+
+        Args:
+            delta: Partition delay
+
+        Returns:
+            The alpha, or None if delta lies outside the sampled range
+        """
+        if delta < self.deltas[0] or delta > self.deltas[-1]:
+            return None
+        if self.linear:
+            return float(np.interp(delta, self.deltas, self.alphas))
+        return float(self.alphas[np.searchsorted(self.deltas, delta, side="left")])
+
+    def max_delta(self, alpha: float) -> Optional[float]:
+        """
+        Get the largest delay that the given alpha can serve.
+
+        Args:
+            alpha: Availability factor
+
+        Returns:
+            The delay, or None if alpha is below the frontier
+        """
+        within = np.nonzero(self.alphas <= alpha)[0]
+        if len(within) == 0:
+            return None
+        k = int(within[-1])
+        if not self.linear or k + 1 == len(self.deltas) or self.alphas[k + 1] <= self.alphas[k]:
+            return float(self.deltas[k])
+        # move along the chord to the next sample until it reaches alpha
+        ratio = (alpha - self.alphas[k]) / (self.alphas[k + 1] - self.alphas[k])
+        return float(self.deltas[k] + ratio * (self.deltas[k + 1] - self.deltas[k]))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"component_id": self.component_id, "scheduler": self.scheduler,
+                "deltas": self.deltas.tolist(), "alphas": self.alphas.tolist()}
+
+    @classmethod
+    def from_dict(cls, values: Dict[str, Any]) -> 'InterfaceFrontier':
+        return cls(values["component_id"], values["scheduler"], values["deltas"], values["alphas"])
+
+
+def _schedulable_alpha(demand: DemandTable, scheduler: str, delta: float) -> Optional[float]:
+    """
+    Get the minimal alpha for a delay, verified against the schedulability test.
+
+    Args:
+        demand: Demand table of the component's effective load
+        scheduler: The scheduler of the component (EDF or RM)
+        delta: Partition delay
+
+    Returns:
+        The alpha, or None if no alpha up to 1 is schedulable
+    """
+    if scheduler == "EDF":
+        alpha = BDRModel.minimal_alpha_edf(demand, delta)
+    else:
+        alpha = BDRModel.minimal_alpha_rm(demand, delta)
+    if alpha is None or alpha > 1.0:
+        return None
+    alpha = max(alpha, 0.01)  # BDRModel caps alpha at 0.01
+    # demand / (t - delta) * (t - delta) can round below the demand, step up to the next float
+    for _ in range(8):
+        bdr = BDRModel(alpha, delta)
+        if scheduler == "EDF":
+            schedulable = bdr.is_schedulable_edf_workload(demand.tasks, demand)
+        else:
+            schedulable = bdr.is_schedulable_rm_workload(demand.tasks, demand)
+        if schedulable:
+            return alpha
+        if alpha >= 1.0:
+            break
+        alpha = min(math.nextafter(alpha, 2.0), 1.0)
+    return None
+
+
+def compose_frontiers(frontiers: List[InterfaceFrontier], parent_alpha: float = 1.0,
+                      parent_delta: float = 0.0, rounds: int = 8) -> Optional[Dict[str, Dict[str, float]]]:
+    """
+    Pick one interface from every frontier such that Theorem 1 holds for the parent.
+    Every component starts at its smallest delay above the parent's delay, the alpha that
+    is left below the parent's alpha is then shared evenly to move the components to
+    larger delays, which gives longer periods with the half-half algorithm.
+
+    Args:
+        frontiers: Frontiers of the components of the parent
+        parent_alpha: Availability factor of the parent
+        parent_delta: Partition delay of the parent
+        rounds: Number of rounds used to hand out the remaining alpha
+
+    Returns:
+        Dictionary mapping component ids to their alpha and delta, None if no choice satisfies Theorem 1
+    """
+    chosen = {}
+    for frontier in frontiers:
+        allowed = np.nonzero(frontier.deltas > parent_delta)[0]
+        if len(allowed) == 0:
+            return None
+        k = int(allowed[0])
+        chosen[frontier.component_id] = [float(frontier.alphas[k]), float(frontier.deltas[k])]
+    if sum(alpha for alpha, _ in chosen.values()) > parent_alpha:
+        return None
+
+    for _ in range(rounds):
+        slack = parent_alpha - sum(alpha for alpha, _ in chosen.values())
+        growing = [f for f in frontiers if chosen[f.component_id][1] < f.deltas[-1]]
+        if slack <= 1e-12 or not growing:
+            break
+        share = slack / len(growing)
+        for frontier in growing:
+            alpha, delta = chosen[frontier.component_id]
+            new_delta = frontier.max_delta(alpha + share)
+            if new_delta is not None and new_delta > delta:
+                new_alpha = frontier.alpha_at(new_delta)
+                # the chord value may round a little above the share it was computed from
+                chosen[frontier.component_id] = [max(alpha, min(new_alpha, alpha + share)), new_delta]
+
+    return {component_id: {"alpha": alpha, "delta": delta} for component_id, (alpha, delta) in chosen.items()}
+
+
+def export_frontiers(frontiers: List[InterfaceFrontier], output_path: str) -> None:
+    """
+    Write frontiers to a JSON file.
+
+    Args:
+        frontiers: Frontiers to export
+        output_path: Path of the JSON file
+    """
+    with open(output_path, "w") as json_file:
+        json.dump([frontier.to_dict() for frontier in frontiers], json_file, indent=2)
+
+
+def load_frontiers(input_path: str) -> List[InterfaceFrontier]:
+    """
+    Read frontiers written by export_frontiers.
+
+    Args:
+        input_path: Path of the JSON file
+
+    Returns:
+        List of frontiers
+    """
+    with open(input_path) as json_file:
+        return [InterfaceFrontier.from_dict(values) for values in json.load(json_file)]
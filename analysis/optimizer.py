@@ -0,0 +1,253 @@
+import os
+import csv
+import math
+import shutil
+from typing import List, Dict, Optional, Tuple
+from .analysis import HierarchicalSchedulabilityAnalyzer
+from .bdr_model import BDRModel
+from .cache import InterfaceCache
+from .core import Core, Component
+from .demand import DemandTable
+from .frontier import InterfaceFrontier
+from .workers import run_cached_jobs
+
+# budgets are written with this resolution, the simulation rounds times to two decimals
+BUDGET_RESOLUTION = 0.01
+
+
+class BudgetOptimizer:
+    """
+    Chooses the budget and period of every component that reserves the least bandwidth.
+
+    A periodic resource (budget, period) supplies the component through the BDR model
+    (budget / period, 2 * (period - budget)) of the half-half algorithm. The smallest alpha
+    for a period follows from the alpha-delta frontier of the component, the periods are
+    scanned from min_period upwards until their alpha alone exceeds the best bandwidth found.
+    Every server period costs switch_overhead of CPU time, without it the shortest period
+    always wins. The budget of the chosen period is then bisected exactly with the
+    schedulability test. Components are independent under Theorem 1, so minimising each
+    of them minimises the alpha sum of every core. Longer periods save overhead but need a
+    larger alpha, the components of a core that fails Theorem 1 this way are optimized
+    again for alpha alone.
+    """
+
+    def __init__(self, analyzer: HierarchicalSchedulabilityAnalyzer, switch_overhead: float = 0.0,
+                 min_period: int = 1, samples: int = 64, workers: int = 1):
+        """
+        Initialize the optimizer.
+
+        Args:
+            analyzer: Analyzer holding the loaded system, its cache is used if it has one
+            switch_overhead: CPU time lost every time a component's server is replenished
+            min_period: Smallest period that is considered, periods are integers
+            samples: Number of sampled delays of the alpha-delta frontiers
+            workers: Number of worker processes
+        """
+        self.analyzer = analyzer
+        self.switch_overhead = switch_overhead
+        self.min_period = max(1, int(min_period))
+        self.samples = samples
+        self.workers = workers
+        self.core_bdr = BDRModel(1.0, 0.0)
+
+    def optimize_component(self, component: Component, speed_factor: float, switch_overhead: float) -> Dict:
+        """
+        Find the budget and period of a component with the smallest reserved bandwidth.
+
+        Args:
+            component: Component to optimize
+            speed_factor: Speed factor of its core
+            switch_overhead: CPU time lost every server period
+
+        Returns:
+            Dictionary with the chosen budget, period, alpha, delta and bandwidth, or the
+            original budget and period with optimized set to False if no interface exists
+        """
+        result = {"component_id": component.component_id, "core_id": component.core_id,
+                  "budget": float(component.budget), "period": float(component.period),
+                  "original_alpha": float(component.budget) / float(component.period), "optimized": False}
+        _, _, effective_tasks, _ = self.analyzer.effective_tasks(component, speed_factor)
+        if not effective_tasks:
+            return result
+        demand = DemandTable(effective_tasks)
+        if demand.utilization > 1.0:
+            return result
+        frontier = InterfaceFrontier.from_demand(component.component_id, component.scheduler, demand,
+                                                 0.0, self.samples)
+        if frontier is None:
+            return result
+
+        best: Optional[Tuple[float, int]] = None
+        period = self.min_period
+        while True:
+            alpha = self._frontier_alpha(frontier, period)
+            if alpha is None or (best is not None and alpha >= best[0]):
+                # alpha only grows with the period, longer periods cannot beat the best one
+                break
+            # the budget is written on the resolution grid, short periods lose more to rounding
+            budget = math.ceil(alpha * period / BUDGET_RESOLUTION - 1e-9) * BUDGET_RESOLUTION
+            bandwidth = (budget + switch_overhead) / period
+            if best is None or bandwidth < best[0]:
+                best = (bandwidth, period)
+            period += 1
+        if best is None:
+            return result
+
+        period = best[1]
+        budget = self._minimal_budget(component.scheduler, demand, period)
+        if budget is None:
+            return result
+        bdr = BDRModel.from_periodic_resource(budget, period)
+        result.update({"budget": budget, "period": float(period), "alpha": bdr.alpha, "delta": bdr.delta,
+                       "bandwidth": (budget + switch_overhead) / period, "optimized": True})
+        return result
+
+    def optimize(self) -> Dict:
+        """
+        Optimize all components, in parallel with more than one worker, and check Theorem 1 per core.
+
+        Returns:
+            Dictionary with the component results by component id and the alpha sums of every core
+        """
+        jobs = [(core.core_id, component.component_id, self.switch_overhead)
+                for core in self.analyzer.cores for component in core.components]
+        results = self._optimize_jobs(jobs)
+        cores = {core.core_id: self._core_result(core, results) for core in self.analyzer.cores}
+
+        retry = [(core.core_id, component.component_id, 0.0) for core in self.analyzer.cores
+                 if not cores[core.core_id]["is_schedulable"] and self.switch_overhead > 0
+                 for component in core.components]
+        if retry:
+            results.update(self._optimize_jobs(retry))
+            for core in self.analyzer.cores:
+                if core.core_id in {job[0] for job in retry}:
+                    cores[core.core_id] = self._core_result(core, results)
+        return {"components": results, "cores": cores}
+
+    def cache_key(self, core_id: str, component_id: str, switch_overhead: float) -> str:
+        """Cache key of a component's optimization, the inputs of its analysis and the optimizer settings."""
+        core = next(core for core in self.analyzer.cores if core.core_id == core_id)
+        component = self.analyzer._find_component(component_id)
+        return InterfaceCache.make_key({
+            "component": self.analyzer.component_cache_key(component, self.core_bdr, float(core.speed_factor)),
+            "optimizer": [switch_overhead, self.min_period, self.samples, BUDGET_RESOLUTION],
+        })
+
+    def export_budgets(self, optimization: Dict, output_folder: str) -> None:
+        """
+        Write a test case with the optimized budgets: budgets.csv with the chosen budget and period
+        of every component and copies of architecture.csv and tasks.csv.
+
+        Args:
+            optimization: Result of optimize
+            output_folder: Folder of the new test case, created if it does not exist
+        """
+        output_path = export_budget_columns(self.analyzer, output_folder, ["budget", "period"], {
+            component_id: [result["budget"], result["period"]]
+            for component_id, result in optimization["components"].items() if result["optimized"]})
+        print(f"Optimized budgets exported to {output_path}")
+
+    def print_summary(self, optimization: Dict) -> None:
+        """Print the reserved alpha of every core before and after the optimization."""
+        print("\n===== Budget Optimization =====\n")
+        for core_id, core_result in optimization["cores"].items():
+            print(f"Core: {core_id}  α: {core_result['original_alpha']:.4f} -> {core_result['alpha']:.4f}  "
+                  f"Schedulable: {'YES' if core_result['is_schedulable'] else 'NO'}")
+
+    def _optimize_jobs(self, jobs: List[Tuple[str, str, float]]) -> Dict[str, Dict]:
+        """Optimize the components of the jobs, cached results are taken from the analyzer's cache."""
+        results = run_cached_jobs(self, "_optimize_job", jobs, self.analyzer.cache, self.cache_key, self.workers)
+        return {job[1]: component_result for job, component_result in results.items()}
+
+    def _core_result(self, core: Core, results: Dict[str, Dict]) -> Dict:
+        component_results = [results[component.component_id] for component in core.components]
+        children = [BDRModel.from_periodic_resource(result["budget"], result["period"])
+                    for result in component_results]
+        return {
+            "original_alpha": sum(result["original_alpha"] for result in component_results),
+            "alpha": sum(child.alpha for child in children),
+            "is_schedulable": all(result["optimized"] for result in component_results)
+                              and BDRModel.check_theorem1_schedulability(self.core_bdr, children),
+        }
+
+    def _optimize_job(self, job: Tuple[str, str, float]) -> Dict:
+        core = next(core for core in self.analyzer.cores if core.core_id == job[0])
+        return self.optimize_component(self.analyzer._find_component(job[1]), float(core.speed_factor), job[2])
+
+    @staticmethod
+    def _frontier_alpha(frontier: InterfaceFrontier, period: int, tolerance: float = 1e-9) -> Optional[float]:
+        """
+        Get the smallest alpha with alpha >= frontier(2 * period * (1 - alpha)). The delay shrinks
+        when alpha grows, so the difference of both sides increases and is bisected.
+        """
+        def covered(alpha: float) -> bool:
+            required = frontier.alpha_at(2 * period * (1 - alpha))
+            return required is not None and alpha >= required
+
+        low, high = 0.0, 1.0 - tolerance
+        if not covered(high):
+            return None
+        while high - low > tolerance:
+            middle = (low + high) / 2
+            if covered(middle):
+                high = middle
+            else:
+                low = middle
+        return high
+
+    @staticmethod
+    def _minimal_budget(scheduler: str, demand: DemandTable, period: int) -> Optional[float]:
+        """Bisect the smallest budget on the resolution grid that schedules the load with the given period."""
+        def schedulable(steps: int) -> bool:
+            bdr = BDRModel.from_periodic_resource(steps * BUDGET_RESOLUTION, period)
+            if scheduler == "EDF":
+                return bdr.is_schedulable_edf_workload(demand.tasks, demand)
+            return bdr.is_schedulable_rm_workload(demand.tasks, demand)
+
+        # a budget below the utilization can never be enough
+        low = max(0, math.floor(demand.utilization * period / BUDGET_RESOLUTION) - 1)
+        high = math.ceil(period / BUDGET_RESOLUTION) - 1
+        if not schedulable(high):
+            return None
+        while high - low > 1:
+            middle = (low + high) // 2
+            if schedulable(middle):
+                high = middle
+            else:
+                low = middle
+        return round(high * BUDGET_RESOLUTION, 2)
+
+
+def export_budget_columns(analyzer: HierarchicalSchedulabilityAnalyzer, output_folder: str,
+                          columns: List[str], values: Dict[str, List[float]]) -> str:
+    """
+    Write a test case with changed budgets: budgets.csv with new values of some columns and
+    copies of architecture.csv and tasks.csv. Columns that budgets.csv lacks are appended.
+
+    Args:
+        analyzer: Analyzer holding the loaded system
+        output_folder: Folder of the new test case, created if it does not exist
+        columns: Names of the changed columns
+        values: New values of the columns by component id, the other components are kept
+
+    Returns:
+        Path of the written budgets.csv
+    """
+    os.makedirs(output_folder, exist_ok=True)
+    for path in [analyzer.architecture_path, analyzer.tasks_path]:
+        shutil.copyfile(path, os.path.join(output_folder, os.path.basename(path)))
+    with open(analyzer.budgets_path, newline='') as csvfile:
+        reader = csv.DictReader(csvfile)
+        fieldnames = list(reader.fieldnames)
+        rows = list(reader)
+    fieldnames += [name for name in columns if name not in fieldnames]
+    for row in rows:
+        if row["component_id"] in values:
+            for name, value in zip(columns, values[row["component_id"]]):
+                row[name] = f"{value:g}"
+    output_path = os.path.join(output_folder, "budgets.csv")
+    with open(output_path, 'w', newline='') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+    return output_path
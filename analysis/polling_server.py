@@ -0,0 +1,195 @@
+import math
+from typing import List, Dict, Optional, Tuple
+from .analysis import HierarchicalSchedulabilityAnalyzer
+from .bdr_model import BDRModel
+from .cache import InterfaceCache
+from .core import Task, Component
+from .demand import DemandTable
+from .optimizer import BUDGET_RESOLUTION, export_budget_columns
+from .workers import run_cached_jobs
+
+
+class PollingServerOptimizer:
+    """
+    Chooses the budget Cps and period Tps of the polling server of every component with
+    sporadic tasks that meets all sporadic deadlines and adds the least to the alpha the
+    component needs.
+
+    A sporadic task meets its deadline D if (ceil(C / Cps) + 1) * Tps <= D, so for an integer
+    period Tps the smallest budget follows in closed form as max C / (floor(D / Tps) - 1),
+    rounded up to the budget resolution. A larger budget only adds demand, every period
+    up to half the shortest sporadic deadline therefore gives exactly one candidate. The
+    alpha of a candidate is at least the alpha of the periodic tasks alone and the one the
+    server needs to get its budget by the end of its period, for EDF also the total
+    utilization. The candidates are visited by increasing bound until it reaches the best
+    alpha found. Each candidate extends the demand table of the periodic tasks by the
+    server task only.
+    """
+
+    def __init__(self, analyzer: HierarchicalSchedulabilityAnalyzer, min_period: int = 1, workers: int = 1):
+        """
+        Initialize the optimizer.
+
+        Args:
+            analyzer: Analyzer holding the loaded system, its cache is used if it has one
+            min_period: Smallest server period that is considered, periods are integers
+            workers: Number of worker processes
+        """
+        self.analyzer = analyzer
+        self.min_period = max(1, int(min_period))
+        self.workers = workers
+        self.core_bdr = BDRModel(1.0, 0.0)
+
+    def optimize_component(self, component: Component, speed_factor: float) -> Dict:
+        """
+        Find the polling server of a component that adds the least to its alpha.
+
+        Args:
+            component: Component with sporadic tasks
+            speed_factor: Speed factor of its core
+
+        Returns:
+            Dictionary with the original and the chosen server, the alpha of the periodic tasks
+            alone and with each server, whether the original server meets the sporadic deadlines,
+            the added alpha and the number of evaluated candidates, optimized is False if no
+            server meets the sporadic deadlines
+        """
+        periodic_tasks, sporadic_tasks, effective_tasks, server = self.analyzer.effective_tasks(component, speed_factor)
+        result = {"component_id": component.component_id, "core_id": component.core_id,
+                  "original_server_budget": component.server_budget,
+                  "original_server_period": component.server_period,
+                  "server_budget": component.server_budget, "server_period": component.server_period,
+                  "original_alpha": None, "original_feasible": False, "periodic_alpha": None, "candidates": 0,
+                  "optimized": False}
+        if server is not None:
+            interface = self.analyzer.find_minimal_bdr_interface(component, effective_tasks, self.core_bdr.delta)
+            result["original_alpha"] = interface[0] if interface else None
+            result["original_feasible"] = interface is not None and all(
+                self.analyzer.WCRT_sporadic_task_under_PS(task, server.original_wcet, server.period) <= task.deadline
+                for task in sporadic_tasks)
+
+        periodic_demand = DemandTable(periodic_tasks)
+        periodic_interface = self.analyzer.find_minimal_bdr_interface(component, periodic_tasks, self.core_bdr.delta,
+                                                                      periodic_demand)
+        if periodic_interface is None:
+            return result
+        periodic_alpha = periodic_interface[0] if periodic_tasks else 0.0
+        result["periodic_alpha"] = periodic_alpha
+
+        delta = periodic_interface[1]
+
+        def lower_bound(candidate: Tuple[float, int]) -> float:
+            server_wcet, server_period = candidate[0] / speed_factor, candidate[1]
+            # the server needs its budget by the end of its period
+            bound = max(periodic_alpha, server_wcet / (server_period - delta) if server_period > delta else math.inf)
+            if component.scheduler == "EDF":
+                bound = max(bound, periodic_demand.utilization + server_wcet / server_period)
+            return bound
+
+        best: Optional[Tuple[float, float, float, int]] = None
+        for server_budget, server_period in sorted(self.candidates(sporadic_tasks, speed_factor), key=lower_bound):
+            if best is not None and lower_bound((server_budget, server_period)) >= best[0]:
+                # the bound only grows from here, no later candidate can beat the best one
+                break
+            result["candidates"] += 1
+            server = self.adjusted_server(component, server_budget, server_period, speed_factor)
+            tasks = periodic_tasks + [server]
+            interface = self.analyzer.find_minimal_bdr_interface(component, tasks, self.core_bdr.delta,
+                                                                 periodic_demand.with_task(server))
+            if interface is not None and (best is None or interface[0] < best[0]):
+                best = (interface[0], interface[1], server_budget, server_period)
+        if best is None:
+            return result
+
+        alpha, delta, server_budget, server_period = best
+        result.update({"server_budget": server_budget, "server_period": float(server_period), "alpha": alpha,
+                       "delta": delta, "added_alpha": alpha - periodic_alpha, "optimized": True})
+        return result
+
+    def candidates(self, sporadic_tasks: List[Task], speed_factor: float) -> List[Tuple[float, int]]:
+        """
+        Get the smallest budget of every integer server period that meets the sporadic deadlines.
+
+        Args:
+            sporadic_tasks: Speed adjusted sporadic tasks
+            speed_factor: Speed factor of the core
+
+        Returns:
+            List of (budget, period) by increasing period
+        """
+        if not sporadic_tasks:
+            return []
+        candidates = []
+        # every task needs at least one full server period besides the one it may just miss
+        for period in range(self.min_period, int(min(task.deadline for task in sporadic_tasks) // 2) + 1):
+            budget = max(task.wcet / (math.floor(task.deadline / period + 1e-9) - 1) for task in sporadic_tasks)
+            budget = round(math.ceil(budget / BUDGET_RESOLUTION - 1e-9) * BUDGET_RESOLUTION, 2)
+            # the grid value can fall just below the exact budget, step up until every deadline is met
+            while not all(self.analyzer.WCRT_sporadic_task_under_PS(task, budget, period) <= task.deadline
+                          for task in sporadic_tasks):
+                budget = round(budget + BUDGET_RESOLUTION, 2)
+            if budget / speed_factor <= period:
+                candidates.append((budget, period))
+        return candidates
+
+    def adjusted_server(self, component: Component, server_budget: float, server_period: float,
+                        speed_factor: float) -> Task:
+        """Get the server task of a candidate with its budget adjusted for the core speed, as in effective_tasks."""
+        server = self.analyzer.polling_server_task(component, server_budget, server_period)
+        server.wcet = server_budget / speed_factor
+        return server
+
+    def optimize(self) -> Dict[str, Dict]:
+        """
+        Optimize the servers of all components with sporadic tasks, in parallel with more than one worker.
+
+        Returns:
+            Dictionary with the result of every component with sporadic tasks by component id
+        """
+        jobs = [(core.core_id, component.component_id) for core in self.analyzer.cores
+                for component in core.components if any(task.task_type == "sporadic" for task in component.tasks)]
+        results = run_cached_jobs(self, "_optimize_job", jobs, self.analyzer.cache, self.cache_key, self.workers)
+        return {job[1]: results[job] for job in jobs}
+
+    def cache_key(self, core_id: str, component_id: str) -> str:
+        """Cache key of a component's server optimization, the inputs of its analysis and the optimizer settings."""
+        core = next(core for core in self.analyzer.cores if core.core_id == core_id)
+        component = self.analyzer._find_component(component_id)
+        return InterfaceCache.make_key({
+            "component": self.analyzer.component_cache_key(component, self.core_bdr, float(core.speed_factor)),
+            "server_optimizer": [self.min_period, BUDGET_RESOLUTION],
+        })
+
+    def export_servers(self, optimization: Dict[str, Dict], output_folder: str) -> None:
+        """
+        Write a test case with the optimized servers: budgets.csv with the chosen server budget
+        and period of every component and copies of architecture.csv and tasks.csv.
+
+        Args:
+            optimization: Result of optimize
+            output_folder: Folder of the new test case, created if it does not exist
+        """
+        output_path = export_budget_columns(self.analyzer, output_folder, ["server_budget", "server_period"], {
+            component_id: [result["server_budget"], result["server_period"]]
+            for component_id, result in optimization.items() if result["optimized"]})
+        print(f"Optimized polling servers exported to {output_path}")
+
+    def print_summary(self, optimization: Dict[str, Dict]) -> None:
+        """Print the server and the alpha of every component with sporadic tasks before and after the optimization."""
+        print("\n===== Polling Server Optimization =====\n")
+        for component_id, result in optimization.items():
+            original = "-" if result["original_server_budget"] is None or result["original_server_period"] is None \
+                else f"({result['original_server_budget']:g}, {result['original_server_period']:g})"
+            original_alpha = "-" if result["original_alpha"] is None else f"{result['original_alpha']:.4f}"
+            if result["original_alpha"] is not None and not result["original_feasible"]:
+                original_alpha += " (misses sporadic deadlines)"
+            if not result["optimized"]:
+                print(f"Component: {component_id}  Server: {original}  α: {original_alpha}  No feasible server")
+                continue
+            print(f"Component: {component_id}  Server: {original} -> "
+                  f"({result['server_budget']:g}, {result['server_period']:g})  "
+                  f"α: {original_alpha} -> {result['alpha']:.4f}  Added α: {result['added_alpha']:.4f}")
+
+    def _optimize_job(self, job: Tuple[str, str]) -> Dict:
+        core = next(core for core in self.analyzer.cores if core.core_id == job[0])
+        return self.optimize_component(self.analyzer._find_component(job[1]), float(core.speed_factor))
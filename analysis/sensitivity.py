@@ -0,0 +1,184 @@
+import io
+import os
+import csv
+import copy
+import math
+import contextlib
+from typing import List, Dict, Optional
+from .analysis import HierarchicalSchedulabilityAnalyzer
+from .bdr_model import BDRModel
+from .core import Component, Task
+from .workers import run_jobs
+
+
+class WcetSensitivity:
+    """
+    Finds how far the WCET of every task can be scaled before its component or its core
+    becomes unschedulable.
+
+    The results of all components are computed once and kept. A probe analyzes only the
+    component of the scaled task and checks Theorem 1 of its core against the kept alphas
+    of the other components. The factor is bisected, so the result is a lower bound within
+    the tolerance, assuming that a larger WCET never makes a component schedulable again.
+    """
+
+    def __init__(self, analyzer: HierarchicalSchedulabilityAnalyzer, tolerance: float = 1e-3,
+                 max_factor: float = 64.0):
+        """
+        Initialize the search and analyze every component once.
+
+        Args:
+            analyzer: Analyzer holding the loaded system, it is not changed
+            tolerance: Width of the final bisection interval
+            max_factor: Largest factor that is tried
+        """
+        self.analyzer = analyzer
+        self.tolerance = tolerance
+        self.max_factor = max_factor
+        self.core_bdr = BDRModel(1.0, 0.0)
+        self.speed_factors = {core.core_id: float(core.speed_factor) for core in analyzer.cores}
+        self.component_results: Dict[str, Dict] = {}
+        with contextlib.redirect_stdout(io.StringIO()):
+            for core in analyzer.cores:
+                for component in core.components:
+                    self.component_results[component.component_id] = analyzer.analyze_component(
+                        component, self.core_bdr, float(core.speed_factor))
+
+    def is_feasible(self, factor: float, task_name: str) -> bool:
+        """
+        Analyze the component of a task with the task's WCET scaled by the factor.
+
+        Args:
+            factor: WCET scaling factor
+            task_name: Name of the scaled task
+
+        Returns:
+            True if the component is schedulable and its core satisfies Theorem 1
+        """
+        component, task = self._find_task(task_name)
+        scaled = copy.copy(component)
+        scaled.tasks = [Task(task_name=other.task_name, wcet=other.original_wcet * factor, period=other.period,
+                             component_id=other.component_id, priority=other.priority,
+                             task_type=other.task_type, deadline=other.deadline) if other is task else other
+                        for other in component.tasks]
+        with contextlib.redirect_stdout(io.StringIO()):
+            # probes are not cached, only the unscaled results are worth keeping
+            result = self.analyzer.analyze_component_uncached(scaled, self.core_bdr,
+                                                              self.speed_factors[component.core_id])
+        if not result["is_schedulable"]:
+            return False
+        children = [BDRModel(result["alpha"], result["delta"])]
+        children += [BDRModel(self.component_results[other.component_id]["alpha"],
+                              self.component_results[other.component_id]["delta"])
+                     for other in self._core_components(component.core_id) if other is not component]
+        return BDRModel.check_theorem1_schedulability(self.core_bdr, children)
+
+    def utilization_bound(self, task_name: str) -> float:
+        """
+        Get a factor above which a periodic task cannot be schedulable: the component's alpha is
+        at least its utilization and the core has 1 minus the alphas of the other components left.
+
+        Args:
+            task_name: Name of the task
+
+        Returns:
+            The bound, max_factor for sporadic tasks which are served by the polling server
+        """
+        component, task = self._find_task(task_name)
+        if task.task_type != "periodic" or task.original_wcet <= 0:
+            return self.max_factor
+        speed_factor = self.speed_factors[component.core_id]
+        utilization = sum(other.original_wcet / speed_factor / other.period
+                          for other in component.tasks if other.task_type == "periodic")
+        if component.polling_server_task:
+            utilization += component.polling_server_task.original_wcet / speed_factor / component.polling_server_task.period
+        others = sum(self.component_results[other.component_id]["alpha"]
+                     for other in self._core_components(component.core_id) if other is not component)
+        task_utilization = task.original_wcet / speed_factor / task.period
+        return min(self.max_factor, max(0.0, 1 + (1 - others - utilization) / task_utilization))
+
+    def critical_factor(self, task_name: str) -> float:
+        """
+        Bisect the largest WCET scaling factor of a task that keeps the system schedulable.
+
+        Args:
+            task_name: Name of the task
+
+        Returns:
+            The critical factor, 0 if even the smallest factor fails and max_factor if no tried factor fails
+        """
+        low, high = 0.0, 1.0
+        if self.is_feasible(1.0, task_name):
+            low, high = 1.0, self.utilization_bound(task_name)
+            if high <= low:
+                return 1.0
+            if high >= self.max_factor:
+                # no bound is known, expand the interval until a factor fails
+                high = 2.0
+                while self.is_feasible(high, task_name):
+                    low = high
+                    if low >= self.max_factor:
+                        return self.max_factor
+                    high = min(2 * high, self.max_factor)
+        while high - low > self.tolerance:
+            middle = (low + high) / 2
+            if self.is_feasible(middle, task_name):
+                low = middle
+            else:
+                high = middle
+        # round down, a rounded up factor may no longer be schedulable
+        return math.floor(low * 1e4) / 1e4
+
+    def search(self, workers: int = 1) -> List[Dict]:
+        """
+        Find the critical factor of every task.
+
+        Args:
+            workers: Number of worker processes
+
+        Returns:
+            One row per task with its nominal WCET, critical factor, largest WCET and WCET slack
+        """
+        task_names = [task.task_name for core in self.analyzer.cores
+                      for component in core.components for task in component.tasks]
+        factors = run_jobs(self, "critical_factor", task_names, workers)
+
+        rows = []
+        for task_name, factor in zip(task_names, factors):
+            component, task = self._find_task(task_name)
+            rows.append({
+                "task_name": task_name,
+                "component_id": component.component_id,
+                "wcet": task.original_wcet,
+                "critical_factor": factor,
+                "max_wcet": round(task.original_wcet * factor, 4),
+                "wcet_slack": round(task.original_wcet * (factor - 1), 4),
+            })
+        return rows
+
+    def export_to_csv(self, rows: List[Dict], output_path: Optional[str] = None) -> None:
+        """
+        Export the sensitivity of all tasks to a CSV file.
+
+        Args:
+            rows: Rows returned by search
+            output_path: Path to output CSV file (default: sensitivity.csv in the test case folder)
+        """
+        if output_path is None:
+            output_path = os.path.join(self.analyzer.folder_path, "sensitivity.csv")
+        with open(output_path, 'w', newline='') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=["task_name", "component_id", "wcet", "critical_factor",
+                                                         "max_wcet", "wcet_slack"])
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"Sensitivity exported to {output_path}")
+
+    def _core_components(self, core_id: str) -> List[Component]:
+        return next(core.components for core in self.analyzer.cores if core.core_id == core_id)
+
+    def _find_task(self, task_name: str):
+        for component in self.analyzer.components:
+            for task in component.tasks:
+                if task.task_name == task_name:
+                    return component, task
+        raise ValueError(f"Unknown task: {task_name}")
@@ -0,0 +1,209 @@
+import io
+import os
+import csv
+import math
+import contextlib
+from typing import List, Dict, Optional, Tuple
+from .analysis import HierarchicalSchedulabilityAnalyzer
+from .bdr_model import BDRModel
+from .core import Core, Component
+from .workers import run_jobs
+
+
+class SpeedFactorSearch:
+    """
+    Finds the smallest speed factor of every core for which the core is still schedulable.
+
+    The WCETs are divided by the speed factor, so the demand of every component scales with
+    1 / speed and so does its minimal alpha at a fixed delay. The first probe at the configured
+    speed therefore predicts the minimal speed as speed * sum of alphas, the bisection starts
+    from a narrow interval around this prediction. Every probe analyzes the component that
+    failed the previous probe first and stops at the first unschedulable component.
+    A component that was schedulable in an earlier probe is not searched again, its interface
+    is scaled by the ratio of the speeds and only its sporadic tasks are checked at the new
+    speed. The rounded minimal speed is confirmed by a full analysis and raised until it passes.
+    """
+
+    def __init__(self, analyzer: HierarchicalSchedulabilityAnalyzer, tolerance: float = 1e-3,
+                 max_speed: float = 64.0):
+        """
+        Initialize the search.
+
+        Args:
+            analyzer: Analyzer holding the loaded system, it is not changed
+            tolerance: Relative width of the final bisection interval
+            max_speed: Largest speed factor that is tried
+        """
+        self.analyzer = analyzer
+        self.tolerance = tolerance
+        self.max_speed = max_speed
+        self.core_bdr = BDRModel(1.0, 0.0)
+
+    def probe(self, core: Core, speed_factor: float, order: List[str],
+              warm: Optional[Dict[str, Tuple[float, Dict]]] = None) -> Tuple[bool, Dict[str, Dict]]:
+        """
+        Analyze a core at the given speed factor.
+
+        Args:
+            core: Core to analyze
+            speed_factor: Speed factor used instead of the configured one
+            order: Component ids in the order they are analyzed, the first failing one is moved to the front
+            warm: Speed factor and result of the components that were schedulable in an earlier probe,
+                see scaled_result, the schedulable results of this probe are added. Without it
+                every component is analyzed
+
+        Returns:
+            Tuple of the verdict and the results of the analyzed components
+        """
+        components = {component.component_id: component for component in core.components}
+        results = {}
+        with contextlib.redirect_stdout(io.StringIO()):
+            for component_id in list(order):
+                if warm is not None and component_id in warm:
+                    result = self.scaled_result(components[component_id], speed_factor, *warm[component_id])
+                else:
+                    result = self.analyzer.analyze_component_uncached(components[component_id], self.core_bdr,
+                                                                      speed_factor)
+                    if warm is not None and result["is_schedulable"]:
+                        warm[component_id] = (speed_factor, result)
+                results[component_id] = result
+                if not result["is_schedulable"]:
+                    order.remove(component_id)
+                    order.insert(0, component_id)
+                    return False, results
+        children = [BDRModel(result["alpha"], result["delta"]) for result in results.values()]
+        return BDRModel.check_theorem1_schedulability(self.core_bdr, children), results
+
+    def scaled_result(self, component: Component, speed_factor: float, warm_speed: float, warm_result: Dict) -> Dict:
+        """
+        Get the interface and verdict of a component from its schedulable result at another speed.
+        The demand at every checked time point scales with 1 / speed and the supply with alpha, so at
+        the same delay the minimal alpha is the one at warm_speed times warm_speed / speed_factor.
+        The sporadic tasks depend on the speed through the polling server and are checked again.
+
+        Args:
+            component: Component to analyze
+            speed_factor: Speed factor of the probe
+            warm_speed: Speed factor of the schedulable result
+            warm_result: Result of analyze_component_uncached at warm_speed
+
+        Returns:
+            Dictionary with the alpha, delta and the verdict
+        """
+        alpha = warm_result["alpha"] * warm_speed / speed_factor
+        is_schedulable = alpha <= 1.0
+        _, sporadic_tasks, _, server = self.analyzer.effective_tasks(component, speed_factor)
+        if is_schedulable and sporadic_tasks:
+            is_schedulable = server is not None and all(
+                self.analyzer.WCRT_sporadic_task_under_PS(task, server.original_wcet, server.period) <= task.deadline
+                for task in sporadic_tasks)
+        return {"alpha": alpha, "delta": warm_result["delta"], "is_schedulable": is_schedulable}
+
+    def minimal_speed(self, core: Core) -> Dict:
+        """
+        Bisect the smallest speed factor of a core.
+
+        Args:
+            core: Core to analyze
+
+        Returns:
+            Dictionary with the configured and the minimal speed factor, the alpha sum at the
+            minimal speed, the relative dynamic power and energy and the number of probes
+        """
+        if not core.components:
+            return self._operating_point(core, 0.0, 0.0, 0)
+        order = [component.component_id for component in core.components]
+        warm: Dict[str, Tuple[float, Dict]] = {}
+        probes = 0
+
+        def feasible(speed_factor: float, cold: bool = False) -> Tuple[bool, Dict[str, Dict]]:
+            nonlocal probes
+            probes += 1
+            return self.probe(core, speed_factor, order, None if cold else warm)
+
+        speed = float(core.speed_factor)
+        schedulable, results = feasible(speed)
+        if schedulable:
+            # alphas scale with 1 / speed, bracket the predicted speed where they sum up to 1
+            predicted = speed * sum(result["alpha"] for result in results.values())
+            low, high = predicted * (1 - 4 * self.tolerance), min(speed, predicted * (1 + 4 * self.tolerance))
+            while high < speed and not feasible(high)[0]:
+                low, high = high, min(speed, high * 1.1)
+            while low > 0 and feasible(low)[0]:
+                high, low = low, low * 0.9
+        else:
+            # expand upwards until the core becomes schedulable
+            low, high = speed, speed * 2
+            while not feasible(high)[0]:
+                low = high
+                if low >= self.max_speed:
+                    return self._operating_point(core, None, None, probes)
+                high = min(2 * high, self.max_speed)
+
+        while high - low > self.tolerance * high:
+            middle = (low + high) / 2
+            if feasible(middle)[0]:
+                high = middle
+            else:
+                low = middle
+        # round up, a rounded down speed may no longer be schedulable, the full analysis has the last word
+        minimal = math.ceil(high * 1e4) / 1e4
+        step = 1e-4
+        schedulable, results = feasible(minimal, cold=True)
+        while not schedulable:
+            if minimal >= self.max_speed:
+                return self._operating_point(core, None, None, probes)
+            minimal = min(math.ceil((minimal + step) * 1e4) / 1e4, self.max_speed)
+            step *= 2
+            schedulable, results = feasible(minimal, cold=True)
+        return self._operating_point(core, minimal, sum(result["alpha"] for result in results.values()), probes)
+
+    def search(self, workers: int = 1) -> List[Dict]:
+        """
+        Find the minimal speed factor of every core.
+
+        Args:
+            workers: Number of worker processes
+
+        Returns:
+            One operating point per core, see minimal_speed
+        """
+        return run_jobs(self, "_minimal_speed_job", [core.core_id for core in self.analyzer.cores], workers)
+
+    def export_to_csv(self, rows: List[Dict], output_path: Optional[str] = None) -> None:
+        """
+        Export the operating point of every core to a CSV file.
+
+        Args:
+            rows: Rows returned by search
+            output_path: Path to output CSV file (default: speed_factors.csv in the test case folder)
+        """
+        if output_path is None:
+            output_path = os.path.join(self.analyzer.folder_path, "speed_factors.csv")
+        with open(output_path, 'w', newline='') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=["core_id", "speed_factor", "min_speed_factor", "alpha_sum",
+                                                         "relative_power", "relative_energy", "probes"])
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"Speed factors exported to {output_path}")
+
+    @staticmethod
+    def _operating_point(core: Core, minimal: Optional[float], alpha_sum: Optional[float], probes: int) -> Dict:
+        """
+        Describe the operating point of a core. Dynamic power grows with the cube of the frequency
+        and the energy per unit of work with its square, both relative to the configured speed.
+        """
+        speed = float(core.speed_factor)
+        ratio = None if minimal is None else minimal / speed
+        return {
+            "core_id": core.core_id,
+            "speed_factor": speed,
+            "min_speed_factor": minimal,
+            "alpha_sum": None if alpha_sum is None else round(alpha_sum, 4),
+            "relative_power": None if ratio is None else round(ratio ** 3, 4),
+            "relative_energy": None if ratio is None else round(ratio ** 2, 4),
+            "probes": probes,
+        }
+
+    def _minimal_speed_job(self, core_id: str) -> Dict:
+        return self.minimal_speed(next(core for core in self.analyzer.cores if core.core_id == core_id))
@@ -0,0 +1,105 @@
+import sys
+import json
+import logging
+from typing import Dict, Optional, Any
+from .bdr_model import SearchCounters
+
+LOG_FORMAT = "%(levelname)s: %(message)s"
+
+
+class StdoutHandler(logging.StreamHandler):
+    """
+    Log handler that writes to the sys.stdout of the moment instead of the one at creation,
+    so log lines end up in the same captured or redirected output as the printed results.
+    """
+
+    def __init__(self):
+        super().__init__(sys.stdout)
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+def configure_logging(level: str = "WARNING") -> None:
+    """
+    Send the log lines of the analysis package to stdout. Nothing below WARNING is logged
+    unless this is called with a lower level.
+
+    Args:
+        level: Name of the lowest logged level, e.g. INFO or DEBUG
+    """
+    logger = logging.getLogger("analysis")
+    logger.setLevel(level.upper())
+    if not any(isinstance(handler, StdoutHandler) for handler in logger.handlers):
+        handler = StdoutHandler()
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        logger.addHandler(handler)
+
+
+class AnalysisStats:
+    """
+    Timers and counters of an analysis run. Every analyzed component gets its run time,
+    whether its interface came from the cache and the work counters of the schedulability
+    tests, see SearchCounters.
+    """
+
+    COUNTERS = SearchCounters.FIELDS
+
+    def __init__(self):
+        self.components: Dict[str, Dict[str, Any]] = {}
+        self.seconds = 0.0
+        self.verdict_memo: Optional[Dict[str, int]] = None
+        self.interface_cache: Optional[Dict[str, int]] = None
+
+    def add_component(self, component_id: str, seconds: float, counters: Optional[Dict[str, int]] = None,
+                      cache_hit: bool = False) -> None:
+        """
+        Record the analysis of a component, a component analyzed again adds to its entry.
+
+        Args:
+            component_id: Id of the component
+            seconds: Wall time of the analysis
+            counters: Work counters of the analysis, none for cached interfaces
+            cache_hit: True if the interface was taken from the cache
+        """
+        entry = self.components.setdefault(component_id, dict(
+            {"seconds": 0.0, "analyses": 0, "cache_hits": 0}, **{name: 0 for name in self.COUNTERS}))
+        entry["seconds"] += seconds
+        entry["analyses"] += 1
+        entry["cache_hits"] += int(cache_hit)
+        for name, value in (counters or {}).items():
+            entry[name] += value
+
+    def totals(self) -> Dict[str, Any]:
+        """Sum of the component entries."""
+        totals = {"seconds": 0.0, "analyses": 0, "cache_hits": 0, **{name: 0 for name in self.COUNTERS}}
+        for entry in self.components.values():
+            for name in totals:
+                totals[name] += entry[name]
+        return totals
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON compatible dictionary of all timers and counters."""
+        return {
+            "seconds": self.seconds,
+            "totals": self.totals(),
+            "verdict_memo": self.verdict_memo,
+            "interface_cache": self.interface_cache,
+            "components": self.components,
+        }
+
+    def export_to_json(self, output_path: str) -> None:
+        """
+        Write the timers and counters to a JSON file.
+
+        Args:
+            output_path: Path of the JSON file
+        """
+        with open(output_path, 'w') as jsonfile:
+            json.dump(self.to_dict(), jsonfile, indent=2)
+        print(f"Analysis statistics exported to {output_path}")
@@ -0,0 +1,92 @@
+import io
+import contextlib
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Hashable, List, Optional
+from .cache import InterfaceCache
+
+
+def worker_pool(owner: Any, workers: int) -> Optional[ProcessPoolExecutor]:
+    """
+    Start a process pool whose workers run the jobs of owner.
+
+    Args:
+        owner: Search, optimizer or analyzer whose methods run the jobs
+        workers: Number of worker processes
+
+    Returns:
+        The pool, None with a single worker
+    """
+    if workers <= 1:
+        return None
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(owner,))
+
+
+def run_jobs(owner: Any, method: str, jobs: List[Any], workers: int = 1,
+             executor: Optional[ProcessPoolExecutor] = None) -> List[Any]:
+    """
+    Run a method of owner on every job, in worker processes if there is more than one job.
+
+    Args:
+        owner: Search, optimizer or analyzer whose method runs the jobs
+        method: Name of the method, it takes a single job
+        jobs: Jobs to run
+        workers: Number of worker processes of a new pool, used if no executor is given
+        executor: Pool started by worker_pool for the same owner
+
+    Returns:
+        The results in the order of the jobs
+    """
+    if len(jobs) > 1 and executor is not None:
+        return list(executor.map(partial(_run_job, method), jobs))
+    if len(jobs) > 1 and workers > 1:
+        with worker_pool(owner, workers) as pool:
+            return list(pool.map(partial(_run_job, method), jobs))
+    run = getattr(owner, method)
+    return [run(job) for job in jobs]
+
+
+def run_cached_jobs(owner: Any, method: str, jobs: List[Hashable], cache: Optional[InterfaceCache],
+                    cache_key: Callable[..., str], workers: int = 1) -> Dict[Hashable, Dict]:
+    """
+    Run a method of owner on every job whose result is not in the cache and cache the new results.
+
+    Args:
+        owner: Search, optimizer or analyzer whose method runs the jobs
+        method: Name of the method, it takes a single job
+        jobs: Jobs to run, tuples of the arguments of cache_key
+        cache: Interface cache, nothing is cached if None
+        cache_key: Function that makes the cache key of a job
+        workers: Number of worker processes
+
+    Returns:
+        Dictionary with the result of every job
+    """
+    results: Dict[Hashable, Dict] = {}
+    keys = {}
+    if cache is not None:
+        for job in jobs:
+            keys[job] = cache_key(*job)
+            cached_result = cache.get(keys[job])
+            if cached_result is not None:
+                results[job] = cached_result
+    pending = [job for job in jobs if job not in results]
+    for job, result in zip(pending, run_jobs(owner, method, pending, workers)):
+        results[job] = result
+        if cache is not None:
+            cache.put(keys[job], result)
+    return results
+
+
+# the owner of the jobs of a worker process, it is pickled once per worker instead of once per job
+_worker_owner: Any = None
+
+
+def _init_worker(owner: Any) -> None:
+    global _worker_owner
+    _worker_owner = owner
+
+
+def _run_job(method: str, job: Any) -> Any:
+    with contextlib.redirect_stdout(io.StringIO()):
+        return getattr(_worker_owner, method)(job)
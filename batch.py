@@ -0,0 +1,44 @@
+from analysis import BatchRunner, find_case_folders, configure_logging
+import argparse
+import sys
+
+
+def parse_args():
+    """Parse the command line arguments of the batch runner."""
+    parser = argparse.ArgumentParser(description='Hierarchical schedulability analysis of many test cases')
+    parser.add_argument('paths', type=str, nargs='+',
+                        help='Test case folders, glob patterns or directories that are searched for test cases')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Number of worker processes, every test case is analyzed by one of them')
+    parser.add_argument('--summary', type=str, default=None,
+                        help='Path of the summary CSV file, batch_summary.csv in the common parent folder if not given')
+    parser.add_argument('--force', action='store_true',
+                        help='Also analyze the test cases whose input files match the summary')
+    parser.add_argument('--log-level', type=str, default='WARNING', choices=['DEBUG', 'INFO', 'WARNING'],
+                        help='Lowest level of the log lines printed by the analysis')
+    return parser.parse_args()
+
+
+def main():
+    """Main function to run the batch analysis."""
+    args = parse_args()
+    configure_logging(args.log_level)
+    
+    folders = find_case_folders(args.paths)
+    if not folders:
+        print("No test case folders found")
+        return 1
+    
+    try:
+        runner = BatchRunner(folders, workers=args.workers, summary_path=args.summary, force=args.force)
+        rows = runner.run()
+        return 0 if all(row["status"] != "failed" for row in rows) else 1
+    except Exception as e:
+        print(f"Error running batch analysis: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,4 @@
-from .csv_functions import load_models_from_csv, write_solutions_to_csv
+from .csv_functions import load_models_from_csv, write_solutions_to_csv, write_budget_report_to_csv, write_preemption_report_to_csv
 
-__all__ = ["load_models_from_csv", "write_solutions_to_csv"]
+__all__ = ["load_models_from_csv", "write_solutions_to_csv", "write_budget_report_to_csv",
+           "write_preemption_report_to_csv"]
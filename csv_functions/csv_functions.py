@@ -31,4 +31,44 @@ def write_solutions_to_csv(solutions: List[Solution], filename) -> None:
                                  solution.avg_response_time, solution.max_response_time, solution.component_schedulable])
     except Exception as e:
         print(f"Error writing to CSV file: {e}")
-        exit(1)
\ No newline at end of file
+        exit(1)
+
+def write_budget_report_to_csv(report: List[dict], filename) -> None:
+    filename= ""+filename+"_budgets_report.csv"
+    try:
+        with open(filename, mode='w', newline='') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(['core_id', 'component_id', 'task_name', 'released', 'consumed',
+                             'idle', 'unused', 'min_slack'])
+            for core in report:
+                writer.writerow([core['core_id'], '', '', '', core['consumed'],
+                                 core['idle'], core['unused'], ''])
+                for component in core['components']:
+                    writer.writerow([core['core_id'], component['component_id'], '', component['released'],
+                                     component['consumed'], component['idle'], component['unused'], ''])
+                    for task in component['tasks']:
+                        writer.writerow([core['core_id'], component['component_id'], task['task_name'],
+                                         '', '', '', '', '' if task['min_slack'] is None else task['min_slack']])
+    except Exception as e:
+        print(f"Error writing to CSV file: {e}")
+        exit(1)
+
+def write_preemption_report_to_csv(report: List[dict], filename) -> None:
+    filename= ""+filename+"_preemptions_report.csv"
+    try:
+        with open(filename, mode='w', newline='') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(['core_id', 'component_id', 'task_name', 'task_preemptions',
+                             'component_preemptions', 'context_switches', 'overhead_time'])
+            for core in report:
+                writer.writerow([core['core_id'], '', '', core['task_preemptions'], core['component_preemptions'],
+                                 core['context_switches'], core['overhead_time']])
+                for component in core['components']:
+                    writer.writerow([core['core_id'], component['component_id'], '', component['task_preemptions'],
+                                     component['preemptions'], component['context_switches'], ''])
+                    for task in component['tasks']:
+                        writer.writerow([core['core_id'], component['component_id'], task['task_name'],
+                                         task['preemptions'], task['component_preemptions'], '', ''])
+    except Exception as e:
+        print(f"Error writing to CSV file: {e}")
+        exit(1)
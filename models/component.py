@@ -15,11 +15,22 @@ class Component:
         self.current_start_time = 0
         self.server_priority = server_priority
         self.server_period = server_period
+        # shared result table that replaces the response time lists in worker processes
+        self.result_table = None
+        # budget accounting: released budget, budget spent on tasks and budget burned without a ready task
+        self.budget_released = 0.0
+        self.budget_consumed = 0.0
+        self.budget_idle = 0.0
+        # preemptions of the tasks within the component, preemptions of the component itself
+        # and the number of times a task of the component was dispatched
+        self.task_preemptions = 0
+        self.preemptions = 0
+        self.context_switches = 0
 
     def __repr__(self):
         return f"\nComponent ID = ({self.component_id}) | Budget ({self.budget}) | Period ({self.period}) | Scheduler ({self.scheduler}) \n Tasks: {self.tasks}"
 
-    def finish_task(self, task: Task, execution_time: int, time_difference: int) -> None:
+    def finish_task(self, task: Task, execution_time: int, time_difference: int) -> float:
         """Finishes the given task and reduces the 
         remaining time of the task and components to the correct values.
 
@@ -27,14 +38,47 @@ class Component:
             task (Task): The task to finish
             execution_time (int): the execution time of the task
             time_difference (int): the time difference between the current time and finish time 
+        Returns:
+            float: the response time of the finished job
         """
-        original_task = [
-            t for t in self.tasks if t.task_name == task.task_name][0]
-        response_time = execution_time - task.current_start_time
+        original_task = self.get_task(task.task_name)
+        response_time = round(execution_time - task.current_start_time, 2)
         task.remaining_time = original_task.wcet
-        original_task.response_times.append(round(response_time, 2))
+        if self.result_table is not None:
+            self.result_table.record(original_task.result_row, response_time)
+        else:
+            original_task.response_times.append(response_time)
+        slack = original_task.period - response_time
+        if original_task.min_slack is None or slack < original_task.min_slack:
+            original_task.min_slack = slack
         self.remaining_time -= time_difference
         self.ready_queue.remove(task)
+        return response_time
+
+    def get_task(self, task_name: str) -> Task:
+        """Returns the original task with the given name, the ready queue may contain copies"""
+        return [t for t in self.tasks if t.task_name == task_name][0]
+
+    def preempt_task(self, task_name: str, component_level: bool = False) -> None:
+        """Counts a preemption of the given task.
+        Args:
+            task_name (str): the name of the preempted task
+            component_level (bool): whether the task was preempted because the component was preempted
+        """
+        original_task = self.get_task(task_name)
+        if component_level:
+            original_task.component_preemptions += 1
+            self.preemptions += 1
+        else:
+            original_task.preemptions += 1
+            self.task_preemptions += 1
+        if self.result_table is not None:
+            self.result_table.record_preemption(original_task.result_row, component_level)
+
+    @property
+    def budget_unused(self) -> float:
+        """The released budget which was neither spent on tasks nor burned idle"""
+        return max(0.0, self.budget_released - self.budget_consumed - self.budget_idle)
 
     def raise_task(self, tasks_to_raise: list[Task], execution_time: int, time_difference: int) -> None:
         """Raises all given tasks and recuces the 
@@ -9,10 +9,37 @@ class Core:
         self.components: list[Component] = []
         self.ready_queue: list[Component] = []
         self.execution_time = 0.0
+        # time in which no component was active on the core
+        self.idle_time = 0.0
+        # the component and the name of the task that ran in the last step
+        self.running: tuple[Component, str] | None = None
+        self.context_switches = 0
+        # cpu time charged for context switches
+        self.overhead_time = 0.0
 
     def __repr__(self) -> str:
         return f"\nCore ID = ({self.core_id}) | Seed factor ({self.speed_factor}) | Scheduler ({self.scheduler}) \n Components ({self.components})"
 
+    @property
+    def budget_consumed(self) -> float:
+        return sum(c.budget_consumed for c in self.components)
+
+    @property
+    def budget_idle(self) -> float:
+        return sum(c.budget_idle for c in self.components)
+
+    @property
+    def budget_unused(self) -> float:
+        return sum(c.budget_unused for c in self.components)
+
+    @property
+    def task_preemptions(self) -> int:
+        return sum(c.task_preemptions for c in self.components)
+
+    @property
+    def component_preemptions(self) -> int:
+        return sum(c.preemptions for c in self.components)
+
     def finish_component(self, component: Component, time_difference: int) -> None:
         """Finishes the given component and reduces the
         remaining time of the task and components to the correct values.
@@ -39,4 +66,5 @@ class Core:
             if len(active_component.ready_queue) > 0:
                 active_component.ready_queue[0].remaining_time = time_difference
         for component in components_to_raise:
+            component.budget_released += component.budget
             self.ready_queue.append(component)
@@ -14,6 +14,13 @@ class Task:
         self.current_start_time = 0
         # the list of response times of the task
         self.response_times = []
+        # the row of the task in a shared result table if one is used
+        self.result_row: int | None = None
+        # the smallest observed difference between the period and a response time
+        self.min_slack: float | None = None
+        # how often the task was preempted by another task or together with its component
+        self.preemptions = 0
+        self.component_preemptions = 0
         self.schedulable = True
         if task_type == "periodic":
             self.deadline= deadline
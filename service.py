@@ -0,0 +1,309 @@
+import io
+import os
+import sys
+import copy
+import json
+import math
+import signal
+import argparse
+import multiprocessing
+import threading
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from analysis import HierarchicalSchedulabilityAnalyzer, AdmissionController, InterfaceCache, BDRModel, Task, Component
+from main import load_models
+from simulation import Simulation
+
+INPUT_FILES = ("architecture.csv", "tasks.csv", "budgets.csv")
+
+# admission controller methods that can be called over the service
+ADMISSION_ACTIONS = ("check_add_task", "add_task", "check_remove_task", "remove_task", "check_modify_task",
+                     "modify_task", "check_add_component", "add_component", "remove_component")
+
+
+def json_safe(value):
+    """Replace the infinite and undefined floats of a response, e.g. unbounded response times, by None (null)."""
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, dict):
+        return {key: json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [json_safe(item) for item in value]
+    return value
+
+
+class ThreadOutput(io.TextIOBase):
+    """Stdout replacement that sends the output of a thread to its own buffer while it captures."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def capture(self) -> None:
+        self.local.buffer = io.StringIO()
+
+    def release(self) -> str:
+        output = self.local.buffer.getvalue()
+        self.local.buffer = None
+        return output
+
+    def write(self, text: str) -> int:
+        buffer = getattr(self.local, "buffer", None)
+        return (buffer if buffer is not None else self.stream).write(text)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+
+def process_output() -> ThreadOutput:
+    """Get the stdout of this process that captures per thread, it is installed on first use."""
+    if not isinstance(sys.stdout, ThreadOutput):
+        sys.stdout = ThreadOutput(sys.stdout)
+    return sys.stdout
+
+
+class LoadedSystem:
+    """A parsed test case with its analyzer, its cores and its admission controller."""
+
+    def __init__(self, folder: str, signature: tuple, cache_dir: str = None, cache_size: int = 10000):
+        self.folder = folder
+        self.signature = signature
+        self.lock = threading.Lock()
+        cache = InterfaceCache(cache_dir, cache_size) if cache_dir else None
+        output = process_output()
+        output.capture()
+        try:
+            self.analyzer = HierarchicalSchedulabilityAnalyzer(folder, cache=cache)
+        finally:
+            # the CLI prints the loading messages before the analysis, every analysis response repeats them
+            self.load_output = output.release()
+        self.cores = load_models(*[os.path.join(folder, name) for name in INPUT_FILES])
+        self.controller = None
+
+
+# the loaded systems of this process by folder, every worker process keeps its own
+_systems = {}
+_systems_lock = threading.Lock()
+
+
+def input_signature(folder: str) -> tuple:
+    """Get the modification times of the input files of a folder, raises FileNotFoundError if one is missing."""
+    return tuple(os.stat(os.path.join(folder, name)).st_mtime_ns for name in INPUT_FILES)
+
+
+def load_system(folder: str, cache_dir: str = None, cache_size: int = 10000) -> LoadedSystem:
+    """
+    Get the loaded system of a test case folder, parse it if it is new or its files changed.
+    Folders are kept as given, the command line tools print paths the same way.
+    """
+    signature = input_signature(folder)
+    with _systems_lock:
+        system = _systems.get(folder)
+        if system is None or system.signature != signature:
+            system = LoadedSystem(folder, signature, cache_dir, cache_size)
+            _systems[folder] = system
+        return system
+
+
+def run_analysis(folder: str, frontier_samples: int, cache_dir: str = None, cache_size: int = 10000) -> dict:
+    """
+    Run the analysis of analysis.py on a folder in this process, the output and the written
+    solutions.csv match the command line tool. Only the parsed system is reused between runs.
+    """
+    system = load_system(folder, cache_dir, cache_size)
+    output = process_output()
+    with system.lock:
+        system.analyzer.frontier_samples = frontier_samples
+        output.capture()
+        try:
+            results = system.analyzer.run_analysis()
+        finally:
+            analysis_output = system.load_output + output.release()
+        return {"is_schedulable": results["is_schedulable"], "results": results,
+                "stats": system.analyzer.stats.to_dict(), "output": analysis_output}
+
+
+def run_simulation(folder: str, cache_dir: str = None, cache_size: int = 10000) -> dict:
+    """
+    Run the simulation of main.py on a folder in this process, the output and the written
+    solutions match the command line tool. Only the parsed cores are reused between runs.
+    """
+    system = load_system(folder, cache_dir, cache_size)
+    output = process_output()
+    with system.lock:
+        # the simulation changes the cores, every run starts from a copy of the parsed ones
+        simulator = Simulation(copy.deepcopy(system.cores))
+        output.capture()
+        try:
+            simulator.simulate(system.folder)
+        finally:
+            simulation_output = output.release()
+        return {"output": simulation_output}
+
+
+class AnalysisService:
+    """
+    Answers analyze, simulate and admission requests. Analyze and simulate requests run in a pool
+    of worker processes, each worker keeps the systems it parsed in memory and parses a system
+    again only when one of its input files changes. Every request runs the analysis or the
+    simulation and writes its files like the command line tools. Requests on the same folder
+    take turns, admission controllers stay resident in the service process.
+    """
+
+    def __init__(self, workers: int = 4, cache_dir: str = None, cache_size: int = 10000):
+        """
+        Args:
+            workers: Number of worker processes that run analyze and simulate requests
+            cache_dir: Directory of the persistent interface cache, disabled if None
+            cache_size: Maximum number of cached component interfaces
+        """
+        self.cache_dir = cache_dir
+        self.cache_size = cache_size
+        self.output = process_output()
+        # the workers start clean instead of forking the serving threads and the locks they hold
+        self.pool = ProcessPoolExecutor(max_workers=max(1, workers), mp_context=multiprocessing.get_context("spawn"))
+        self.folders = {}
+        self.folders_lock = threading.Lock()
+
+    def folder_lock(self, folder: str) -> threading.Lock:
+        """Get the lock of a folder, the requests on a folder write the same files and take turns."""
+        input_signature(folder)
+        with self.folders_lock:
+            return self.folders.setdefault(folder, threading.Lock())
+
+    def analyze(self, request: dict) -> dict:
+        """Run the analysis of analysis.py on a folder in a worker, the output matches the command line tool."""
+        folder = request["folder"]
+        frontier_samples = int(request.get("frontier_samples", 0))
+        with self.folder_lock(folder):
+            return self.pool.submit(run_analysis, folder, frontier_samples, self.cache_dir, self.cache_size).result()
+
+    def simulate(self, request: dict) -> dict:
+        """
+        Run the simulation of main.py on a folder in a worker, the output matches the command line tool.
+        Like main.py the cores of a request are simulated in one process, a workers field of the
+        request is ignored so that a request never starts more processes than the service's pool.
+        """
+        folder = request["folder"]
+        with self.folder_lock(folder):
+            return self.pool.submit(run_simulation, folder, self.cache_dir, self.cache_size).result()
+
+    def admission(self, request: dict) -> dict:
+        """
+        Answer a what-if query with the resident admission controller of a folder. Applied changes
+        stay in memory until the input files change or the request sets reset.
+        """
+        system = load_system(request["folder"], self.cache_dir, self.cache_size)
+        action = request["action"]
+        if action not in ADMISSION_ACTIONS:
+            raise ValueError(f"Unknown admission action: {action}")
+        with system.lock:
+            if system.controller is None or request.get("reset"):
+                # the controller changes its analyzer, it gets its own copy of the system
+                self.output.capture()
+                try:
+                    system.controller = AdmissionController(copy.deepcopy(system.analyzer))
+                finally:
+                    self.output.release()
+            arguments = dict(request.get("arguments", {}))
+            if "task" in arguments:
+                arguments["task"] = Task(**arguments["task"])
+            if "tasks" in arguments:
+                arguments["tasks"] = [Task(**task) for task in arguments["tasks"]]
+            if "component" in arguments:
+                arguments["component"] = Component(**arguments["component"])
+            return getattr(system.controller, action)(**arguments)
+
+    def status(self) -> dict:
+        """Folders that requests used and the counters of the verdict memo of the admission controllers."""
+        with self.folders_lock, _systems_lock:
+            folders = sorted(set(self.folders) | set(_systems))
+        return {"systems": folders, "verdict_memo": BDRModel.memo.info()}
+
+    def handle(self, path: str, request: dict) -> dict:
+        """Dispatch a request by its path."""
+        handlers = {"/analyze": self.analyze, "/simulate": self.simulate, "/admission": self.admission}
+        if path not in handlers:
+            raise KeyError(path)
+        return handlers[path](request)
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        self.pool.shutdown(cancel_futures=True)
+
+
+class ServiceRequestHandler(BaseHTTPRequestHandler):
+    """JSON over HTTP, POST /analyze, /simulate and /admission with a JSON body, GET /status."""
+
+    service: AnalysisService = None
+
+    def do_GET(self):
+        if self.path == "/status":
+            self.reply(200, self.service.status())
+        else:
+            self.reply(404, {"error": f"Unknown path: {self.path}"})
+
+    def do_POST(self):
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            self.reply(200, self.service.handle(self.path, request))
+        except KeyError as e:
+            status = 404 if e.args and e.args[0] == self.path else 400
+            self.reply(status, {"error": f"Missing or unknown key: {e}"})
+        except (ValueError, TypeError, FileNotFoundError) as e:
+            self.reply(400, {"error": str(e)})
+        except Exception as e:
+            self.reply(500, {"error": str(e), "traceback": traceback.format_exc()})
+
+    def reply(self, status: int, body: dict) -> None:
+        data = json.dumps(json_safe(body), allow_nan=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # requests are logged on stderr so they never end up in a captured output
+        sys.stderr.write(f"{self.address_string()} - {format % args}\n")
+
+
+def parse_args():
+    """Parse the command line arguments of the analysis service."""
+    parser = argparse.ArgumentParser(description='Local analysis and simulation service')
+    parser.add_argument('--host', type=str, default='127.0.0.1',
+                        help='Address to listen on, only local addresses should be used')
+    parser.add_argument('--port', type=int, default=8765,
+                        help='Port to listen on')
+    parser.add_argument('--workers', type=int, default=4,
+                        help='Number of worker processes that run analyze and simulate requests')
+    parser.add_argument('--cache-dir', type=str, default=None,
+                        help='Directory of the persistent interface cache, disabled if not given')
+    parser.add_argument('--cache-size', type=int, default=10000,
+                        help='Maximum number of cached component interfaces')
+    return parser.parse_args()
+
+
+def main():
+    """Start the service and serve until interrupted."""
+    args = parse_args()
+    ServiceRequestHandler.service = AnalysisService(args.workers, args.cache_dir, args.cache_size)
+    server = ThreadingHTTPServer((args.host, args.port), ServiceRequestHandler)
+    # a terminated service stops its worker processes like an interrupted one
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    sys.stderr.write(f"Serving on http://{args.host}:{args.port}\n")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        ServiceRequestHandler.service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
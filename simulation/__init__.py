@@ -1,3 +1,4 @@
 from .simulation import Simulation
+from .scaling import CriticalScalingSearch
 
-__all__ = ["Simulation"]
+__all__ = ["Simulation", "CriticalScalingSearch"]
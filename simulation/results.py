@@ -0,0 +1,112 @@
+import numpy as np
+
+from multiprocessing import shared_memory
+
+
+class SharedResultTable:
+    """Per-task response time statistics stored in a shared memory block.
+
+    The table has one row per task. Each row holds the task period, the number
+    of finished jobs, the sum and maximum of their response times, the number
+    of task and component level preemptions and a histogram of the response
+    times. The histogram has `bins` equal bins over [0, period) and one extra
+    bin that counts deadline misses (r >= period).
+
+    Every task is simulated by exactly one process, so rows are written in
+    place without any locking.
+    """
+    PERIOD = 0
+    COUNT = 1
+    SUM = 2
+    MAX = 3
+    PREEMPTIONS = 4
+    COMPONENT_PREEMPTIONS = 5
+    STAT_COLUMNS = 6
+
+    def __init__(self, rows: int, bins: int = 10, name: str | None = None):
+        """Creates a new table or attaches to an existing one.
+
+        Args:
+            rows (int): number of task rows
+            bins (int): number of histogram bins below the period
+            name (str | None): name of an existing shared memory block to attach to,
+                a new block is created if no name is given
+        """
+        assert rows > 0 and bins > 0, "A result table needs at least one row and one bin"
+        self.rows = rows
+        self.bins = bins
+        self.columns = self.STAT_COLUMNS + bins + 1
+        size = rows * self.columns * np.dtype(np.float64).itemsize
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(
+            name=name, create=self.owner, size=size)
+        self.table = np.ndarray(
+            (rows, self.columns), dtype=np.float64, buffer=self.shm.buf)
+        if self.owner:
+            self.table.fill(0)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def descriptor(self) -> tuple[str, int, int]:
+        """Returns everything a worker needs to attach to this table
+        Returns:
+            tuple[str, int, int]: the shared memory name, the rows and the bins
+        """
+        return self.name, self.rows, self.bins
+
+    def set_period(self, row: int, period: float) -> None:
+        self.table[row, self.PERIOD] = period
+
+    def record(self, row: int, response_time: float) -> None:
+        """Records the response time of a finished job in the given row
+        Args:
+            row (int): the row of the task
+            response_time (float): the response time of the job
+        """
+        values = self.table[row]
+        values[self.COUNT] += 1
+        values[self.SUM] += response_time
+        if response_time > values[self.MAX]:
+            values[self.MAX] = response_time
+        period = values[self.PERIOD]
+        if period > 0 and response_time < period:
+            # the simulator can report negative response times, they must not index from the end
+            bin_index = max(0, int(response_time / period * self.bins))
+        else:
+            bin_index = self.bins
+        values[self.STAT_COLUMNS + bin_index] += 1
+
+    def record_preemption(self, row: int, component_level: bool = False) -> None:
+        """Counts a preemption of the task in the given row
+        Args:
+            row (int): the row of the task
+            component_level (bool): whether the component of the task was preempted
+        """
+        self.table[row, self.COMPONENT_PREEMPTIONS if component_level else self.PREEMPTIONS] += 1
+
+    def preemptions(self, row: int, component_level: bool = False) -> int:
+        return int(self.table[row, self.COMPONENT_PREEMPTIONS if component_level else self.PREEMPTIONS])
+
+    def count(self, row: int) -> int:
+        return int(self.table[row, self.COUNT])
+
+    def average(self, row: int) -> float:
+        count = self.table[row, self.COUNT]
+        return float(self.table[row, self.SUM] / count) if count > 0 else 0
+
+    def maximum(self, row: int) -> float:
+        return float(self.table[row, self.MAX])
+
+    def histogram(self, row: int) -> list[int]:
+        """Returns the histogram of the given row, the last bin counts the deadline misses"""
+        return [int(v) for v in self.table[row, self.STAT_COLUMNS:]]
+
+    def close(self) -> None:
+        """Detaches from the shared memory block and removes it if this table created it"""
+        # drop the numpy view first, the buffer cannot be released while it is exported
+        del self.table
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
@@ -0,0 +1,152 @@
+import copy
+import math
+
+from concurrent.futures import ProcessPoolExecutor
+from models import Core
+from .simulation import Simulation
+
+
+class CriticalScalingSearch:
+    """Finds the largest uniform WCET scaling factor that the simulation still
+    runs without a deadline miss, per component and per system.
+
+    The loaded cores are kept unprepared and every probe simulates a copy of a
+    single core with scaled WCETs, cores are independent so the other cores are
+    never simulated. A probe ends at the first deadline miss of a watched component.
+    The simulator does not detect every overload, so a factor which raises the
+    utilisation of a scaled component above its budget over its period, or of
+    the core above 1, is rejected without simulating it. The factor is bisected
+    below that limit, so the result is a lower bound within the tolerance
+    assuming that a larger factor never removes a deadline miss.
+    """
+
+    def __init__(self, cores: list[Core], tolerance: float = 0.01, max_factor: float = 16.0):
+        """
+        Args:
+            cores (list[Core]): the loaded cores, they are not changed
+            tolerance (float): the width of the final bisection interval
+            max_factor (float): the largest factor that is tried
+        """
+        assert len(cores) > 0, "No cores found"
+        self.cores = {core.core_id: core for core in cores}
+        self.tolerance = tolerance
+        self.max_factor = max_factor
+        # every probe runs until the horizon of the whole system like simulate does
+        self.simulation_time = Simulation(copy.deepcopy(cores)).generate_core_components()
+
+    def utilization_limit(self, core_id: str, component_id: str | None = None) -> float:
+        """The largest factor for which the scaled utilisation of every scaled component
+        stays within its budget over its period and the utilisation of the core within 1
+        Args:
+            core_id (str): the core to scale
+            component_id (str | None): the only component that is scaled, all components of the core if None
+        Returns:
+            float: the utilisation limit of the factor, at most max_factor
+        """
+        core = self.cores[core_id]
+        limit = self.max_factor
+        scaled, unscaled = 0.0, 0.0
+        for component in core.components:
+            # the simulator runs the WCETs divided by the speed of the core
+            utilization = sum(task.wcet / core.speed_factor / task.period for task in component.tasks)
+            if component_id is None or component.component_id == component_id:
+                scaled += utilization
+                if utilization > 0:
+                    limit = min(limit, component.budget / component.period / utilization)
+            else:
+                unscaled += utilization
+        if scaled > 0:
+            limit = min(limit, max(0.0, 1 - unscaled) / scaled)
+        return limit
+
+    def is_feasible(self, factor: float, core_id: str, component_id: str | None = None) -> bool:
+        """Simulates the core with the scaled WCETs until the first deadline miss,
+        a factor above the utilisation limit is infeasible without simulating it
+        Args:
+            factor (float): the WCET scaling factor
+            core_id (str): the core to simulate
+            component_id (str | None): the only component that is scaled and watched,
+                all components of the core if None
+        Returns:
+            bool: True if no watched job missed its deadline
+        """
+        # tolerate the rounding of the limit itself
+        if factor > self.utilization_limit(core_id, component_id) * (1 + 1e-9):
+            return False
+        core = copy.deepcopy(self.cores[core_id])
+        for component in core.components:
+            if component_id is None or component.component_id == component_id:
+                for task in component.tasks:
+                    task.wcet *= factor
+                    task.remaining_time = task.wcet
+        simulation = Simulation([core])
+        simulation.stop_on_miss = True
+        if component_id is not None:
+            simulation.watched_components = {component_id}
+        simulation.generate_core_components()
+        return simulation.run(self.simulation_time)
+
+    def critical_factor(self, core_id: str, component_id: str | None = None) -> float:
+        """Bisects the largest factor without a deadline miss below the utilisation limit
+        Args:
+            core_id (str): the core to simulate
+            component_id (str | None): the component that is scaled, all components of the core if None
+        Returns:
+            float: the critical scaling factor rounded down, the utilisation limit only
+                if the simulation at the limit has no deadline miss and 0 if even the
+                smallest factor misses
+        """
+        limit = self.utilization_limit(core_id, component_id)
+        if self.is_feasible(limit, core_id, component_id):
+            return math.floor(limit * 10000) / 10000
+        low, high = 0.0, limit
+        while high - low > self.tolerance:
+            middle = (low + high) / 2
+            if self.is_feasible(middle, core_id, component_id):
+                low = middle
+            else:
+                high = middle
+        return math.floor(low * 10000) / 10000
+
+    def search(self, workers: int = 1) -> dict:
+        """Searches the critical factor of every component and every core,
+        the factor of a core is at most the smallest factor of its components
+        as scaling all of them also scales each one, the system factor is the
+        smallest factor of all cores
+        Args:
+            workers (int): the number of worker processes
+        Returns:
+            dict: the factors of the system, by core id and by component id
+        """
+        jobs = [(core_id, None) for core_id in self.cores]
+        jobs += [(core_id, component.component_id)
+                 for core_id, core in self.cores.items() for component in core.components]
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(self,)) as executor:
+                factors = list(executor.map(_critical_factor, jobs))
+        else:
+            factors = [self.critical_factor(*job) for job in jobs]
+
+        cores, components = {}, {}
+        for (core_id, component_id), factor in zip(jobs, factors):
+            if component_id is None:
+                cores[core_id] = factor
+            else:
+                components[component_id] = {"core_id": core_id, "factor": factor}
+        for component in components.values():
+            cores[component["core_id"]] = min(cores[component["core_id"]], component["factor"])
+        return {"system": min(cores.values()), "cores": cores, "components": components}
+
+
+# the search of a worker process, it is pickled once per worker instead of once per job
+_worker_search: CriticalScalingSearch | None = None
+
+
+def _init_worker(search: CriticalScalingSearch) -> None:
+    global _worker_search
+    _worker_search = search
+
+
+def _critical_factor(job: tuple[str, str | None]) -> float:
+    return _worker_search.critical_factor(*job)
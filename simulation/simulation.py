@@ -1,72 +1,280 @@
 import copy
 
+from concurrent.futures import ProcessPoolExecutor
 from math import lcm
 from models import Core, Component, Task, Solution
 from scheduler import schedule_object
-from csv_functions import write_solutions_to_csv
+from csv_functions import write_solutions_to_csv, write_budget_report_to_csv, write_preemption_report_to_csv
+from .results import SharedResultTable
+from .window import CoreCheckpoints, core_hyperperiod, window_statistics
+
+
+# counters of the cores simulated by workers that are copied to the parent's cores
+_CORE_COUNTERS = ("execution_time", "idle_time", "context_switches", "overhead_time")
+_COMPONENT_COUNTERS = ("budget_released", "budget_consumed", "budget_idle",
+                       "task_preemptions", "preemptions", "context_switches")
 
 
 class Simulation:
-    def __init__(self, cores: list[Core]):
+    def __init__(self, cores: list[Core], context_switch_overhead: float = 0.0):
+        """
+        Args:
+            cores (list[Core]): the cores to simulate
+            context_switch_overhead (float): cpu time charged to a task every time it is dispatched
+        """
         self.cores = cores
+        # generate_core_components adjusts the wcets to the core speed, this must only happen once
+        self.prepared = False
+        self.context_switch_overhead = context_switch_overhead
+        # set by simulate_window, every step that ends at or after window_start is logged
+        self.events: list[dict] | None = None
+        self.window_start = 0.0
+        # checkpoints of the prepared cores at their hyperperiod boundaries
+        self.checkpoints: list[CoreCheckpoints] | None = None
+        # set as soon as a job of a watched component (all if None) finishes after its period
+        self.deadline_missed = False
+        self.watched_components: set[str] | None = None
+        self.stop_on_miss = False
+        # only set when the cores are simulated by worker processes
+        self.result_table: SharedResultTable | None = None
 
-    def simulate(self, file: str) -> None:
+    def simulate(self, file: str, workers: int = 1, report_budgets: bool = False,
+                 report_preemptions: bool = False) -> None:
+        """Simulates all cores and writes the solutions to the given file.
+        With more than one worker every core is simulated in its own process,
+        the workers write their results into a shared result table which is
+        read directly by generate_solutions.
+        Args:
+            file (str): the output file
+            workers (int): the number of worker processes
+            report_budgets (bool): also write the budget usage and task slack report
+            report_preemptions (bool): also write the preemption and context switch report
+        """
         assert self.cores != None and len(self.cores) > 0, "No cores found"
         # Initialize the ready queue for each core
         # for each component in the ready queue inizialize the ready queue of tasks
         simulation_time = self.generate_core_components()
+        try:
+            if workers > 1 and len(self.cores) > 1:
+                self.simulate_parallel(simulation_time, workers)
+            else:
+                self.run(simulation_time)
+
+            self.generate_solutions(file)
+            if report_budgets:
+                write_budget_report_to_csv(self.budget_report(), file)
+            if report_preemptions:
+                write_preemption_report_to_csv(self.preemption_report(), file)
+        finally:
+            if self.result_table is not None:
+                self.result_table.close()
+                self.result_table = None
+
+    def run(self, simulation_time: float) -> bool:
+        """Advances the prepared cores until all of them reach the simulation time.
+        With stop_on_miss set the run ends at the first deadline miss, which is
+        either a job finishing after its period or a job still queued one period
+        after its release, an overloaded component may never finish its jobs.
+        Args:
+            simulation_time (float): the time until which the cores are simulated
+        Returns:
+            bool: True if no job of a watched component missed its deadline
+        """
         while any(core.execution_time < simulation_time for core in self.cores):
             for core in self.cores:
-                action_dict = {}
-                # we caclulate the time that it takes until the next component is raised
-                # and all components that need to be raised
-                next_component_raise_time = sorted(
-                    [c.period - core.execution_time % c.period for c in core.components])[0]
-                next_components = [t for t in core.components if (
-                    core.execution_time + next_component_raise_time) % t.period == 0]
-
-                action_dict["raise_component"] = next_component_raise_time
-
-                # only if we have an active component we will check for the ending of the component
-                # and the tasks
-                if len(core.ready_queue) > 0:
-                    # get the first component in the ready queue scheduled correctly
-                    core.ready_queue = schedule_object(
-                        core.scheduler, core.ready_queue)
-                    component: Component = core.ready_queue[0]
-                    action_dict["finish_component"] = component.remaining_time
-
-                    # in the event that we have finished a component and need to raise
-                    # a task at the same time we need to check if they exist and basically
-                    # run the simulation again for the same time frame
-                    unraised_tasks = [t for t in component.tasks if core.execution_time >
-                                      0 and t not in component.ready_queue and core.execution_time % t.period == 0]
-                    if len(unraised_tasks) > 0:
-                        component.raise_task(
-                            unraised_tasks, core.execution_time, 0)
-                        continue
-
-                    # we caclulate the time that it takes until the next task is raised
-                    # and all tasks that need to be raised
-                    next_task_raise_time = sorted(
-                        [c.period - core.execution_time % c.period for c in component.tasks])[0]
-                    next_tasks = [t for t in component.tasks if (
-                        core.execution_time + next_task_raise_time) % t.period == 0]
-                    action_dict["raise_task"] = next_task_raise_time
-
-                    # if there are currently active tasks we will check their finishing times
-                    if len(component.ready_queue) > 0:
-                        component.ready_queue = schedule_object(
-                            component.scheduler, component.ready_queue)
-                        task: Task = component.ready_queue[0]
-                        action_dict["finish_task"] = task.remaining_time
-
-                self.advance(action_dict, core, component,
-                             task, next_components, next_tasks)
-
-        self.generate_solutions(file)
-
-    def advance(self, actions: dict, core: Core, component: Component, task: Task, next_components: list[Component], next_tasks: list[Task]):
+                self.step(core)
+                if self.stop_on_miss and (self.deadline_missed or self.pending_deadline_miss(core)):
+                    self.deadline_missed = True
+                    return False
+        return not self.deadline_missed
+
+    def pending_deadline_miss(self, core: Core) -> bool:
+        """Checks whether a queued job of a watched component is already past its deadline
+        Args:
+            core (Core): the core
+        Returns:
+            bool: True if a queued job was released at least one period ago
+        """
+        for component in core.components:
+            if self.watched_components is None or component.component_id in self.watched_components:
+                if any(core.execution_time - task.current_start_time >= task.period
+                       for task in component.ready_queue):
+                    return True
+        return False
+
+    def simulate_parallel(self, simulation_time: float, workers: int, bins: int = 10) -> None:
+        """Simulates every core in a worker process with the same steps as the serial loop.
+        The cores are independent of each other, each worker only writes the rows
+        of its own tasks into the shared result table. The serial loop advances
+        every core once per round until the slowest core reaches the simulation
+        time, so every core takes as many steps as the core that needs the most.
+        The workers first advance their core until the simulation time and send
+        it back with its step count, the cores that took fewer steps are then
+        advanced by the missing steps.
+        Args:
+            simulation_time (float): the time until which each core is simulated
+            workers (int): the number of worker processes
+            bins (int): the number of histogram bins of the result table
+        """
+        tasks = [task for core in self.cores for component in core.components
+                 for task in component.tasks]
+        self.result_table = SharedResultTable(len(tasks), bins)
+        for row, task in enumerate(tasks):
+            task.result_row = row
+            self.result_table.set_period(row, task.period)
+        descriptor = self.result_table.descriptor()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_simulate_core, core, simulation_time, None, self.context_switch_overhead,
+                                       descriptor) for core in self.cores]
+            states = [future.result() for future in futures]
+            rounds = max(steps for _, steps in states)
+            futures = [executor.submit(_simulate_core, state, simulation_time, rounds - steps,
+                                       self.context_switch_overhead, descriptor) if steps < rounds else None
+                       for state, steps in states]
+            finished = [future.result()[0] if future is not None else state
+                        for future, (state, _) in zip(futures, states)]
+        for core, state in zip(self.cores, finished):
+            # the per task results are in the table, only the counters are copied
+            for name in _CORE_COUNTERS:
+                setattr(core, name, getattr(state, name))
+            components = {component.component_id: component for component in state.components}
+            for component in core.components:
+                for name in _COMPONENT_COUNTERS:
+                    setattr(component, name, getattr(components[component.component_id], name))
+
+    def simulate_window(self, start: float, end: float, max_checkpoints: int = 64) -> dict:
+        """Simulates only the interval [start, end] and returns its events and statistics.
+        The state of every core at the last hyperperiod boundary before start is taken
+        from a checkpoint, once a core repeats its state from one hyperperiod to the
+        next every later boundary is reached by shifting that state in time. From
+        there at most one hyperperiod is simulated before the window begins.
+        The checkpoints are kept so further queries reuse them. The cores of this
+        simulation are not changed.
+        The shifted states are exact, but a simulation from zero takes the modulo
+        of large absolute times and can break ties between events differently
+        due to floating point rounding.
+        Args:
+            start (float): the start of the window
+            end (float): the end of the window
+            max_checkpoints (int): the number of boundary states kept per core
+        Returns:
+            dict: the window, the events of all steps ending in it and their statistics
+        """
+        assert 0 <= start <= end, "The window must satisfy 0 <= start <= end"
+        if self.checkpoints is None:
+            assert not self.prepared, "Window queries need cores that have not been simulated"
+            prepared = Simulation(copy.deepcopy(self.cores), self.context_switch_overhead)
+            prepared.generate_core_components()
+            self.checkpoints = [CoreCheckpoints(core, core_hyperperiod(core), max_checkpoints)
+                                for core in prepared.cores]
+        window = Simulation([], self.context_switch_overhead)
+        window.prepared = True
+        events = []
+        for checkpoints in self.checkpoints:
+            core = checkpoints.state_at(start, window)
+            window.events, window.window_start = events, start
+            while core.execution_time < end:
+                window.step(core)
+            window.events = None
+        events.sort(key=lambda event: (event["start"], event["core_id"]))
+        return {"start": start, "end": end, "events": events,
+                "statistics": window_statistics(events, start, end)}
+
+    def step(self, core: Core) -> None:
+        """Determines the next event of the given core and advances the core to it
+        Args:
+            core (Core): the core to advance
+        """
+        component, task, next_tasks = None, None, []
+        action_dict = {}
+        # we caclulate the time that it takes until the next component is raised
+        # and all components that need to be raised
+        next_component_raise_time = sorted(
+            [c.period - core.execution_time % c.period for c in core.components])[0]
+        next_components = [t for t in core.components if (
+            core.execution_time + next_component_raise_time) % t.period == 0]
+
+        action_dict["raise_component"] = next_component_raise_time
+
+        # only if we have an active component we will check for the ending of the component
+        # and the tasks
+        if len(core.ready_queue) > 0:
+            # get the first component in the ready queue scheduled correctly
+            core.ready_queue = schedule_object(
+                core.scheduler, core.ready_queue)
+            component = core.ready_queue[0]
+            action_dict["finish_component"] = component.remaining_time
+
+            # in the event that we have finished a component and need to raise
+            # a task at the same time we need to check if they exist and basically
+            # run the simulation again for the same time frame
+            unraised_tasks = [t for t in component.tasks if core.execution_time >
+                              0 and t not in component.ready_queue and core.execution_time % t.period == 0]
+            if len(unraised_tasks) > 0:
+                component.raise_task(
+                    unraised_tasks, core.execution_time, 0)
+                return
+
+            # we caclulate the time that it takes until the next task is raised
+            # and all tasks that need to be raised
+            next_task_raise_time = sorted(
+                [c.period - core.execution_time % c.period for c in component.tasks])[0]
+            next_tasks = [t for t in component.tasks if (
+                core.execution_time + next_task_raise_time) % t.period == 0]
+            action_dict["raise_task"] = next_task_raise_time
+
+            # if there are currently active tasks we will check their finishing times
+            if len(component.ready_queue) > 0:
+                component.ready_queue = schedule_object(
+                    component.scheduler, component.ready_queue)
+                task = component.ready_queue[0]
+
+        # the switch overhead is added to the task before its finishing time is taken
+        preempted = self.switch_context(core, component, task)
+        if task is not None:
+            action_dict["finish_task"] = task.remaining_time
+
+        self.advance(action_dict, core, component,
+                     task, next_components, next_tasks, preempted)
+
+    def switch_context(self, core: Core, component: Component | None, task: Task | None) -> tuple[str, str, bool] | None:
+        """Counts the context switches and preemptions caused by the next step of the core
+        and charges the context switch overhead to a newly dispatched task.
+        A task that is still ready but no longer runs was preempted by a task of its
+        component or, if its component is still ready, together with its component.
+        Args:
+            core (Core): the current core
+            component (Component | None): the active component can be None
+            task (Task | None): the task that runs next can be None
+        Returns:
+            tuple[str, str, bool] | None: the component id and name of a preempted task
+            and whether it was a component level preemption
+        """
+        preempted = None
+        running = (component, task.task_name) if task is not None else None
+        if running == core.running:
+            return preempted
+        previous, core.running = core.running, running
+        if previous is not None:
+            previous_component, previous_task = previous
+            if any(t.task_name == previous_task for t in previous_component.ready_queue):
+                if previous_component is component:
+                    previous_component.preempt_task(previous_task)
+                    preempted = (previous_component.component_id, previous_task, False)
+                elif previous_component in core.ready_queue:
+                    previous_component.preempt_task(
+                        previous_task, component_level=True)
+                    preempted = (previous_component.component_id, previous_task, True)
+        if task is not None:
+            core.context_switches += 1
+            component.context_switches += 1
+            if self.context_switch_overhead > 0:
+                task.remaining_time += self.context_switch_overhead
+                core.overhead_time += self.context_switch_overhead
+        return preempted
+
+    def advance(self, actions: dict, core: Core, component: Component, task: Task, next_components: list[Component], next_tasks: list[Task],
+                preempted: tuple[str, str, bool] | None = None):
         """Advances the simulation by the time of the lowest action
         and executes the action. The action is the one with the lowest time
         to the next event. The actions are:
@@ -81,9 +289,19 @@ class Simulation:
             task (Task): the current task can be None
             next_components (list[Component]): the next components to be raised can be empty
             next_tasks (list[Task]): the next tasks to be raised can be empty
+            preempted (tuple[str, str, bool] | None): the task preempted by this step, only used for the event log
         """
+        start_time = core.execution_time
+        response_time = None
         action = min(actions, key=actions.get)
         action_value = actions[action]
+        # account the elapsed time to the active task, the idle component or the idle core
+        if component is None:
+            core.idle_time += action_value
+        elif task is None:
+            component.budget_idle += action_value
+        else:
+            component.budget_consumed += action_value
         # remove all values that are not the lowest
         actions = {
             k: v for k, v in actions.items() if v == action_value}
@@ -102,14 +320,30 @@ class Simulation:
                     next_tasks, core.execution_time, action_value)
         if "finish_task" in actions:
             if component and task:
-                component.finish_task(
+                response_time = component.finish_task(
                     task, core.execution_time, action_value)
+                if response_time >= task.period and (self.watched_components is None
+                                                     or component.component_id in self.watched_components):
+                    self.deadline_missed = True
+        if self.events is not None and core.execution_time >= self.window_start:
+            self.events.append({
+                "core_id": core.core_id,
+                "start": start_time,
+                "end": core.execution_time,
+                "component_id": component.component_id if component else None,
+                "task_name": task.task_name if task else None,
+                "actions": list(actions),
+                "response_time": response_time,
+                "preempted": preempted
+            })
 
     def generate_core_components(self) -> float:
         """Generate the core components and their budgets
         Returns:
             float: the least common multiple of all components * 2
         """
+        assert not self.prepared, "The cores have already been prepared"
+        self.prepared = True
         least_common_multiple_list = []
         for core in self.cores:
             core.components = schedule_object(core.scheduler, core.components)
@@ -125,9 +359,111 @@ class Simulation:
                     task.wcet = round(task.wcet / core.speed_factor, 2)
                     task.remaining_time = task.wcet
                 component.ready_queue = copy.deepcopy(component.tasks)
+                component.budget_released = component.budget
         assert len(least_common_multiple_list) > 0, "No components found"
         return max(least_common_multiple_list) * 2
 
+    def task_statistics(self, task: Task) -> tuple[int, float, float]:
+        """Returns the schedulability, the average and the maximum response time of the task
+        either from its response time list or from the shared result table
+        Args:
+            task (Task): the task
+        Returns:
+            tuple[int, float, float]: schedulable flag, average and maximum response time
+        """
+        if self.result_table is not None and task.result_row is not None:
+            row = task.result_row
+            if self.result_table.count(row) == 0:
+                return 1, 0, 0
+            max_response_time = self.result_table.maximum(row)
+            return (0 if max_response_time >= task.period else 1,
+                    round(self.result_table.average(row), 2), max_response_time)
+        task_schedulable = 0 if any(
+            r >= task.period for r in task.response_times) else 1
+        average_resonse_time = round(sum(
+            task.response_times) / len(task.response_times), 2) if len(task.response_times) > 0 else 0
+        max_response_time = max(task.response_times) if len(
+            task.response_times) >= 1 else 0
+        return task_schedulable, average_resonse_time, max_response_time
+
+    def task_min_slack(self, task: Task) -> float | None:
+        """Returns the smallest observed slack of the task or None if no job finished"""
+        if self.result_table is not None and task.result_row is not None:
+            if self.result_table.count(task.result_row) == 0:
+                return None
+            return round(task.period - self.result_table.maximum(task.result_row), 2)
+        return None if task.min_slack is None else round(task.min_slack, 2)
+
+    def task_preemptions(self, task: Task) -> tuple[int, int]:
+        """Returns the task level and component level preemptions of the task"""
+        if self.result_table is not None and task.result_row is not None:
+            return (self.result_table.preemptions(task.result_row),
+                    self.result_table.preemptions(task.result_row, component_level=True))
+        return task.preemptions, task.component_preemptions
+
+    def preemption_report(self) -> list[dict]:
+        """Collects the preemptions and context switches of every core, component and task
+        Returns:
+            list[dict]: one entry per core with its components and their tasks
+        """
+        report = []
+        for core in self.cores:
+            components = []
+            for component in core.components:
+                tasks = []
+                for task in component.tasks:
+                    preemptions, component_preemptions = self.task_preemptions(task)
+                    tasks.append({"task_name": task.task_name, "preemptions": preemptions,
+                                  "component_preemptions": component_preemptions})
+                components.append({
+                    "component_id": component.component_id,
+                    "task_preemptions": component.task_preemptions,
+                    "preemptions": component.preemptions,
+                    "context_switches": component.context_switches,
+                    "tasks": tasks
+                })
+            report.append({
+                "core_id": core.core_id,
+                "task_preemptions": core.task_preemptions,
+                "component_preemptions": core.component_preemptions,
+                "context_switches": core.context_switches,
+                "overhead_time": round(core.overhead_time, 2),
+                "components": components
+            })
+        return report
+
+    def budget_report(self) -> list[dict]:
+        """Collects the budget usage of every component and core and the
+        minimum observed slack of every task
+        Returns:
+            list[dict]: one entry per core with its components and their tasks
+        """
+        report = []
+        for core in self.cores:
+            components = []
+            for component in core.components:
+                components.append({
+                    "component_id": component.component_id,
+                    "budget": component.budget,
+                    "period": component.period,
+                    "released": round(component.budget_released, 2),
+                    "consumed": round(component.budget_consumed, 2),
+                    "idle": round(component.budget_idle, 2),
+                    "unused": round(component.budget_unused, 2),
+                    "tasks": [{"task_name": task.task_name, "min_slack": self.task_min_slack(task)}
+                              for task in component.tasks]
+                })
+            report.append({
+                "core_id": core.core_id,
+                "execution_time": core.execution_time,
+                "idle_time": round(core.idle_time, 2),
+                "consumed": round(core.budget_consumed, 2),
+                "idle": round(core.budget_idle, 2),
+                "unused": round(core.budget_unused, 2),
+                "components": components
+            })
+        return report
+
     def generate_solutions(self, file: str):
         """ Generate all solutions to print and to csv
         Args:
@@ -139,13 +475,9 @@ class Simulation:
                 component_schedulable = 1
                 solutions = []
                 for task in component.tasks:
-                    task_schedulable = 0 if any(
-                        r >= task.period for r in task.response_times) else 1
+                    task_schedulable, average_resonse_time, max_response_time = self.task_statistics(
+                        task)
                     component_schedulable *= task_schedulable
-                    average_resonse_time = round(sum(
-                        task.response_times) / len(task.response_times), 2) if len(task.response_times) > 0 else 0
-                    max_response_time = max(task.response_times) if len(
-                        task.response_times) >= 1 else 0
                     sol = Solution(task_name=task.task_name, component_id=component.component_id,
                                    task_schedulable=task_schedulable, component_schedulable=0,
                                    avg_response_time=average_resonse_time, max_response_time=max_response_time)
@@ -157,3 +489,32 @@ class Simulation:
         for asl in all_solutions:
             print(asl)
         write_solutions_to_csv(solutions=all_solutions, filename=file)
+
+
+def _simulate_core(core: Core, simulation_time: float, steps: int | None, context_switch_overhead: float,
+                   table: tuple[str, int, int]) -> tuple[Core, int]:
+    """Worker entry point which advances a single core and writes the
+    results of its tasks into the shared result table
+    Args:
+        core (Core): the prepared core to simulate
+        simulation_time (float): the time until which the core is simulated
+        steps (int | None): the number of steps to take, None to advance the core until the simulation time
+        context_switch_overhead (float): cpu time charged per context switch
+        table (tuple[str, int, int]): the descriptor of the shared result table
+    Returns:
+        tuple[Core, int]: the advanced core and the number of steps taken
+    """
+    result_table = SharedResultTable(table[1], table[2], name=table[0])
+    try:
+        for component in core.components:
+            component.result_table = result_table
+        simulation = Simulation([core], context_switch_overhead)
+        taken = 0
+        while (core.execution_time < simulation_time) if steps is None else (taken < steps):
+            simulation.step(core)
+            taken += 1
+        return core, taken
+    finally:
+        for component in core.components:
+            component.result_table = None
+        result_table.close()
@@ -0,0 +1,171 @@
+import copy
+
+from math import lcm
+from models import Core
+
+
+def core_hyperperiod(core: Core) -> int:
+    """Returns the least common multiple of all component and task periods of the core"""
+    periods = [int(c.period) for c in core.components]
+    periods += [int(t.period) for c in core.components for t in c.tasks]
+    return lcm(*periods)
+
+
+def core_signature(core: Core, hyperperiod: int) -> tuple:
+    """Describes the state of the core relative to its hyperperiod. Two states with
+    the same signature behave identically from then on, up to a shift in time.
+    Whether a queued task is the original task or a copy is part of the state as
+    the simulation only raises tasks whose original is not queued. The values are
+    compared exactly because the simulation breaks ties between events with ==.
+    Args:
+        core (Core): the core
+        hyperperiod (int): the hyperperiod of the core
+    Returns:
+        tuple: the signature
+    """
+    time = core.execution_time
+    running = None if core.running is None else (
+        core.running[0].component_id, core.running[1])
+    components = tuple(
+        (c.component_id, c.remaining_time,
+         tuple((t.task_name, t.remaining_time, time - t.current_start_time,
+                t is c.get_task(t.task_name)) for t in c.ready_queue))
+        for c in core.components)
+    return (time % hyperperiod, running,
+            tuple(c.component_id for c in core.ready_queue), components)
+
+
+def shift_core(core: Core, time_difference: float) -> None:
+    """Moves the state of the core forward in time by the given difference,
+    times are rounded like the simulation rounds the execution time"""
+    core.execution_time = round(core.execution_time + time_difference, 2)
+    shifted = set()
+    for component in core.components:
+        for task in component.ready_queue:
+            # a task object can be queued more than once
+            if id(task) not in shifted:
+                shifted.add(id(task))
+                task.current_start_time = round(task.current_start_time + time_difference, 2)
+
+
+class CoreCheckpoints:
+    """States of a single prepared core at the boundaries of its hyperperiod.
+
+    As soon as the state at one boundary equals the state at the previous boundary
+    the schedule is periodic and the state at any later boundary follows by shifting.
+    """
+
+    def __init__(self, core: Core, hyperperiod: int, max_checkpoints: int = 64):
+        """
+        Args:
+            core (Core): the prepared core at time 0
+            hyperperiod (int): the hyperperiod of the core
+            max_checkpoints (int): the number of boundary states that are kept
+        """
+        self.hyperperiod = hyperperiod
+        self.max_checkpoints = max(2, max_checkpoints)
+        # boundary index -> state of the core when it first reaches that boundary
+        self.states: dict[int, Core] = {0: copy.deepcopy(core)}
+        self.last = 0
+        self.last_signature = None
+        self.periodic_from: int | None = None
+
+    def state_at(self, time: float, simulation) -> Core:
+        """Returns a copy of the core at the last hyperperiod boundary that is not after time
+        Args:
+            time (float): the time
+            simulation (Simulation): the simulation used to advance the core between boundaries
+        Returns:
+            Core: the state of the core
+        """
+        boundary = int(time // self.hyperperiod)
+        if self.periodic_from is not None and boundary >= self.periodic_from:
+            core = copy.deepcopy(self.states[self.periodic_from])
+            shift_core(core, (boundary - self.periodic_from) * self.hyperperiod)
+            return core
+        while self.last < boundary and self.periodic_from is None:
+            self.advance(simulation)
+        if self.periodic_from is not None and boundary >= self.periodic_from:
+            return self.state_at(time, simulation)
+        start = max(k for k in self.states if k <= boundary)
+        core = copy.deepcopy(self.states[start])
+        # the boundary lies beyond the kept checkpoints, simulate the remaining hyperperiods
+        while core.execution_time < boundary * self.hyperperiod:
+            simulation.step(core)
+        return core
+
+    def advance(self, simulation) -> None:
+        """Simulates the last checkpoint up to the next boundary and stores the new state"""
+        core = copy.deepcopy(self.states[self.last])
+        target = (self.last + 1) * self.hyperperiod
+        while core.execution_time < target:
+            simulation.step(core)
+        if core.execution_time != target:
+            # no event at the boundary, the state cannot be compared
+            self.last_signature = None
+        else:
+            signature = core_signature(core, self.hyperperiod)
+            if signature == self.last_signature:
+                self.periodic_from = self.last
+                return
+            self.last_signature = signature
+        if len(self.states) >= self.max_checkpoints:
+            # keep the earliest checkpoints and only the latest state beyond them
+            del self.states[self.last]
+        self.last += 1
+        self.states[self.last] = core
+
+
+def _overlap(event: dict, start: float, end: float) -> float:
+    return max(0.0, min(event["end"], end) - max(event["start"], start))
+
+
+def window_statistics(events: list[dict], start: float, end: float) -> dict:
+    """Aggregates the events of a window into per core, component and task statistics
+    Args:
+        events (list[dict]): the events of the window
+        start (float): the start of the window
+        end (float): the end of the window
+    Returns:
+        dict: the statistics by core id, component id and task name
+    """
+    cores, components, tasks = {}, {}, {}
+    for event in events:
+        core = cores.setdefault(event["core_id"], {"idle_time": 0.0, "events": 0})
+        core["events"] += 1
+        elapsed = _overlap(event, start, end)
+        if event["component_id"] is None:
+            core["idle_time"] += elapsed
+        else:
+            component = components.setdefault(event["component_id"], {
+                "core_id": event["core_id"], "consumed": 0.0, "idle": 0.0,
+                "task_preemptions": 0, "preemptions": 0})
+            if event["task_name"] is None:
+                component["idle"] += elapsed
+            else:
+                component["consumed"] += elapsed
+        if event["preempted"] is not None:
+            component_id, task_name, component_level = event["preempted"]
+            task = tasks.setdefault(task_name, {"component_id": component_id, "response_times": [],
+                                                "preemptions": 0, "component_preemptions": 0})
+            task["component_preemptions" if component_level else "preemptions"] += 1
+            components.setdefault(component_id, {
+                "core_id": event["core_id"], "consumed": 0.0, "idle": 0.0,
+                "task_preemptions": 0, "preemptions": 0})[
+                "preemptions" if component_level else "task_preemptions"] += 1
+        if event["response_time"] is not None and start <= event["end"] <= end:
+            task = tasks.setdefault(event["task_name"], {"component_id": event["component_id"], "response_times": [],
+                                                         "preemptions": 0, "component_preemptions": 0})
+            task["response_times"].append(event["response_time"])
+
+    for task in tasks.values():
+        response_times = task.pop("response_times")
+        task["finished_jobs"] = len(response_times)
+        task["avg_response_time"] = round(
+            sum(response_times) / len(response_times), 2) if response_times else 0
+        task["max_response_time"] = max(response_times) if response_times else 0
+    for values in list(cores.values()) + list(components.values()):
+        for key in ("idle_time", "consumed", "idle"):
+            if key in values:
+                values[key] = round(values[key], 2)
+    return {"cores": cores, "components": components, "tasks": tasks}